@@ -1,12 +1,368 @@
 import ast
+import heapq
+from array import array
+from itertools import compress
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from gram.perf_rules import RULES, Finding, dotted
+
 console = Console()
+PERF_LIMIT = 100
+DEFAULT_HOTSPOTS = 15
+# Порог "стоит упростить" для каждой метрики функции
+HOTSPOT_LIMITS = {"complexity": 10, "length": 50, "depth": 4, "args": 5}
+HOTSPOT_TITLES = {"complexity": "Сложность", "length": "Строк", "depth": "Вложен.", "args": "Арг."}
+# Каждая такая ветка добавляет путь выполнения (цикломатическая сложность по McCabe)
+BRANCH_NODES = {ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.match_case}
+NESTING_NODES = {ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, getattr(ast, "TryStar", ast.Try), ast.Match}
+
+
+def _merge(total, counts, combine):
+    for key, (count, node) in counts.items():
+        if key in total:
+            total[key][0] = combine(total[key][0], count)
+        else:
+            total[key] = [count, node]
+    return total
+
+
+def _branches(*paths):
+    """Из взаимоисключающих веток берётся максимум, а не сумма; None — ветки нет."""
+    paths = [path for path in paths if path is not None]
+    if not paths:
+        return None
+    total = {}
+    for path in paths:
+        _merge(total, path, max)
+    return total
+
+
+def _sequence(*parts):
+    if any(part is None for part in parts):
+        return None
+    total = {}
+    for part in parts:
+        _merge(total, part, lambda a, b: a + b)
+    return total
+
+
+class LoopFrame:
+    """Цикл или comprehension, внутри которого сейчас проход; stored — что в нём присваивается.
+
+    Счётчики count() ведутся по путям через одну итерацию: through — путь, идущий дальше,
+    exited — пути, уже вышедшие через continue/break/return/raise (None — таких путей нет)."""
+    __slots__ = ("node", "stored", "data", "through", "exited", "saved")
+
+    def __init__(self, node):
+        self.node = node
+        self.stored = set()
+        self.data = {}
+        self.through = {}
+        self.exited = None
+        self.saved = []
+
+    def count(self, key, node):
+        if self.through is None:
+            return
+        if key in self.through:
+            self.through[key][0] += 1
+        else:
+            self.through[key] = [1, node]
+
+    def begin_branch(self):
+        self.saved.append((self.through, self.exited))
+        self.through, self.exited = {}, None
+
+    def end_branch(self) -> tuple:
+        branch = (self.through, self.exited)
+        self.through, self.exited = self.saved.pop()
+        return branch
+
+    def join(self, branches: list):
+        """Взаимоисключающие ветки, начатые в текущей точке пути, продолжают его."""
+        before = self.through
+        self.exited = _branches(self.exited, _sequence(before, _branches(*(exited for _, exited in branches))))
+        self.through = _sequence(before, _branches(*(through for through, _ in branches)))
+
+    def exit(self):
+        self.exited = _branches(self.exited, self.through)
+        self.through = None
+
+    def path_counts(self) -> dict:
+        """Для каждого ключа — сколько раз он встретился на самом длинном пути через итерацию."""
+        return _branches(self.through, self.exited) or {}
+
+
+class FunctionFrame:
+    """Функция, тело которой сейчас обходится: счётчики до выхода из неё."""
+    __slots__ = ("node", "name", "complexity", "depth", "max_depth")
+
+    def __init__(self, node, name: str):
+        self.node = node
+        self.name = name
+        self.complexity = 1
+        self.depth = 0
+        self.max_depth = 0
+
+
+class FunctionMetrics:
+    """Метрики функций по столбцам: строка таблицы — номер функции во всех массивах.
+    Имена и файлы хранятся один раз, в столбцах только их номера."""
+
+    COLUMNS = ("complexity", "length", "depth", "args")
+
+    def __init__(self):
+        self.files = []
+        self.names = []
+        self._name_ids = {}
+        self.file_ids = array("I")
+        self.name_ids = array("I")
+        self.lines = array("I")
+        self.complexity = array("I")
+        self.length = array("I")
+        self.depth = array("H")
+        self.args = array("H")
+
+    def __len__(self):
+        return len(self.lines)
+
+    def add_file(self, path: str) -> int:
+        self.files.append(path)
+        return len(self.files) - 1
+
+    def add(self, file_id: int, name: str, line: int, complexity: int, length: int, depth: int, args: int):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        self.file_ids.append(file_id)
+        self.name_ids.append(name_id)
+        self.lines.append(line)
+        self.complexity.append(complexity)
+        self.length.append(length)
+        self.depth.append(depth)
+        self.args.append(args)
+
+    def row(self, i: int) -> tuple:
+        return (self.files[self.file_ids[i]], self.names[self.name_ids[i]], self.lines[i],
+                self.complexity[i], self.length[i], self.depth[i], self.args[i])
+
+    def top(self, column: str, n: int) -> list:
+        values = getattr(self, column)
+        return heapq.nlargest(n, range(len(values)), key=values.__getitem__)
+
+    def where(self, column: str, minimum: int) -> list:
+        """Номера функций со значением не меньше minimum, по убыванию значения."""
+        values = getattr(self, column)
+        return sorted(compress(range(len(values)), map(minimum.__le__, values)), key=values.__getitem__, reverse=True)
+
+    def count_over(self, column: str, minimum: int) -> int:
+        return sum(map(minimum.__le__, getattr(self, column)))
+
+
+class SourceVisitor(ast.NodeVisitor):
+    """Один проход по дереву: счётчики для --info, метрики функций и правила --perf."""
+
+    def __init__(self, rules=None, metrics: FunctionMetrics = None, file_id: int = None):
+        self.counts = {"funcs": 0, "classes": 0, "imports": 0, "docstrings": 0, "async_funcs": 0}
+        self.metrics = metrics if metrics is not None else FunctionMetrics()
+        self.file_id = file_id if file_id is not None else self.metrics.add_file("")
+        self.functions = []
+        self.scope = []
+        self.elifs = set()
+        self.rules = [rule() for rule in (RULES if rules is None else rules)]
+        self.findings = []
+        self.loops = []
+        self.dispatch = {}
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                self.dispatch.setdefault(node_type, []).append(rule)
+
+    def report(self, rule, node, message: str, fix: str = None):
+        self.findings.append(Finding(node.lineno, rule.code, rule.title, message, fix or rule.fix))
+
+    def is_loop_invariant(self, node, frame=None) -> bool:
+        """Ни одно имя в выражении не присваивается в цикле (по умолчанию — во всех текущих)."""
+        stored = frame.stored if frame else set().union(*(loop.stored for loop in self.loops))
+        return not any(isinstance(name, ast.Name) and name.id in stored for name in ast.walk(node))
+
+    def visit(self, node):
+        for rule in self.dispatch.get(type(node), ()):
+            rule.check(node, self)
+        if self.loops and isinstance(node, (ast.Name, ast.Attribute)) and isinstance(node.ctx, ast.Store):
+            self.loops[-1].stored.add(dotted(node))
+
+        cls = type(node)
+        function = self.functions[-1] if self.functions else None
+        nested = False
+        if function is not None:
+            if cls in BRANCH_NODES:
+                function.complexity += 1
+            elif cls is ast.BoolOp:
+                function.complexity += len(node.values) - 1
+            if cls is ast.If and len(node.orelse) == 1 and type(node.orelse[0]) is ast.If:
+                # elif — продолжение той же цепочки, а не вложенный блок
+                self.elifs.add(id(node.orelse[0]))
+            nested = cls in NESTING_NODES and id(node) not in self.elifs
+            if nested:
+                function.depth += 1
+                function.max_depth = max(function.max_depth, function.depth)
+
+        method = getattr(self, "visit_" + node.__class__.__name__, None)
+        if method:
+            method(node)
+        else:
+            self.generic_visit(node)
+        if nested:
+            function.depth -= 1
+
+    def _visit_loop(self, node, children):
+        frame = LoopFrame(node)
+        self.loops.append(frame)
+        for child in children:
+            self.visit(child)
+        self.loops.pop()
+        if self.loops:
+            self.loops[-1].stored |= frame.stored
+        for rule in self.rules:
+            rule.leave_loop(frame, self)
+
+    def _visit_branches(self, branches):
+        frame = self.loops[-1]
+        results = []
+        for children in branches:
+            frame.begin_branch()
+            for child in children:
+                self.visit(child)
+            results.append(frame.end_branch())
+        frame.join(results)
+
+    def visit_If(self, node):
+        if not self.loops:
+            return self.generic_visit(node)
+        self.visit(node.test)
+        self._visit_branches([node.body, node.orelse])
+
+    def visit_IfExp(self, node):
+        if not self.loops:
+            return self.generic_visit(node)
+        self.visit(node.test)
+        self._visit_branches([[node.body], [node.orelse]])
+
+    def visit_Try(self, node):
+        if not self.loops:
+            return self.generic_visit(node)
+        self._visit_branches([[*node.body, *node.orelse], *([handler] for handler in node.handlers)])
+        for child in node.finalbody:
+            self.visit(child)
+
+    visit_TryStar = visit_Try
+
+    def visit_Match(self, node):
+        if not self.loops:
+            return self.generic_visit(node)
+        self.visit(node.subject)
+        # Если ни один case не подошёл, путь идёт дальше без них
+        self._visit_branches([[case] for case in node.cases] + [[]])
+
+    def _visit_exit(self, node):
+        self.generic_visit(node)
+        if self.loops:
+            self.loops[-1].exit()
+
+    visit_Continue = visit_Break = visit_Return = visit_Raise = _visit_exit
+
+    def visit_For(self, node):
+        # Итерируемое вычисляется один раз, до цикла
+        self.visit(node.iter)
+        self._visit_loop(node, [node.target, *node.body])
+        for child in node.orelse:
+            self.visit(child)
+
+    visit_AsyncFor = visit_For
 
-def show_info(path_str: str):
+    def visit_While(self, node):
+        self._visit_loop(node, [node.test, *node.body])
+        for child in node.orelse:
+            self.visit(child)
+
+    def _visit_comprehension(self, node):
+        if self.functions:
+            self.functions[-1].complexity += sum(1 + len(generator.ifs) for generator in node.generators)
+        first, *rest = node.generators
+        self.visit(first.iter)
+        children = [first.target, *first.ifs]
+        for generator in rest:
+            children += [generator.target, generator.iter, *generator.ifs]
+        children += [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+        self._visit_loop(node, children)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def _visit_scope(self, node):
+        # Тело функции выполняется при вызове, а не на итерациях окружающего цикла
+        loops, self.loops = self.loops, []
+        self.scope.append(node)
+        self.generic_visit(node)
+        self.scope.pop()
+        self.loops = loops
+
+    def _visit_function(self, node):
+        frame = FunctionFrame(node, ".".join([*(scope.name for scope in self.scope), node.name]))
+        # Ветки вложенной функции считаются ей, а не внешней
+        self.functions.append(frame)
+        self._visit_scope(node)
+        self.functions.pop()
+        arguments = node.args
+        names = [arg.arg for arg in (*arguments.posonlyargs, *arguments.args, *arguments.kwonlyargs)]
+        args = len(names) + (arguments.vararg is not None) + (arguments.kwarg is not None)
+        if names and names[0] in ("self", "cls") and self.scope and isinstance(self.scope[-1], ast.ClassDef):
+            args -= 1
+        self.metrics.add(self.file_id, frame.name, node.lineno, frame.complexity,
+                         (node.end_lineno or node.lineno) - node.lineno + 1, frame.max_depth, args)
+
+    def visit_Module(self, node):
+        self.counts["docstrings"] += ast.get_docstring(node) is not None
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self.counts["funcs"] += 1
+        self.counts["docstrings"] += ast.get_docstring(node) is not None
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self.counts["async_funcs"] += 1
+        self._visit_function(node)
+
+    def visit_ClassDef(self, node):
+        self.counts["classes"] += 1
+        self.counts["docstrings"] += ast.get_docstring(node) is not None
+        self._visit_scope(node)
+
+    def visit_Import(self, node):
+        self.counts["imports"] += 1
+
+    visit_ImportFrom = visit_Import
+
+
+def analyze_source(code: str, rules=None, metrics: FunctionMetrics = None, file_id: int = None) -> dict:
+    """Метрики и находки правил за один разбор и один обход дерева.
+    Метрики функций дописываются в metrics (по умолчанию — в новую таблицу только для этого файла)."""
+    tree = ast.parse(code)
+    visitor = SourceVisitor(rules, metrics, file_id)
+    visitor.visit(tree)
+    return {
+        "lines": len(code.splitlines()),
+        "comments": code.count("#"),
+        **visitor.counts,
+        "findings": sorted(visitor.findings),
+        "functions": visitor.metrics,
+    }
+
+def show_info(path_str: str, hotspots: int = None, sort: str = None, minimum: int = None):
     path = Path(path_str)
     
     if not path.exists():
@@ -18,10 +374,15 @@ def show_info(path_str: str):
         console.print(error_panel)
         return
 
+    column = sort or "complexity"
+    if hotspots is not None and column not in HOTSPOT_LIMITS:
+        console.print(Panel(f"[red bold]❌ Неизвестная метрика: {column}[/red bold]\n[dim]Доступны: {', '.join(HOTSPOT_LIMITS)}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
     if path.is_file() and path.suffix == ".py":
-        analyze_single_file(path)
+        metrics = analyze_single_file(path)
     elif path.is_dir():
-        analyze_directory(path)
+        metrics = analyze_directory(path)
     else:
         warning_panel = Panel(
             f"[yellow bold]⚠️ Указанный путь не является Python-файлом или папкой![/yellow bold]\n[dim]Путь: {path}[/dim]",
@@ -29,22 +390,25 @@ def show_info(path_str: str):
             border_style="yellow"
         )
         console.print(warning_panel)
+        return
+
+    if hotspots is not None and metrics is not None:
+        show_hotspots(metrics, column, hotspots or DEFAULT_HOTSPOTS, minimum)
 
 def analyze_single_file(path):
     console.print(f"\n[bold cyan]🔍 Анализирую файл: [yellow]{path.name}[/yellow][/bold cyan]\n")
     
     code = path.read_text(encoding="utf-8")
-    tree = ast.parse(code)
+    functions = FunctionMetrics()
+    stats = analyze_source(code, metrics=functions, file_id=functions.add_file(path.name))
     
-    funcs = sum(isinstance(n, ast.FunctionDef) for n in ast.walk(tree))
-    classes = sum(isinstance(n, ast.ClassDef) for n in ast.walk(tree))
-    lines = len(code.splitlines())
-    imports = sum(isinstance(n, (ast.Import, ast.ImportFrom)) for n in ast.walk(tree))
-    comments = code.count("#")
-    
-    docstrings = sum(isinstance(n, (ast.FunctionDef, ast.ClassDef, ast.Module)) and 
-                    (ast.get_docstring(n) is not None) for n in ast.walk(tree))
-    async_funcs = sum(isinstance(n, ast.AsyncFunctionDef) for n in ast.walk(tree))
+    funcs = stats["funcs"]
+    classes = stats["classes"]
+    lines = stats["lines"]
+    imports = stats["imports"]
+    comments = stats["comments"]
+    docstrings = stats["docstrings"]
+    async_funcs = stats["async_funcs"]
     
     info_table = Table(title=f"📊 Статистика файла {path.name}", show_header=True)
     info_table.add_column("📈 Метрика", style="bold cyan", no_wrap=True)
@@ -106,7 +470,9 @@ def analyze_single_file(path):
         info_panel = Panel(
             f"[cyan]📏 Размер файла:[/cyan] [yellow]{path.stat().st_size / 1024:.1f} KB[/yellow]\n"
             f"[cyan]📝 Плотность комментариев:[/cyan] [green]{comment_ratio:.1f}%[/green]\n"
-            f"[cyan]🎯 Соотношение функций/классов:[/cyan] [yellow]{funcs}:{classes}[/yellow]",
+            f"[cyan]🎯 Соотношение функций/классов:[/cyan] [yellow]{funcs}:{classes}[/yellow]\n"
+            f"[cyan]🐢 Подозрений на медленный код:[/cyan] [yellow]{len(stats['findings'])}[/yellow] [dim](подробно: gram --perf {path})[/dim]\n"
+            f"[cyan]🧮 Сложных функций:[/cyan] [yellow]{functions.count_over('complexity', HOTSPOT_LIMITS['complexity'])}[/yellow] [dim](подробно: gram --info {path} --hotspots)[/dim]",
             title="📋 Дополнительная информация",
             border_style="blue"
         )
@@ -135,6 +501,7 @@ def analyze_single_file(path):
         console.print(score_panel)
     
     console.print("\n")
+    return functions
 
 def analyze_directory(path):
     console.print(f"\n[bold cyan]🔍 Анализирую папку: [yellow]{path.name}[/yellow][/bold cyan]\n")
@@ -152,22 +519,23 @@ def analyze_directory(path):
     
     console.print(f"[dim]Найдено Python файлов: {len(python_files)}[/dim]\n")
     
-    total_stats = {"files": 0, "total_lines": 0, "total_funcs": 0, "total_classes": 0, "total_imports": 0, "total_comments": 0, "total_docstrings": 0, "total_async": 0, "total_size": 0}
+    total_stats = {"files": 0, "total_lines": 0, "total_funcs": 0, "total_classes": 0, "total_imports": 0, "total_comments": 0, "total_docstrings": 0, "total_async": 0, "total_findings": 0, "total_size": 0}
     
     file_details = []
+    metrics = FunctionMetrics()
     
     for py_file in python_files:
         try:
             code = py_file.read_text(encoding="utf-8")
-            tree = ast.parse(code)
+            stats = analyze_source(code, metrics=metrics, file_id=metrics.add_file(str(py_file.relative_to(path))))
             
-            lines = len(code.splitlines())
-            funcs = sum(isinstance(n, ast.FunctionDef) for n in ast.walk(tree))
-            classes = sum(isinstance(n, ast.ClassDef) for n in ast.walk(tree))
-            imports = sum(isinstance(n, (ast.Import, ast.ImportFrom)) for n in ast.walk(tree))
-            comments = code.count("#")
-            docstrings = sum(isinstance(n, (ast.FunctionDef, ast.ClassDef, ast.Module)) and (ast.get_docstring(n) is not None) for n in ast.walk(tree))
-            async_funcs = sum(isinstance(n, ast.AsyncFunctionDef) for n in ast.walk(tree))
+            lines = stats["lines"]
+            funcs = stats["funcs"]
+            classes = stats["classes"]
+            imports = stats["imports"]
+            comments = stats["comments"]
+            docstrings = stats["docstrings"]
+            async_funcs = stats["async_funcs"]
             
             total_stats["files"] += 1
             total_stats["total_lines"] += lines
@@ -177,6 +545,7 @@ def analyze_directory(path):
             total_stats["total_comments"] += comments
             total_stats["total_docstrings"] += docstrings
             total_stats["total_async"] += async_funcs
+            total_stats["total_findings"] += len(stats["findings"])
             total_stats["total_size"] += py_file.stat().st_size
             
             file_details.append({"name": py_file.name, "path": str(py_file.relative_to(path)), "lines": lines, "funcs": funcs, "classes": classes, "imports": imports, "comments": comments, "size": py_file.stat().st_size / 1024})
@@ -197,6 +566,8 @@ def analyze_directory(path):
     summary_table.add_row("💬 Комментариев", f"[bold white]{total_stats['total_comments']:,}[/bold white]", "Строк комментариев")
     summary_table.add_row("📖 Docstrings", f"[bold white]{total_stats['total_docstrings']:,}[/bold white]", "Документированных элементов")
     summary_table.add_row("⚡ Async функций", f"[bold white]{total_stats['total_async']:,}[/bold white]", "Асинхронных функций")
+    summary_table.add_row("🐢 Медленный код", f"[bold white]{total_stats['total_findings']:,}[/bold white]", f"Подозрений (gram --perf {path})")
+    summary_table.add_row("🧮 Сложных функций", f"[bold white]{metrics.count_over('complexity', HOTSPOT_LIMITS['complexity']):,}[/bold white]", f"Сложность ≥ {HOTSPOT_LIMITS['complexity']} (gram --info {path} --hotspots)")
     summary_table.add_row("💾 Размер", f"[bold white]{total_stats['total_size'] / 1024:.1f} MB[/bold white]", "Общий размер файлов")
     
     console.print(summary_table)
@@ -239,4 +610,92 @@ def analyze_directory(path):
         )
         console.print(score_panel)
     
-    console.print("")
\ No newline at end of file
+    console.print("")
+    return metrics
+
+def show_hotspots(metrics: FunctionMetrics, column: str, top: int, minimum: int = None):
+    """Топ-N функций по метрике или (с minimum) все функции не ниже порога, плюс сколько функций превышает каждый порог."""
+    if not len(metrics):
+        console.print(Panel("[yellow bold]⚠️ Функций не найдено[/yellow bold]", title="🧮 Горячие точки", border_style="yellow"))
+        console.print("")
+        return
+
+    if minimum is None:
+        rows = metrics.top(column, top)
+        title = f"🧮 Топ-{len(rows)} функций: {HOTSPOT_TITLES[column].lower()}"
+    else:
+        matched = metrics.where(column, minimum)
+        rows = matched[:top]
+        title = f"🧮 {HOTSPOT_TITLES[column]} ≥ {minimum}: {len(matched):,} функций (показано {len(rows)})"
+
+    table = Table(title=title, show_header=True)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("⚙️ Функция", style="bold white", overflow="fold", min_width=24)
+    for name in FunctionMetrics.COLUMNS:
+        table.add_column(HOTSPOT_TITLES[name], justify="right", style="bold yellow" if name == column else "cyan", no_wrap=True)
+    for i, row in enumerate(rows, 1):
+        file_name, name, line, *values = metrics.row(row)
+        cells = [f"[red]{value}[/red]" if value >= HOTSPOT_LIMITS[metric] else str(value) for metric, value in zip(FunctionMetrics.COLUMNS, values)]
+        table.add_row(str(i), f"{name}\n[dim]{file_name}:{line}[/dim]", *cells)
+    console.print(table)
+    console.print("")
+
+    limits = Table(title=f"🚦 Пороги ({len(metrics):,} функций)", show_header=True)
+    limits.add_column("📈 Метрика", style="bold cyan", no_wrap=True)
+    limits.add_column("🎯 Порог", justify="right", style="white")
+    limits.add_column("⚠️ Функций выше", justify="right", style="bold white")
+    limits.add_column("%", justify="right", style="dim")
+    for name in FunctionMetrics.COLUMNS:
+        over = metrics.count_over(name, HOTSPOT_LIMITS[name])
+        limits.add_row(HOTSPOT_TITLES[name], f"≥ {HOTSPOT_LIMITS[name]}", f"{over:,}", f"{over / len(metrics) * 100:.1f}")
+    console.print(limits)
+    console.print("")
+
+
+def show_perf(path_str: str):
+    path = Path(path_str)
+    if not path.exists():
+        console.print(Panel(f"[red bold]❌ Файл или папка не найдена![/red bold]\n[dim]Путь: {path}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    python_files = [path] if path.is_file() else sorted(path.rglob("*.py"))
+    if not python_files:
+        console.print(Panel("[yellow bold]⚠️ В папке не найдено Python файлов![/yellow bold]", title="⚠️ Предупреждение", border_style="yellow"))
+        return
+
+    console.print(f"\n[bold cyan]🐢 Ищу медленные конструкции: [yellow]{path}[/yellow][/bold cyan]\n")
+
+    findings = []
+    for py_file in python_files:
+        name = str(py_file.relative_to(path)) if path.is_dir() else py_file.name
+        try:
+            stats = analyze_source(py_file.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError, OSError) as e:
+            console.print(f"[red]Ошибка при анализе {name}: {str(e)}[/red]")
+            continue
+        findings.extend((name, finding) for finding in stats["findings"])
+
+    if not findings:
+        console.print(Panel(f"[bold green]✅ Подозрительных мест не найдено[/bold green]\n[dim]Проверено файлов: {len(python_files)}, правил: {len(RULES)}[/dim]", title="🐢 Производительность", border_style="green"))
+        console.print("")
+        return
+
+    table = Table(title=f"🐢 Медленные места (показано {min(len(findings), PERF_LIMIT)} из {len(findings)})", show_header=True)
+    table.add_column("📄 Где", style="bold white", no_wrap=True)
+    table.add_column("🔧 Правило", style="yellow")
+    table.add_column("📖 Что не так", style="white")
+    table.add_column("💡 Как исправить", style="green")
+    for name, finding in findings[:PERF_LIMIT]:
+        table.add_row(f"{name}:{finding.line}", f"[dim]{finding.code}[/dim]\n{finding.title}", finding.message, finding.fix)
+    console.print(table)
+    console.print("")
+
+    totals = Table(title="📊 По правилам", show_header=True)
+    totals.add_column("🔧 Правило", style="bold cyan", no_wrap=True)
+    totals.add_column("📊 Находок", justify="right", style="bold white")
+    for rule in RULES:
+        count = sum(finding.code == rule.code for _, finding in findings)
+        if count:
+            totals.add_row(f"{rule.code} {rule.title}", f"{count:,}")
+    console.print(totals)
+    console.print("")
@@ -0,0 +1,259 @@
+"""Бенчмарк машины"""
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+
+console = Console()
+
+WARMUP_RUNS = 1
+TRIALS = 5
+HASH_BLOCK = 1024 * 1024
+HASH_BLOCKS = 32
+MEMORY_BUFFER = 64 * 1024 * 1024
+DISK_FILE = 64 * 1024 * 1024
+DISK_BLOCK = 1024 * 1024
+RANDOM_BLOCK = 4096
+RANDOM_READS = 2000
+INTERPRETER_LOOPS = 200_000
+FORMAT_VERSION = 1
+
+
+def _hash_blocks(blocks: int) -> int:
+    """Нагрузка на одно ядро: SHA-256 по blocks мегабайтам. Возвращает обработанные байты."""
+    block = b"\x5a" * HASH_BLOCK
+    digest = hashlib.sha256()
+    for _ in range(blocks):
+        digest.update(block)
+    return blocks * HASH_BLOCK
+
+
+def _interpreter_work(loops: int) -> int:
+    # Типичная смесь байткода: вызовы, арифметика, словари, списки, строки
+    table = {}
+    items = []
+    total = 0
+    for i in range(loops):
+        key = i & 1023
+        table[key] = table.get(key, 0) + i
+        if i % 3 == 0:
+            items.append(i)
+        total += len(str(key)) + (i * 7) % 13
+    return total + len(items)
+
+
+class Benchmarks:
+    """Каждый метод — одно испытание; возвращает значение в единицах бенчмарка (больше — лучше)."""
+
+    def __init__(self, workdir: Path, workers: int):
+        self.workdir = workdir
+        self.workers = workers
+        self.pool = None
+        self.data_path = workdir / "bench.bin"
+        self.source = bytearray(os.urandom(MEMORY_BUFFER // 64)) * 64
+        self.target = bytearray(MEMORY_BUFFER)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def single_core(self) -> float:
+        started = time.perf_counter()
+        processed = _hash_blocks(HASH_BLOCKS)
+        return processed / (time.perf_counter() - started) / 1024**2
+
+    def multi_core(self) -> float:
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            # Запуск процессов не входит в замер
+            list(self.pool.map(_hash_blocks, [1] * self.workers))
+        started = time.perf_counter()
+        processed = sum(self.pool.map(_hash_blocks, [HASH_BLOCKS] * self.workers * 2))
+        return processed / (time.perf_counter() - started) / 1024**2
+
+    def memory(self) -> float:
+        source, target = memoryview(self.source), memoryview(self.target)
+        started = time.perf_counter()
+        for _ in range(4):
+            target[:] = source
+        return 4 * MEMORY_BUFFER / (time.perf_counter() - started) / 1024**3
+
+    def disk_write(self) -> float:
+        block = os.urandom(DISK_BLOCK)
+        started = time.perf_counter()
+        with open(self.data_path, "wb", buffering=0) as f:
+            for _ in range(DISK_FILE // DISK_BLOCK):
+                f.write(block)
+            os.fsync(f.fileno())
+        return DISK_FILE / (time.perf_counter() - started) / 1024**2
+
+    def _drop_cache(self, fd: int):
+        # Без этого чтение меряет страничный кэш, а не диск; где fadvise нет — остаётся как есть
+        if hasattr(os, "posix_fadvise"):
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def disk_read(self) -> float:
+        if not self.data_path.exists():
+            self.disk_write()
+        fd = os.open(self.data_path, os.O_RDONLY)
+        try:
+            self._drop_cache(fd)
+            started = time.perf_counter()
+            while os.read(fd, DISK_BLOCK):
+                pass
+            return DISK_FILE / (time.perf_counter() - started) / 1024**2
+        finally:
+            os.close(fd)
+
+    def disk_random(self) -> float:
+        if not self.data_path.exists():
+            self.disk_write()
+        blocks = DISK_FILE // RANDOM_BLOCK
+        offsets = [random.randrange(blocks) * RANDOM_BLOCK for _ in range(RANDOM_READS)]
+        fd = os.open(self.data_path, os.O_RDONLY)
+        try:
+            self._drop_cache(fd)
+            read = getattr(os, "pread", None)
+            started = time.perf_counter()
+            for offset in offsets:
+                if read:
+                    read(fd, RANDOM_BLOCK, offset)
+                else:
+                    os.lseek(fd, offset, os.SEEK_SET)
+                    os.read(fd, RANDOM_BLOCK)
+            return RANDOM_READS / (time.perf_counter() - started)
+        finally:
+            os.close(fd)
+
+    def interpreter(self) -> float:
+        started = time.perf_counter()
+        _interpreter_work(INTERPRETER_LOOPS)
+        return INTERPRETER_LOOPS / (time.perf_counter() - started) / 1000
+
+
+BENCHMARKS = [
+    ("single_core", "⚡ CPU, одно ядро", "MB/s", "SHA-256"),
+    ("multi_core", "🔥 CPU, все ядра", "MB/s", "SHA-256, процессы"),
+    ("memory", "🧠 Память", "GB/s", "копирование 64 MB"),
+    ("disk_write", "💾 Диск, запись", "MB/s", "подряд + fsync"),
+    ("disk_read", "💾 Диск, чтение", "MB/s", "подряд"),
+    ("disk_random", "🎲 Диск, случайное чтение", "IOPS", "блоки 4 KB"),
+    ("interpreter", "🐍 Интерпретатор", "k итераций/s", "смешанный байткод"),
+]
+
+
+def run_benchmarks(trials: int = TRIALS, warmup: int = WARMUP_RUNS, progress=None) -> dict:
+    workers = os.cpu_count() or 1
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="gram-bench-") as workdir:
+        benchmarks = Benchmarks(Path(workdir), workers)
+        try:
+            for key, title, unit, _ in BENCHMARKS:
+                task = progress.add_task(f"[bold green]{title}...", total=warmup + trials) if progress else None
+                run = getattr(benchmarks, key)
+                samples = []
+                for attempt in range(warmup + trials):
+                    value = run()
+                    if attempt >= warmup:
+                        samples.append(value)
+                    if progress:
+                        progress.advance(task)
+                results[key] = {
+                    "unit": unit,
+                    "median": statistics.median(samples),
+                    "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                    "samples": samples,
+                }
+        finally:
+            benchmarks.close()
+
+    return {
+        "version": FORMAT_VERSION,
+        "created": time.time(),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": workers,
+            "python": platform.python_version(),
+            "implementation": sys.implementation.name,
+        },
+        "trials": trials,
+        "results": results,
+    }
+
+
+def _format_value(value: float) -> str:
+    return f"{value:,.0f}" if value >= 100 else f"{value:,.2f}"
+
+
+def show_benchmark(output_path: str = None, compare_path: str = None):
+    baseline = None
+    if compare_path:
+        try:
+            baseline = json.loads(Path(compare_path).read_text(encoding="utf-8"))
+            if not isinstance(baseline, dict) or not isinstance(baseline.get("results"), dict):
+                raise ValueError("это не результат gram --bench")
+        except (OSError, ValueError) as e:
+            console.print(Panel(f"[bold red]❌ Не удалось прочитать {compare_path}: {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+            return
+
+    console.print(f"\n[bold bright_cyan]🏁 Бенчмарк: {WARMUP_RUNS} прогрев + {TRIALS} замеров на тест[/bold bright_cyan]\n")
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), TextColumn("[dim]{task.completed}/{task.total}[/dim]"), console=console, transient=True) as progress:
+        report = run_benchmarks(progress=progress)
+
+    machine = report["machine"]
+    console.print(Panel(
+        f"[bold bright_green]💻 {machine['platform']}[/bold bright_green]\n"
+        f"[bold cyan]🖥️ {machine['cpus']} ядер | {machine['processor']}[/bold cyan]\n"
+        f"[bold yellow]🐍 {machine['implementation']} {machine['python']}[/bold yellow]",
+        title="🎯 Машина", border_style="bright_blue"))
+
+    table = Table(title="🏁 Результаты (медиана ± σ)", show_header=True)
+    table.add_column("🔧 Тест", style="bold cyan", no_wrap=True)
+    table.add_column("📊 Результат", justify="right", no_wrap=True)
+    table.add_column("📏 Единицы", style="dim", no_wrap=True)
+    if baseline:
+        table.add_column("📼 Было", justify="right", style="dim", no_wrap=True)
+        table.add_column("Δ", justify="right", no_wrap=True)
+    else:
+        table.add_column("💡 Что меряется", style="dim")
+
+    for key, title, unit, description in BENCHMARKS:
+        result = report["results"][key]
+        row = [title, f"{_format_value(result['median'])} ± {_format_value(result['stdev'])}", unit]
+        old = baseline["results"].get(key) if baseline else None
+        if baseline and old and old.get("median"):
+            change = (result["median"] / old["median"] - 1) * 100
+            # Разница в пределах разброса обоих запусков — шум, а не изменение
+            noise = (result["stdev"] + old.get("stdev", 0.0)) / old["median"] * 100
+            color = "dim" if abs(change) <= noise else "green" if change > 0 else "red"
+            row += [_format_value(old["median"]), f"[{color}]{change:+.1f}%[/{color}]"]
+        elif baseline:
+            row += ["—", "[dim]—[/dim]"]
+        else:
+            row.append(description)
+        table.add_row(*row)
+
+    console.print(table)
+    console.print("")
+
+    if output_path:
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        console.print(f"[green]💾 Результаты сохранены в {output_path}[/green]")
+        console.print(f"[dim]Сравнить позже: gram --bench --compare {output_path}[/dim]")
+        console.print("")
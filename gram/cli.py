@@ -3,10 +3,45 @@ import argparse
 def parse_args():
     parser = argparse.ArgumentParser(prog='gram', add_help=False)
     parser.add_argument('--start', dest='start_flag')
+    parser.add_argument('--set', action='append', dest='set_flag')
     parser.add_argument('--info', dest='info_flag')
+    parser.add_argument('--hotspots', nargs='?', type=int, const=0, dest='hotspots_flag')
+    parser.add_argument('--min', type=int, dest='min_flag')
     parser.add_argument('--lint', dest='lint_flag')
+    parser.add_argument('--perf', dest='perf_flag')
+    parser.add_argument('--dupes', dest='dupes_flag')
+    parser.add_argument('--deadcode', dest='deadcode_flag')
     parser.add_argument('--gpt', action='store_true', dest='gpt_flag')
+    parser.add_argument('--no-cache', action='store_true', dest='no_cache_flag')
+    parser.add_argument('--budget', type=int, dest='budget_flag')
+    parser.add_argument('--session', dest='session_flag')
+    parser.add_argument('--race', type=int, dest='race_flag')
+    parser.add_argument('--batch', dest='batch_flag')
+    parser.add_argument('--out', dest='out_flag')
+    parser.add_argument('--concurrency', type=int, dest='concurrency_flag')
+    parser.add_argument('--rate', type=float, dest='rate_flag')
+    parser.add_argument('--unordered', action='store_true', dest='unordered_flag')
+    parser.add_argument('--review', dest='review_flag')
+    parser.add_argument('--offline', action='store_true', dest='offline_flag')
+    parser.add_argument('--watchlist', dest='watchlist_flag')
+    parser.add_argument('--watch', nargs='?', type=float, const=0.0, dest='watch_flag')
+    parser.add_argument('--history', dest='history_flag')
+    parser.add_argument('--since', dest='since_flag')
+    parser.add_argument('--compact', action='store_true', dest='compact_flag')
+    parser.add_argument('--top', type=int, dest='top_flag')
+    parser.add_argument('--sort', dest='sort_flag')
+    parser.add_argument('--record', dest='record_flag')
+    parser.add_argument('--report', dest='report_flag')
+    parser.add_argument('--interval', dest='interval_flag')
     parser.add_argument('--pc', action='store_true', dest='pc_flag')
+    parser.add_argument('--loadtest', dest='loadtest_flag')
+    parser.add_argument('--scenario', dest='scenario_flag')
+    parser.add_argument('--duration', dest='duration_flag')
+    parser.add_argument('--bench', action='store_true', dest='bench_flag')
+    parser.add_argument('--compare', dest='compare_flag')
+    parser.add_argument('--profile', nargs=argparse.REMAINDER, dest='profile_flag')
+    parser.add_argument('--sample', action='store_true', dest='sample_flag')
+    parser.add_argument('--mem', nargs=argparse.REMAINDER, dest='mem_flag')
     parser.add_argument('--fiat', action='store_true', dest='fiat_flag')
     parser.add_argument('--version', action='store_true', dest='version_flag')
     parser.add_argument('--update', action='store_true', dest='update_flag')
@@ -128,8 +163,8 @@ def show_interactive_menu():
             try:
                 if '--start' in user_input:
                     from gram.project import create_project
-                    project_name = user_input.split('--start')[1].strip()
-                    create_project(project_name)
+                    start_args = user_input.split('--start')[1].split()
+                    create_project(start_args[0] if start_args else "", overrides=[value for flag, value in zip(start_args, start_args[1:]) if flag == '--set'])
                 elif '--info' in user_input:
                     from gram.analysis import show_info
                     file_path = user_input.split('--info')[1].strip()
@@ -140,13 +175,13 @@ def show_interactive_menu():
                     lint_file(file_path)
                 elif '--gpt' in user_input:
                     from gram.gpt import gpt_chat
-                    gpt_chat()
+                    gpt_chat(use_cache='--no-cache' not in user_input)
                 elif '--pc' in user_input:
                     from gram.system_info import show_pc_info
                     show_pc_info()
                 elif '--fiat' in user_input:
                     from gram.crypto import show_fiat_info
-                    show_fiat_info()
+                    show_fiat_info(offline='--offline' in user_input)
                 elif '--version' in user_input:
                     from gram.version import show_version
                     show_version()
@@ -204,21 +239,73 @@ def main():
         show_update()
         return
     
-    if not any(vars(args).values()):
+    # --profile/--mem без цели дают пустой список: это тоже явная команда
+    if not any(value not in (None, False) for value in vars(args).values()):
         show_interactive_menu()
         return
     
     render_banner()
     
-    if args.start_flag:
-        create_project(args.start_flag)
+    from gram.version_check import check_for_updates
+    check_for_updates()
+    
+    if args.profile_flag is not None:
+        from gram.profiler import run_profile
+        run_profile(args.profile_flag, sample=args.sample_flag, interval=args.interval_flag, top=args.top_flag, output_path=args.out_flag)
+    elif args.mem_flag is not None:
+        from gram.memtrace import run_memory
+        run_memory(args.mem_flag, interval=args.interval_flag, top=args.top_flag, output_dir=args.out_flag, compare_path=args.compare_flag)
+    elif args.start_flag:
+        create_project(args.start_flag, overrides=args.set_flag)
     elif args.info_flag:
-        show_info(args.info_flag)
+        show_info(args.info_flag, hotspots=args.hotspots_flag, sort=args.sort_flag, minimum=args.min_flag)
     elif args.lint_flag:
         lint_file(args.lint_flag)
+    elif args.perf_flag:
+        from gram.analysis import show_perf
+        show_perf(args.perf_flag)
+    elif args.dupes_flag:
+        from gram.dupes import show_duplicates
+        show_duplicates(args.dupes_flag, top=args.top_flag)
+    elif args.deadcode_flag:
+        from gram.deadcode import show_dead_code
+        show_dead_code(args.deadcode_flag, top=args.top_flag, use_cache=not args.no_cache_flag)
+    elif args.gpt_flag and args.batch_flag:
+        from gram.gpt_batch import run_batch
+        run_batch(args.batch_flag, args.out_flag, concurrency=args.concurrency_flag, rate=args.rate_flag, ordered=not args.unordered_flag, use_cache=not args.no_cache_flag, race=args.race_flag or 0)
+    elif args.gpt_flag and args.review_flag:
+        from gram.gpt_review import review_path
+        review_path(args.review_flag, budget=args.budget_flag, concurrency=args.concurrency_flag, use_cache=not args.no_cache_flag, output_path=args.out_flag)
     elif args.gpt_flag:
-        gpt_chat()
+        gpt_chat(use_cache=not args.no_cache_flag, budget=args.budget_flag, session=args.session_flag, race=args.race_flag or 0)
+    elif args.pc_flag and args.record_flag:
+        from gram.pc_recorder import record_pc
+        record_pc(args.record_flag, interval=args.interval_flag)
+    elif args.pc_flag and args.report_flag:
+        from gram.pc_recorder import show_pc_report
+        show_pc_report(args.report_flag)
+    elif args.pc_flag and args.top_flag is not None:
+        from gram.processes import show_top_processes
+        show_top_processes(args.top_flag, sort=args.sort_flag)
+    elif args.pc_flag and args.watch_flag is not None:
+        from gram.pc_monitor import watch_pc
+        watch_pc(args.watch_flag or None)
     elif args.pc_flag:
         show_pc_info()
+    elif args.loadtest_flag:
+        from gram.loadtest import run_loadtest
+        run_loadtest(args.loadtest_flag, scenario_path=args.scenario_flag, duration=args.duration_flag, concurrency=args.concurrency_flag, rate=args.rate_flag, output_path=args.out_flag)
+    elif args.bench_flag:
+        from gram.bench import show_benchmark
+        show_benchmark(output_path=args.out_flag, compare_path=args.compare_flag)
+    elif args.fiat_flag and args.history_flag:
+        from gram.crypto import show_rate_history
+        show_rate_history(args.history_flag, since=args.since_flag)
+    elif args.fiat_flag and args.compact_flag:
+        from gram.crypto import compact_rate_history
+        compact_rate_history(args.since_flag)
+    elif args.fiat_flag and args.watch_flag is not None:
+        from gram.ticker import watch_fiat
+        watch_fiat(args.watch_flag or None, watchlist_path=args.watchlist_flag)
     elif args.fiat_flag:
-        show_fiat_info()
\ No newline at end of file
+        show_fiat_info(offline=args.offline_flag, watchlist_path=args.watchlist_flag)
\ No newline at end of file
@@ -1,35 +1,56 @@
-import requests
-import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
+from gram.rates import FiatProvider, CryptoProvider, conversion_matrix
+from gram.watchlist import load_watchlist, fiat_name, crypto_name
+from gram.rate_cache import get_rates, get_rates_offline, format_age, wait_for_refresh
 
 console = Console()
 
-def get_currency_rates():
-    try:
-        response = requests.get('https://api.exchangerate-api.com/v4/latest/USD', timeout=10)
-        if response.status_code == 200:
-            return response.json()['rates']
-        return None
-    except:
-        return None
+SOURCE_LABELS = {"live": "[green]онлайн[/green]", "cache": "[green]кэш[/green]", "stale": "[yellow]устарело, обновляется в фоне[/yellow]", "offline": "[yellow]офлайн-снимок[/yellow]"}
 
-def get_crypto_rates():
-    try:
-        response = requests.get('https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd&include_24hr_change=true', timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except:
-        return None
+def describe_snapshot(title, snapshot):
+    if snapshot is None:
+        return f"{title}: [red]нет данных[/red]"
+    fetched = datetime.fromtimestamp(snapshot["fetched_at"])
+    age = format_age(datetime.now().timestamp() - snapshot["fetched_at"])
+    return f"{title}: {fetched.strftime('%Y-%m-%d %H:%M')} ({age}, {SOURCE_LABELS[snapshot['source']]})"
+
+def build_price_rows(watchlist, currency_rates, crypto_rates):
+    """Строки таблиц: цена каждой валюты и монеты во всех базовых валютах."""
+    bases = [code for code in watchlist["base"] if code == "USD" or (currency_rates and code in currency_rates)] or ["USD"]
+    base_rates = [1.0 if code == "USD" else currency_rates[code] for code in bases]
+    fiat_codes = [code for code in watchlist["fiat"] if currency_rates and code in currency_rates and currency_rates[code]]
+    crypto_ids = [coin_id for coin_id in watchlist["crypto"] if crypto_rates and crypto_rates.get(coin_id)]
+    
+    usd_prices = [1.0 / currency_rates[code] for code in fiat_codes] + [crypto_rates[coin_id].get('usd', 0) for coin_id in crypto_ids]
+    matrix = conversion_matrix(usd_prices, base_rates)
+    return bases, fiat_codes, matrix[:len(fiat_codes)], crypto_ids, matrix[len(fiat_codes):]
 
-def show_fiat_info():
+def format_change(current, previous, inverse=False):
+    if not previous or not current:
+        return "[dim]—[/dim]"
+    # Курс к USD растёт, когда сама валюта дешевеет
+    change = (previous / current - 1) * 100 if inverse else (current / previous - 1) * 100
+    if abs(change) < 0.005:
+        return "[dim]➖ 0.00%[/dim]"
+    return f"[green]📈 +{change:.2f}%[/green]" if change > 0 else f"[red]📉 {change:.2f}%[/red]"
+
+def show_fiat_info(offline: bool = False, watchlist_path: str = None):
+    try:
+        watchlist = load_watchlist(watchlist_path)
+    except ValueError as e:
+        console.print(Panel(f"[red bold]❌ {escape(str(e))}[/red bold]", title="🚫 Ошибка", border_style="red"))
+        return
+    
     console.print("\n[bold bright_cyan]💰 Получаю актуальные курсы валют...[/bold bright_cyan]")
     
-    currency_rates = get_currency_rates()
-    crypto_rates = get_crypto_rates()
+    providers = [FiatProvider(), CryptoProvider(watchlist["crypto"])]
+    snapshots = get_rates_offline(providers) if offline else get_rates(providers)
+    currency_rates = snapshots["fiat"]["data"] if snapshots["fiat"] else None
+    crypto_rates = snapshots["crypto"]["data"] if snapshots["crypto"] else None
     
     if not currency_rates and not crypto_rates:
         console.print(Panel("[red bold]❌ Не удалось получить курсы валют![/red bold]\n[dim]Проверьте подключение к интернету[/dim]", title="🚫 Ошибка", border_style="red"))
@@ -37,56 +58,113 @@ def show_fiat_info():
     
     console.print("")
     
-    console.print(Panel(f"[bold bright_green]💰 Курсы валют и криптовалют[/bold bright_green]\n\n[dim]Актуальные курсы на {datetime.now().strftime('%Y-%m-%d %H:%M')}[/dim]", title="💱 Финансовые рынки", border_style="bright_blue"))
+    console.print(Panel(f"[bold bright_green]💰 Курсы валют и криптовалют[/bold bright_green]\n\n[dim]{describe_snapshot('🏦 Валюты', snapshots['fiat'])}[/dim]\n[dim]{describe_snapshot('₿ Крипто', snapshots['crypto'])}[/dim]", title="💱 Финансовые рынки", border_style="bright_blue"))
     console.print("")
     
-    if currency_rates:
-        currency_table = Table(title="🏦 Основные валюты (курс к доллару США)", show_header=True)
+    bases, fiat_codes, fiat_rows, crypto_ids, crypto_rows = build_price_rows(watchlist, currency_rates, crypto_rates)
+    previous_rates = (snapshots["fiat"] or {}).get("previous") or {}
+    
+    if fiat_codes:
+        currency_table = Table(title="🏦 Основные валюты (стоимость 1 единицы)", show_header=True)
         currency_table.add_column("💱 Валюта", style="bold cyan", no_wrap=True)
-        currency_table.add_column("💵 USD", style="white")
-        currency_table.add_column("💴 RUB", style="bold white")
-        currency_table.add_column("📊 Изменение", style="dim")
-        
-        currencies = {
-            'EUR': 'Евро', 'GBP': 'Фунт стерлингов', 'JPY': 'Японская йена',
-            'CNY': 'Китайский юань', 'CAD': 'Канадский доллар', 'AUD': 'Австралийский доллар', 'CHF': 'Швейцарский франк'
-        }
+        for base in bases:
+            currency_table.add_column(f"💵 {base}", style="white")
+        currency_table.add_column("📊 С прошлого снимка", style="dim")
         
-        for code, name in currencies.items():
-            if code in currency_rates:
-                usd_rate = currency_rates[code]
-                rub_rate = usd_rate * currency_rates.get('RUB', 75)
-                change = "📈 +" if code in ['EUR', 'GBP'] else "📉 -"
-                currency_table.add_row(f"[bold]{name}[/bold]\n[dim]{code}[/dim]", f"{usd_rate:.4f}", f"{rub_rate:.2f}", f"[green]{change}[/green]")
+        for code, row in zip(fiat_codes, fiat_rows):
+            currency_table.add_row(f"[bold]{fiat_name(code)}[/bold]\n[dim]{code}[/dim]", *[f"{value:,.4f}" for value in row], format_change(currency_rates[code], previous_rates.get(code), inverse=True))
         
         console.print(currency_table)
         console.print("")
     
-    if crypto_rates:
+    if crypto_ids:
         crypto_table = Table(title="₿ Криптовалюты", show_header=True)
         crypto_table.add_column("🪙 Криптовалюта", style="bold yellow", no_wrap=True)
-        crypto_table.add_column("💵 USD", style="white")
+        for base in bases:
+            crypto_table.add_column(f"💵 {base}", style="white")
         crypto_table.add_column("📊 24ч изменение", style="dim")
         
-        for crypto_id, data in crypto_rates.items():
-            crypto_name = "Bitcoin" if crypto_id == "bitcoin" else "Ethereum"
-            price = data.get('usd', 0)
-            change_24h = data.get('usd_24h_change', 0)
+        for coin_id, row in zip(crypto_ids, crypto_rows):
+            change_24h = crypto_rates[coin_id].get('usd_24h_change') or 0
             
             change_color = "green" if change_24h >= 0 else "red"
             change_sign = "+" if change_24h >= 0 else ""
             
-            crypto_table.add_row(f"[bold]{crypto_name}[/bold]", f"${price:,.2f}", f"[{change_color}]{change_sign}{change_24h:.2f}%[/ {change_color}]")
+            crypto_table.add_row(f"[bold]{crypto_name(coin_id)}[/bold]", *[f"{value:,.2f}" for value in row], f"[{change_color}]{change_sign}{change_24h:.2f}%[/{change_color}]")
         
         console.print(crypto_table)
         console.print("")
     
-    console.print(Panel("[bold yellow]📊 Информация:[/bold yellow]\n\n[dim]• Курсы обновляются в реальном времени[/dim]\n[dim]• Данные предоставлены бесплатными API[/dim]\n[dim]• Для точных расчетов используйте актуальные курсы банков[/dim]", title="ℹ️ Примечание", border_style="yellow"))
+    missing = [code for code in watchlist["fiat"] if code not in fiat_codes] + [coin_id for coin_id in watchlist["crypto"] if coin_id not in crypto_ids]
+    if missing:
+        console.print(f"[dim]⚠️ Нет данных: {', '.join(missing[:20])}{' …' if len(missing) > 20 else ''}[/dim]\n")
+    
+    console.print(Panel("[bold yellow]📊 Информация:[/bold yellow]\n\n[dim]• Курсы кэшируются локально и обновляются в фоне[/dim]\n[dim]• Данные предоставлены бесплатными API[/dim]\n[dim]• Для точных расчетов используйте актуальные курсы банков[/dim]", title="ℹ️ Примечание", border_style="yellow"))
     console.print("")
     
     if currency_rates and 'RUB' in currency_rates:
         usd_to_rub = currency_rates['RUB']
-        eur_to_rub = usd_to_rub * currency_rates.get('EUR', 0.85)
+        eur_line = f"[bold]1 EUR = {usd_to_rub / currency_rates['EUR']:.2f} RUB[/bold]\n" if currency_rates.get('EUR') else ""
         
-        console.print(Panel(f"[bold bright_cyan]🧮 Быстрый расчет:[/bold bright_cyan]\n\n[bold]1 USD = {usd_to_rub:.2f} RUB[/bold]\n[bold]1 EUR = {eur_to_rub:.2f} RUB[/bold]\n[bold]100 USD = {usd_to_rub * 100:.2f} RUB[/bold]\n[bold]1000 USD = {usd_to_rub * 1000:.2f} RUB[/bold]", title="💱 Конвертер", border_style="bright_cyan"))
-        console.print("")
\ No newline at end of file
+        console.print(Panel(f"[bold bright_cyan]🧮 Быстрый расчет:[/bold bright_cyan]\n\n[bold]1 USD = {usd_to_rub:.2f} RUB[/bold]\n{eur_line}[bold]100 USD = {usd_to_rub * 100:.2f} RUB[/bold]\n[bold]1000 USD = {usd_to_rub * 1000:.2f} RUB[/bold]", title="💱 Конвертер", border_style="bright_cyan"))
+        console.print("")
+    
+    if not offline and not wait_for_refresh():
+        console.print("[dim]⏳ Фоновое обновление курсов не успело завершиться — свежие данные будут при следующем запуске[/dim]\n")
+
+def show_rate_history(symbols_str: str, since: str = None):
+    from gram.rate_history import RateHistory, resolve_symbol, summarize, sparkline
+    from gram.units import parse_duration
+    
+    try:
+        period = parse_duration(since or "30d", default_unit="d")
+    except ValueError as e:
+        console.print(Panel(f"[red bold]❌ {e}[/red bold]", title="🚫 Ошибка", border_style="red"))
+        return
+    
+    requested = [name.strip() for name in symbols_str.split(",") if name.strip()]
+    symbols = [resolve_symbol(name) for name in requested]
+    history = RateHistory()
+    series = history.query(symbols, since=datetime.now().timestamp() - period)
+    
+    history_table = Table(title=f"📈 История курсов за {since or '30d'} (цена в USD)", show_header=True)
+    history_table.add_column("🪙 Актив", style="bold cyan", no_wrap=True)
+    history_table.add_column("Мин", style="white", justify="right", no_wrap=True)
+    history_table.add_column("Макс", style="white", justify="right", no_wrap=True)
+    history_table.add_column("Среднее", style="white", justify="right", no_wrap=True)
+    history_table.add_column("Последняя", style="bold white", justify="right", no_wrap=True)
+    history_table.add_column("Δ", justify="right", no_wrap=True)
+    history_table.add_column("Динамика", style="bright_blue", no_wrap=True)
+    
+    price = lambda value: f"{value:,.2f}" if value >= 100 else f"{value:.4f}"
+    missing = []
+    for name, symbol in zip(requested, symbols):
+        points = series.get(symbol) or []
+        if not points:
+            missing.append(name)
+            continue
+        stats = summarize(points)
+        color = "green" if stats["change"] >= 0 else "red"
+        history_table.add_row(f"[bold]{name.upper()}[/bold]\n[dim]точек: {stats['count']:,}[/dim]", price(stats['min']), price(stats['max']), price(stats['avg']), price(stats['last']), f"[{color}]{stats['change']:+.2f}%[/{color}]", sparkline(points, width=10))
+    
+    console.print("")
+    if history_table.row_count:
+        console.print(history_table)
+        console.print("")
+    if missing:
+        console.print(Panel(f"[yellow bold]⚠️ Нет сохранённых данных: {', '.join(missing)}[/yellow bold]\n[dim]История пополняется при каждом запуске gram --fiat[/dim]", title="📭 История", border_style="yellow"))
+        console.print("")
+
+def compact_rate_history(older_than: str = None):
+    from gram.rate_history import RateHistory, COMPACT_AFTER
+    from gram.units import parse_duration
+    
+    try:
+        age = parse_duration(older_than, default_unit="d") if older_than else COMPACT_AFTER
+    except ValueError as e:
+        console.print(Panel(f"[red bold]❌ {e}[/red bold]", title="🚫 Ошибка", border_style="red"))
+        return
+    
+    before, after = RateHistory().compact(older_than=age)
+    console.print(Panel(f"[bold green]✅ История сжата[/bold green]\n[dim]Записей: {before:,} → {after:,} (старше {age / 86400:g} дн — среднее за час)[/dim]", title="🗜️ Сжатие", border_style="green"))
+    console.print("")
@@ -0,0 +1,428 @@
+"""Индекс символов проекта: неиспользуемые импорты, мёртвый код, модули без импортов"""
+import ast
+import hashlib
+import re
+import time
+from array import array
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from gram.dupes import python_files
+from gram.perf_rules import dotted
+from gram.storage import get_data_dir, read_json, write_json
+
+console = Console()
+
+DEFAULT_TOP = 30
+# Меняется при изменении формата записи: старый кэш просто перестраивается
+CACHE_VERSION = 1
+ENTRY_FILES = ("pyproject.toml", "setup.py", "setup.cfg")
+# "пакет.модуль:функция" в console_scripts / [project.scripts]
+ENTRY_POINT = re.compile(r"([A-Za-z_][\w.]*):([A-Za-z_]\w*)")
+# Такие файлы запускаются извне (pytest, python -m, setuptools), их не импортируют
+ENTRY_MODULES = {"__main__", "setup", "conftest", "manage", "noxfile", "fabfile"}
+KIND_FUNCTION, KIND_CLASS = 0, 1
+IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError"}
+
+
+class ModuleSymbols:
+    """Символы одного модуля. Все строки — номера в общей таблице имён индекса:
+    defs и imports — плоские массивы полей, refs — отсортированные номера без повторов."""
+    __slots__ = ("path", "module", "is_package", "is_script", "defs", "imports", "refs")
+
+    # Поля записей в плоских массивах
+    DEF_FIELDS = 3      # имя, строка, вид
+    IMPORT_FIELDS = 5   # связанное имя, модуль, импортируемое имя (0 — сам модуль), строка, проверять ли
+
+    def __init__(self, path, module, is_package, is_script, defs, imports, refs):
+        self.path = path
+        self.module = module
+        self.is_package = is_package
+        self.is_script = is_script
+        self.defs = defs
+        self.imports = imports
+        self.refs = refs
+
+    def iter_defs(self):
+        defs = self.defs
+        for i in range(0, len(defs), self.DEF_FIELDS):
+            yield defs[i], defs[i + 1], defs[i + 2]
+
+    def iter_imports(self):
+        imports = self.imports
+        for i in range(0, len(imports), self.IMPORT_FIELDS):
+            yield imports[i], imports[i + 1], imports[i + 2], imports[i + 3], imports[i + 4]
+
+
+class SymbolIndex:
+    """Модули проекта и общая таблица имён; номер 0 зарезервирован под пустую строку."""
+
+    def __init__(self):
+        self.names = [""]
+        self.ids = {"": 0}
+        self.modules = {}
+
+    def intern(self, name: str) -> int:
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def name(self, name_id: int) -> str:
+        return self.names[name_id]
+
+
+def module_name(path: Path, packages: dict) -> tuple:
+    """Имя модуля по цепочке пакетов (папок с __init__.py) над файлом: src/ и tests/ без __init__ в имя не входят."""
+    parts = [] if path.stem == "__init__" else [path.stem]
+    directory = path.parent
+    while True:
+        is_package = packages.get(directory)
+        if is_package is None:
+            is_package = packages[directory] = (directory / "__init__.py").is_file()
+        if not is_package or directory.parent == directory:
+            break
+        parts.append(directory.name)
+        directory = directory.parent
+    return ".".join(reversed(parts)), path.stem == "__init__"
+
+
+def resolve_relative(module: str, is_package: bool, level: int, target: str) -> str:
+    package = module if is_package else module.rpartition(".")[0]
+    for _ in range(level - 1):
+        package = package.rpartition(".")[0]
+    return ".".join(part for part in (package, target) if part)
+
+
+def _catches_import_error(node) -> bool:
+    """try с except ImportError: импорт в нём — проверка наличия пакета, а не использование."""
+    for handler in node.handlers:
+        types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+        if any(dotted(item) in IMPORT_ERRORS for item in types if item is not None):
+            return True
+    return False
+
+
+def _is_dotted_name(value: str) -> bool:
+    return bool(value) and len(value) < 200 and all(part.isidentifier() for part in value.split("."))
+
+
+def collect_symbols(index: SymbolIndex, path: Path, module: str, is_package: bool, code: bytes) -> ModuleSymbols:
+    """Определения верхнего уровня, импорты и все упоминания имён за один разбор файла."""
+    tree = ast.parse(code)
+    intern = index.intern
+    defs, imports, refs = array("I"), array("I"), set()
+    is_script = False
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # Декоратор регистрирует объект (маршруты, плагины, правила) — такие определения живы
+            if not node.decorator_list and not (node.name.startswith("__") and node.name.endswith("__")):
+                defs.extend((intern(node.name), node.lineno, KIND_CLASS if isinstance(node, ast.ClassDef) else KIND_FUNCTION))
+        elif isinstance(node, ast.If) and dotted(node.test.left if isinstance(node.test, ast.Compare) else node.test) == "__name__":
+            is_script = True
+
+    guarded = set()
+    # ast.walk идёт в ширину: try встречается раньше вложенных в него импортов
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Store):
+                refs.add(intern(node.id))
+        elif isinstance(node, ast.Attribute):
+            chain = dotted(node)
+            if chain is not None and not isinstance(node.ctx, ast.Store):
+                refs.add(intern(chain))
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # __all__, getattr(obj, "имя"), importlib.import_module("пакет.модуль"), аннотации в кавычках, код для python -c
+            value = node.value.strip()
+            if _is_dotted_name(value):
+                refs.add(intern(value))
+            elif len(value) < 500 and ("[" in value or "import " in value):
+                try:
+                    snippet = ast.parse(value)
+                except SyntaxError:
+                    continue
+                for child in ast.walk(snippet):
+                    if isinstance(child, ast.Name):
+                        refs.add(intern(child.id))
+                    elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                        refs.update(intern(name) for name in [getattr(child, "module", None) or "", *(alias.name for alias in child.names)] if name)
+        elif isinstance(node, ast.Try) and _catches_import_error(node):
+            guarded.update(id(child) for statement in node.body for child in ast.walk(statement) if isinstance(child, (ast.Import, ast.ImportFrom)))
+        elif isinstance(node, ast.Import):
+            checked = int(id(node) not in guarded)
+            for alias in node.names:
+                # import a.b связывает имя a, но загружает и a.b
+                bound = alias.asname or alias.name.partition(".")[0]
+                imports.extend((intern(bound), intern(alias.name), 0, node.lineno, checked))
+        elif isinstance(node, ast.ImportFrom):
+            target = resolve_relative(module, is_package, node.level, node.module or "") if node.level else node.module or ""
+            checked = int(id(node) not in guarded and target != "__future__")
+            for alias in node.names:
+                imports.extend((intern(alias.asname or alias.name), intern(target), intern(alias.name), node.lineno, checked))
+
+    return ModuleSymbols(str(path), module, is_package, is_script, defs, imports, array("I", sorted(refs)))
+
+
+def _cache_path(root: Path) -> Path:
+    digest = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return get_data_dir("symbols") / f"{digest}.json"
+
+
+def build_index(root: Path, use_cache: bool = True) -> tuple:
+    """Индекс по всем .py под root. Запись файла берётся из кэша, если не изменились размер и mtime.
+    Возвращает (индекс, ошибки разбора, сколько файлов взято из кэша)."""
+    index = SymbolIndex()
+    cache_path = _cache_path(root)
+    cache = read_json(cache_path, {}) if use_cache else {}
+    if cache.get("version") != CACHE_VERSION:
+        cache = {}
+    cached_names, cached_files = cache.get("names", [""]), cache.get("files", {})
+    packages, files, errors = {}, {}, []
+    reused = 0
+    translated = {}
+
+    def local(value: int) -> int:
+        # Номер имени в таблице кэша → номер в текущей таблице; устаревшие имена кэша в неё не попадают
+        name_id = translated.get(value)
+        if name_id is None:
+            name_id = translated[value] = index.intern(cached_names[value])
+        return name_id
+
+    for path_str in python_files(root):
+        path = Path(path_str)
+        try:
+            stat = path.stat()
+        except OSError as e:
+            errors.append((path_str, str(e)))
+            continue
+        module, is_package = module_name(path, packages)
+        entry = cached_files.get(path_str)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size and entry[2] == module:
+            *_, is_script, defs, imports, refs = entry
+            defs = array("I", (local(value) if i % ModuleSymbols.DEF_FIELDS == 0 else value for i, value in enumerate(defs)))
+            imports = array("I", (local(value) if i % ModuleSymbols.IMPORT_FIELDS < 3 else value for i, value in enumerate(imports)))
+            symbols = ModuleSymbols(path_str, module, is_package, bool(is_script), defs, imports, array("I", sorted(local(value) for value in refs)))
+            reused += 1
+        else:
+            try:
+                symbols = collect_symbols(index, path, module, is_package, path.read_bytes())
+            except (SyntaxError, UnicodeDecodeError, ValueError, OSError) as e:
+                errors.append((path_str, str(e)))
+                continue
+        # Два файла с одним именем модуля (скрипты в разных папках без __init__) — оба в индексе
+        index.modules.setdefault(module, []).append(symbols)
+        files[path_str] = [stat.st_mtime_ns, stat.st_size, module, int(symbols.is_script), symbols.defs.tolist(), symbols.imports.tolist(), symbols.refs.tolist()]
+
+    try:
+        write_json(cache_path, {"version": CACHE_VERSION, "root": str(root.resolve()), "names": index.names, "files": files})
+    except OSError:
+        pass
+    return index, errors, reused
+
+
+def _entry_points(root: Path) -> set:
+    """(модуль, имя) из pyproject.toml / setup.py / setup.cfg в root и в папках над пакетом root."""
+    points = set()
+    directory = root.resolve()
+    while True:
+        for name in ENTRY_FILES:
+            try:
+                points.update(ENTRY_POINT.findall((directory / name).read_text(encoding="utf-8")))
+            except (OSError, UnicodeDecodeError):
+                pass
+        if not (directory / "__init__.py").is_file() or directory.parent == directory:
+            return points
+        directory = directory.parent
+
+
+def _is_test(symbols: ModuleSymbols) -> bool:
+    name = Path(symbols.path).name
+    return name.startswith("test_") or name.endswith("_test.py") or "tests" in Path(symbols.path).parts
+
+
+def find_dead_code(root: Path, use_cache: bool = True) -> dict:
+    index, errors, reused = build_index(root, use_cache)
+    name = index.name
+    modules = index.modules
+    used = set()        # (модуль, имя), к которым обращаются из других модулей
+    imported = set()    # модули, которые кто-то импортирует
+
+    def mark_module(target: str):
+        # import a.b.c загружает и a, и a.b
+        while target and target not in imported:
+            imported.add(target)
+            target = target.rpartition(".")[0]
+
+    def mark(target: str, attr: str, depth: int = 0):
+        """Обращение к target.attr; если это реэкспорт, помечается и исходное имя."""
+        if (target, attr) in used or depth > 10:
+            return
+        used.add((target, attr))
+        for symbols in modules.get(target, ()):
+            for bound, source, imported_name, _, _ in symbols.iter_imports():
+                if name(bound) == attr:
+                    if imported_name:
+                        mark(name(source), name(imported_name), depth + 1)
+                    else:
+                        mark_module(name(source))
+
+    def mark_chain(target: str, parts: list):
+        # gram.analysis.show_info: самый длинный префикс-модуль, следующее имя — обращение к нему
+        for part in parts:
+            submodule = f"{target}.{part}"
+            if submodule in modules:
+                mark_module(submodule)
+                target = submodule
+                continue
+            mark(target, part)
+            return
+
+    for target, attr in _entry_points(root):
+        mark_module(target)
+        mark(target, attr)
+
+    for entries in modules.values():
+        for symbols in entries:
+            bindings = {}
+            for bound, source, imported_name, _, _ in symbols.iter_imports():
+                source, imported_name = name(source), name(imported_name)
+                bound = name(bound)
+                if not imported_name:
+                    mark_module(source)
+                    # import a.b связывает a, import a.b as ab — сам a.b
+                    bindings[bound] = bound if bound == source.partition(".")[0] else source
+                elif imported_name == "*":
+                    mark_module(source)
+                    for star in modules.get(source, ()):
+                        used.update((source, name(def_name)) for def_name, _, _ in star.iter_defs())
+                        used.update((source, name(bound)) for bound, *_ in star.iter_imports())
+                elif f"{source}.{imported_name}" in modules:
+                    mark_module(f"{source}.{imported_name}")
+                    bindings[bound] = f"{source}.{imported_name}"
+                else:
+                    mark_module(source)
+                    mark(source, imported_name)
+            for ref in symbols.refs:
+                text = name(ref)
+                if "." not in text:
+                    continue
+                if text in modules:
+                    # Строка "пакет.модуль" для importlib или plugin-реестра
+                    mark_module(text)
+                head, *parts = text.split(".")
+                if head in bindings:
+                    mark_chain(bindings[head], parts)
+
+    unused_imports, dead_defs, orphans = [], [], []
+    for module, entries in modules.items():
+        for symbols in entries:
+            refs = {name(ref).partition(".")[0] for ref in symbols.refs}
+            if not symbols.is_package:
+                seen = set()
+                for bound, source, imported_name, line, checked in symbols.iter_imports():
+                    bound = name(bound)
+                    # __all__, __doc__ и подобные из модуля-ускорителя используются интерпретатором, а не кодом
+                    if checked and bound != "*" and not bound.startswith("__") and bound not in refs and (module, bound) not in used and (line, bound) not in seen:
+                        seen.add((line, bound))
+                        what = f"from {name(source)} import {name(imported_name)}" if imported_name else f"import {name(source)}"
+                        unused_imports.append((symbols.path, line, bound, what))
+            if not _is_test(symbols):
+                for def_name, line, kind in symbols.iter_defs():
+                    def_name = name(def_name)
+                    if def_name not in refs and (module, def_name) not in used:
+                        dead_defs.append((symbols.path, line, def_name, kind))
+            if module not in imported and not symbols.is_package and not symbols.is_script and not _is_test(symbols) and Path(symbols.path).stem not in ENTRY_MODULES:
+                orphans.append((symbols.path, module))
+
+    return {
+        "files": sum(len(entries) for entries in modules.values()),
+        "modules": len(modules),
+        "names": len(index.names),
+        "reused": reused,
+        "errors": errors,
+        "unused_imports": sorted(unused_imports),
+        "dead_defs": sorted(dead_defs),
+        "orphans": sorted(orphans),
+    }
+
+
+def _relative(path: str, root: Path) -> str:
+    try:
+        return str(Path(path).relative_to(root))
+    except ValueError:
+        return path
+
+
+def show_dead_code(path_str: str, top: int = None, use_cache: bool = True):
+    root = Path(path_str)
+    if not root.is_dir():
+        console.print(Panel(f"[red bold]❌ Папка не найдена![/red bold]\n[dim]Путь: {root}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    started = time.perf_counter()
+    with console.status("[bold green]🗂️ Строю индекс символов...", spinner="dots"):
+        report = find_dead_code(root, use_cache)
+    elapsed = time.perf_counter() - started
+
+    if not report["files"]:
+        console.print(Panel("[yellow bold]⚠️ В папке не найдено Python файлов![/yellow bold]", title="⚠️ Предупреждение", border_style="yellow"))
+        return
+
+    console.print(Panel(
+        f"[bold bright_green]🗂️ {root}[/bold bright_green]\n"
+        f"[dim]Файлов: {report['files']:,} (из кэша: {report['reused']:,}) • модулей: {report['modules']:,} • "
+        f"уникальных имён: {report['names']:,} • {elapsed:.2f} с[/dim]",
+        title="🪦 Мёртвый код", border_style="bright_blue"))
+    for path, error in report["errors"][:5]:
+        console.print(f"[red]Ошибка при анализе {_relative(path, root)}: {error}[/red]")
+    console.print("")
+
+    top = top or DEFAULT_TOP
+    unused, dead, orphans = report["unused_imports"], report["dead_defs"], report["orphans"]
+
+    if unused:
+        table = Table(title=f"📦 Неиспользуемые импорты (показано {min(len(unused), top)} из {len(unused)})", show_header=True)
+        table.add_column("📄 Где", style="bold white", overflow="fold")
+        table.add_column("🏷️ Имя", style="yellow")
+        table.add_column("📖 Импорт", style="dim")
+        for path, line, bound, what in unused[:top]:
+            table.add_row(f"{_relative(path, root)}:{line}", bound, what)
+        console.print(table)
+        console.print("")
+
+    if dead:
+        table = Table(title=f"⚰️ Функции и классы без обращений (показано {min(len(dead), top)} из {len(dead)})", show_header=True)
+        table.add_column("📄 Где", style="bold white", overflow="fold")
+        table.add_column("🏷️ Имя", style="yellow")
+        table.add_column("🧩 Вид", style="cyan")
+        for path, line, def_name, kind in dead[:top]:
+            table.add_row(f"{_relative(path, root)}:{line}", def_name, "класс" if kind == KIND_CLASS else "функция")
+        console.print(table)
+        console.print("")
+
+    if orphans:
+        table = Table(title=f"🏝️ Модули, которые никто не импортирует (показано {min(len(orphans), top)} из {len(orphans)})", show_header=True)
+        table.add_column("📦 Модуль", style="bold white", overflow="fold")
+        table.add_column("📄 Файл", style="dim", overflow="fold")
+        for path, module in orphans[:top]:
+            table.add_row(module, _relative(path, root))
+        console.print(table)
+        console.print("")
+
+    if not (unused or dead or orphans):
+        console.print(Panel("[bold green]✅ Неиспользуемых импортов и мёртвого кода не найдено[/bold green]", title="🎯 Итог", border_style="green"))
+        console.print("")
+        return
+
+    console.print(Panel(
+        f"[bold yellow]📦 Неиспользуемых импортов: {len(unused):,} • ⚰️ функций и классов без обращений: {len(dead):,} • "
+        f"🏝️ модулей без импортов: {len(orphans):,}[/bold yellow]\n"
+        f"[dim]Лишний импорт верхнего уровня загружается при каждом старте. Обращения через getattr с вычисляемым именем, "
+        f"плагины и внешних пользователей библиотеки индекс не видит — проверяйте перед удалением.[/dim]",
+        title="🎯 Итог", border_style="yellow"))
+    console.print("")
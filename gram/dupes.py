@@ -0,0 +1,310 @@
+"""Поиск дублированного кода по отпечаткам AST"""
+import ast
+import os
+from bisect import bisect_left, bisect_right
+import time
+import zlib
+from array import array
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
+from rich.table import Table
+
+console = Console()
+
+# Длина k-граммы в узлах AST и окно winnowing: совпадение от K_GRAM + WINDOW - 1 узлов найдётся гарантированно
+K_GRAM = 25
+WINDOW = 8
+# Минимальный размер дубля в строках с кодом
+MIN_LINES = 6
+DEFAULT_TOP = 20
+# Отпечаток, встречающийся чаще, — шаблонный код (импорты, __main__), пары по нему не строятся
+MAX_BUCKET = 50
+# Для небольших деревьев запуск процессов дороже самого разбора
+PARALLEL_THRESHOLD = 64
+HASH_BASE = 1_000_003
+HASH_MOD = (1 << 61) - 1
+SKIP_DIRS = {".git", ".hg", ".venv", "venv", "env", "__pycache__", "node_modules", ".tox", ".nox", ".mypy_cache", "build", "dist", "site-packages"}
+# Контекст имени не влияет на структуру; блоки импортов у всех модулей похожи и дублями не считаются
+SKIPPED_NODES = {ast.Load, ast.Store, ast.Del, ast.Import, ast.ImportFrom}
+# Литерал только из констант — данные, а не код: он сворачивается в один токен независимо от размера
+LITERALS = {ast.Dict, ast.List, ast.Tuple, ast.Set}
+BLOCKS = {ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.For, ast.AsyncFor, ast.While, ast.If,
+          ast.With, ast.AsyncWith, ast.Try, getattr(ast, "TryStar", ast.Try), ast.ExceptHandler, ast.Match, ast.match_case}
+
+_token_ids = {}
+
+
+def _token(key: str) -> int:
+    token = _token_ids.get(key)
+    if token is None:
+        # crc32, а не hash(): значения должны совпадать во всех процессах пула
+        token = _token_ids[key] = zlib.crc32(key.encode())
+    return token
+
+
+def normalize(tree) -> tuple:
+    """Токены, первые и последние строки узлов в порядке обхода в глубину. Узел нормализуется до типа:
+    имена и значения констант абстрагированы (у констант остаётся тип значения).
+
+    У блока (def, for, if…) последняя строка — строка заголовка: его тело покрывают собственные узлы."""
+    tokens, lines, ends = array("I"), array("I"), array("I")
+    add_token, add_line, add_end = tokens.append, lines.append, ends.append
+    line = 1
+    stack = [tree]
+    pop, push = stack.pop, stack.append
+    AST, Constant, Expr = ast.AST, ast.Constant, ast.Expr
+    while stack:
+        node = pop()
+        cls = type(node)
+        line = getattr(node, "lineno", line)
+        add_line(line)
+        add_end(line if cls in BLOCKS else getattr(node, "end_lineno", None) or line)
+        if cls in LITERALS and all(type(item) is Constant for item in (node.values + node.keys if cls is ast.Dict else node.elts)):
+            add_token(_token(f"{cls.__name__}:data"))
+            continue
+        add_token(_token(f"Constant:{type(node.value).__name__}") if cls is Constant else _token(cls.__name__))
+        # Обход _fields вручную: ast.iter_child_nodes на порядок медленнее на больших деревьях
+        for field in reversed(cls._fields):
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in reversed(value):
+                    # Строка-выражение (docstring) кода не добавляет, а строки отпечатков растягивает
+                    if isinstance(item, AST) and type(item) not in SKIPPED_NODES and not (type(item) is Expr and type(item.value) is Constant and type(item.value.value) is str):
+                        push(item)
+            elif isinstance(value, AST) and type(value) not in SKIPPED_NODES:
+                push(value)
+    return tokens, lines, ends
+
+
+def rolling_hashes(tokens, k: int = K_GRAM) -> list:
+    """Полиномиальный хэш каждой k-граммы за O(n)."""
+    if len(tokens) < k:
+        return []
+    high = pow(HASH_BASE, k - 1, HASH_MOD)
+    value = 0
+    for token in tokens[:k]:
+        value = (value * HASH_BASE + token) % HASH_MOD
+    hashes = [value]
+    for i in range(k, len(tokens)):
+        value = ((value - tokens[i - k] * high) * HASH_BASE + tokens[i]) % HASH_MOD
+        hashes.append(value)
+    return hashes
+
+
+def winnow(hashes: list, window: int = WINDOW) -> list:
+    """Позиции отпечатков: минимум в каждом окне (самый правый при равенстве), без повторов подряд."""
+    selected = []
+    queue = deque()
+    last = -1
+    for i, value in enumerate(hashes):
+        while queue and hashes[queue[-1]] >= value:
+            queue.pop()
+        queue.append(i)
+        if queue[0] <= i - window:
+            queue.popleft()
+        if i >= window - 1 and queue[0] != last:
+            last = queue[0]
+            selected.append(last)
+    return selected
+
+
+def fingerprint_file(path: str) -> tuple:
+    """Выполняется в процессе пула: (путь, строк, хэши, начала, концы, строки с кодом) или (путь, ошибка)."""
+    try:
+        # Байты, а не текст: ast.parse сам учитывает BOM и объявление кодировки
+        code = Path(path).read_bytes()
+        tokens, lines, node_ends = normalize(ast.parse(code))
+    except (SyntaxError, UnicodeDecodeError, ValueError, OSError) as e:
+        return path, str(e)
+    hashes = rolling_hashes(tokens)
+    selected = winnow(hashes)
+    starts, ends = array("I"), array("I")
+    for position in selected:
+        # k-грамма заканчивается последней строкой последнего узла, а не его первой строкой
+        window = slice(position, position + K_GRAM)
+        starts.append(min(lines[window]))
+        ends.append(max(node_ends[window]))
+    return path, code.count(b"\n") + 1, array("q", (hashes[position] for position in selected)), starts, ends, array("I", sorted(set(lines)))
+
+
+def python_files(root: Path) -> list:
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS and not name.endswith(".egg-info")]
+        files.extend(os.path.join(directory, name) for name in filenames if name.endswith(".py"))
+    return sorted(files)
+
+
+class FingerprintIndex:
+    """Хэш → номер отпечатка (или список номеров); сами отпечатки лежат в параллельных массивах."""
+
+    def __init__(self):
+        self.files = []
+        self.code_lines = []
+        self.file_ids = array("I")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.buckets = {}
+
+    def add_file(self, path: str, hashes, starts, ends, code_lines):
+        file_id = len(self.files)
+        self.files.append(path)
+        self.code_lines.append(code_lines)
+        buckets = self.buckets
+        for value, start, end in zip(hashes, starts, ends):
+            fingerprint = len(self.file_ids)
+            self.file_ids.append(file_id)
+            self.starts.append(start)
+            self.ends.append(end)
+            existing = buckets.get(value)
+            if existing is None:
+                buckets[value] = fingerprint
+            elif isinstance(existing, list):
+                existing.append(fingerprint)
+            else:
+                buckets[value] = [existing, fingerprint]
+
+    def matches(self) -> dict:
+        """(файл A, файл B) → совпавшие участки (начало A, конец A, начало B, конец B)."""
+        pairs = defaultdict(list)
+        file_ids, starts, ends = self.file_ids, self.starts, self.ends
+        for bucket in self.buckets.values():
+            if not isinstance(bucket, list) or len(bucket) > MAX_BUCKET:
+                continue
+            for i, a in enumerate(bucket):
+                for b in bucket[i + 1:]:
+                    file_a, file_b = file_ids[a], file_ids[b]
+                    if file_a == file_b and starts[b] <= ends[a] and starts[a] <= ends[b]:
+                        continue
+                    if (file_a, starts[a]) > (file_b, starts[b]):
+                        a, b, file_a, file_b = b, a, file_b, file_a
+                    pairs[file_a, file_b].append((starts[a], ends[a], starts[b], ends[b]))
+        return pairs
+
+    def code_size(self, file_id: int, start: int, end: int) -> int:
+        """Строки с кодом в диапазоне: без пустых, комментариев и docstring."""
+        lines = self.code_lines[file_id]
+        return bisect_right(lines, end) - bisect_left(lines, start)
+
+
+def merge_regions(matches: list) -> list:
+    """Склеивает соседние и перекрывающиеся совпадения одной пары файлов в фрагменты."""
+    regions = []
+    for start_a, end_a, start_b, end_b in sorted(matches):
+        if regions:
+            last = regions[-1]
+            if start_a <= last[1] + 1 and last[2] - 1 <= start_b <= last[3] + 1:
+                last[1], last[3] = max(last[1], end_a), max(last[3], end_b)
+                continue
+        regions.append([start_a, end_a, start_b, end_b])
+    return regions
+
+
+def find_duplicates(root: Path, workers: int = None, progress=None) -> dict:
+    paths = python_files(root)
+    index = FingerprintIndex()
+    errors = []
+    total_lines = 0
+    workers = workers or os.cpu_count() or 1
+    task = progress.add_task("[bold green]🧬 Отпечатки файлов...", total=len(paths)) if progress else None
+
+    def collect(results):
+        nonlocal total_lines
+        for path, *result in results:
+            if len(result) == 1:
+                errors.append((path, result[0]))
+            else:
+                lines, *fingerprints = result
+                total_lines += lines
+                index.add_file(path, *fingerprints)
+            if progress:
+                progress.advance(task)
+
+    if len(paths) < PARALLEL_THRESHOLD or workers == 1:
+        workers = 1
+        collect(map(fingerprint_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(fingerprint_file, paths, chunksize=max(1, min(64, len(paths) // (workers * 8)))))
+
+    clones = []
+    # Строка, повторённая в нескольких парах, в итоге считается один раз
+    covered = defaultdict(list)
+    for (file_a, file_b), matches in index.matches().items():
+        for start_a, end_a, start_b, end_b in merge_regions(matches):
+            # Перекрывающиеся участки одного файла — повторяющийся шаблон (цепочка elif), а не копия
+            if file_a == file_b and start_b <= end_a:
+                continue
+            size = min(index.code_size(file_a, start_a, end_a), index.code_size(file_b, start_b, end_b))
+            if size >= MIN_LINES:
+                clones.append((size, index.files[file_a], start_a, end_a, index.files[file_b], start_b, end_b))
+                covered[file_a].append((start_a, end_a))
+                covered[file_b].append((start_b, end_b))
+    clones.sort(key=lambda clone: clone[0], reverse=True)
+
+    duplicated = 0
+    for file_id, intervals in covered.items():
+        intervals.sort()
+        start, end = intervals[0]
+        for next_start, next_end in intervals[1:]:
+            if next_start > end:
+                duplicated += index.code_size(file_id, start, end)
+                start = next_start
+            end = max(end, next_end)
+        duplicated += index.code_size(file_id, start, end)
+    return {"files": len(index.files), "lines": total_lines, "duplicated": duplicated, "fingerprints": len(index.file_ids), "workers": workers, "errors": errors, "clones": clones}
+
+
+def show_duplicates(path_str: str, top: int = None):
+    root = Path(path_str)
+    if not root.is_dir():
+        console.print(Panel(f"[red bold]❌ Папка не найдена![/red bold]\n[dim]Путь: {root}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    started = time.perf_counter()
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TaskProgressColumn(), console=console, transient=True) as progress:
+        report = find_duplicates(root, progress=progress)
+    elapsed = time.perf_counter() - started
+
+    if not report["files"]:
+        console.print(Panel("[yellow bold]⚠️ В папке не найдено Python файлов![/yellow bold]", title="⚠️ Предупреждение", border_style="yellow"))
+        return
+
+    clones = report["clones"]
+    console.print(Panel(
+        f"[bold bright_green]🧬 {root}[/bold bright_green]\n"
+        f"[dim]Файлов: {report['files']:,} • строк: {report['lines']:,} • отпечатков: {report['fingerprints']:,} • "
+        f"процессов: {report['workers']} • {elapsed:.1f} с[/dim]",
+        title="🔍 Поиск дублей", border_style="bright_blue"))
+    for path, error in report["errors"][:5]:
+        console.print(f"[red]Ошибка при анализе {Path(path).relative_to(root)}: {error}[/red]")
+    console.print("")
+
+    if not clones:
+        console.print(Panel(f"[bold green]✅ Дублей от {MIN_LINES} строк не найдено[/bold green]", title="🧬 Дубли", border_style="green"))
+        console.print("")
+        return
+
+    top = top or DEFAULT_TOP
+    table = Table(title=f"🧬 Повторяющийся код (показано {min(len(clones), top)} из {len(clones)})", show_header=True)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("📄 Фрагмент", style="bold white", overflow="fold")
+    table.add_column("📄 Копия", style="white", overflow="fold")
+    table.add_column("📏 Строк кода", justify="right", style="bold yellow", no_wrap=True)
+    for i, (size, file_a, start_a, end_a, file_b, start_b, end_b) in enumerate(clones[:top], 1):
+        table.add_row(str(i), f"{Path(file_a).relative_to(root)}:{start_a}-{end_a}", f"{Path(file_b).relative_to(root)}:{start_b}-{end_b}", str(size))
+    console.print(table)
+    console.print("")
+
+    duplicated = report["duplicated"]
+    console.print(Panel(
+        f"[bold yellow]📋 Найдено пар фрагментов: {len(clones):,}, в них строк кода: {duplicated:,} "
+        f"({duplicated / max(report['lines'], 1) * 100:.1f}% кода)[/bold yellow]\n"
+        f"[dim]Имена и константы не учитываются: совпадает структура кода. Общий код стоит вынести в функцию или модуль.[/dim]",
+        title="🎯 Итог", border_style="yellow"))
+    console.print("")
@@ -5,7 +5,47 @@ from rich.panel import Panel
 
 console = Console()
 
-def gpt_chat():
+MODELS = ["gpt-4", "gpt-4o", "gpt-4o-mini"]
+
+def request_completion(client, messages, models=None, cache=None, race: int = 0, verbose: bool = True):
+    models = models or MODELS
+    if len(messages) == 1:
+        prompt = messages[0]["content"]
+    else:
+        prompt = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    
+    if cache is not None:
+        for model in models:
+            cached = cache.get(prompt, model)
+            if cached is not None:
+                return cached, model, True
+    
+    if race > 1:
+        from gram.gpt_race import Scoreboard, race_completion
+        if verbose:
+            console.print(f"[dim]🏁 Гонка моделей: {race} одновременно[/dim]")
+        content, model = race_completion(client, messages, models, k=race, scoreboard=Scoreboard())
+        if content is not None and cache is not None:
+            cache.set(prompt, model, content)
+        return content, model, False
+    
+    for model in models:
+        try:
+            if verbose:
+                console.print(f"[dim]🔧 Проверяем модель: {model}[/dim]")
+            response = client.chat.completions.create(model=model, messages=messages, web_search=False, timeout=30)
+            content = response.choices[0].message.content
+            if cache is not None and content:
+                cache.set(prompt, model, content)
+            return content, model, False
+        except Exception as model_error:
+            if verbose:
+                console.print(f"[dim]❌ Модель {model} недоступна: {str(model_error)}[/dim]")
+            continue
+    
+    return None, None, False
+
+def gpt_chat(use_cache: bool = True, budget: int = None, session: str = None, race: int = 0):
     try:
         from g4f.client import Client
     except ImportError:
@@ -28,6 +68,21 @@ def gpt_chat():
     console.print("\n" + "─" * 80 + "\n")
     
     client = Client()
+    cache = None
+    if use_cache:
+        from gram.gpt_cache import ResponseCache
+        try:
+            cache = ResponseCache()
+        except Exception as cache_error:
+            console.print(f"[dim]⚠️ Кэш ответов недоступен: {str(cache_error)}[/dim]")
+    
+    from gram.gpt_memory import ConversationMemory, session_path, DEFAULT_BUDGET
+    memory_path = session_path(session) if session else None
+    if memory_path is not None and memory_path.exists():
+        memory = ConversationMemory.load(memory_path, budget)
+        console.print(f"[dim]💾 Сессия '{session}' восстановлена: {len(memory.turns)} сообщений, {memory.total_tokens}/{memory.budget} токенов[/dim]\n")
+    else:
+        memory = ConversationMemory(budget or DEFAULT_BUDGET)
     
     while True:
         try:
@@ -62,26 +117,21 @@ def gpt_chat():
             try:
                 console.print("[dim]📡 Отправляем запрос...[/dim]")
                 
-                models = ["gpt-4"]
-                response = None
+                assistant_message, model, from_cache = request_completion(client, memory.messages(user_input), cache=cache, race=race)
                 
-                for model in models:
-                    try:
-                        console.print(f"[dim]🔧 Проверяем модель: {model}[/dim]")
-                        response = client.chat.completions.create(model=model, messages=[{"role": "user", "content": user_input}], web_search=False, timeout=30)
-                        break
-                    except Exception as model_error:
-                        console.print(f"[dim]❌ Модель {model} недоступна: {str(model_error)}[/dim]")
-                        continue
-                
-                if response is None:
+                if assistant_message is None:
                     console.print("\n")
                     error_panel = Panel("[bold red]❌ Все модели ИИ недоступны![/bold red]\n[dim]Проверьте интернет и попробуйте позже[/dim]", title="🚫 Ошибка подключения", border_style="red", padding=(1, 2))
                     console.print(error_panel)
                     console.print("\n" + "─" * 80 + "\n")
                     continue
                 
-                assistant_message = response.choices[0].message.content
+                cache_mark = " • 💾 из кэша" if from_cache else ""
+                
+                memory.add("user", user_input)
+                memory.add("assistant", assistant_message)
+                if memory_path is not None:
+                    memory.save(memory_path)
                 
                 console.print("\n")
                 
@@ -89,17 +139,17 @@ def gpt_chat():
                     parts = [assistant_message[i:i+500] for i in range(0, len(assistant_message), 500)]
                     for i, part in enumerate(parts):
                         if i == 0:
-                            ai_message_panel = Panel(f"[bold bright_blue]{part}[/bold bright_blue]\n\n[dim]📄 Ответ продолжен...[/dim]", title=f"🤖 ИИ (часть {i+1}/{len(parts)})", border_style="bright_blue", padding=(1, 2))
+                            ai_message_panel = Panel(f"[bold bright_blue]{part}[/bold bright_blue]\n\n[dim]📄 Ответ продолжен...[/dim]", title=f"🤖 ИИ (часть {i+1}/{len(parts)}){cache_mark}", border_style="bright_blue", padding=(1, 2))
                         else:
-                            ai_message_panel = Panel(f"[bold bright_blue]{part}[/bold bright_blue]", title=f"🤖 ИИ (часть {i+1}/{len(parts)})", border_style="bright_blue", padding=(1, 2))
+                            ai_message_panel = Panel(f"[bold bright_blue]{part}[/bold bright_blue]", title=f"🤖 ИИ (часть {i+1}/{len(parts)}){cache_mark}", border_style="bright_blue", padding=(1, 2))
                         console.print(ai_message_panel)
                         if i < len(parts) - 1:
                             console.print("\n")
                 else:
-                    ai_message_panel = Panel(f"[bold bright_blue]{assistant_message}[/bold bright_blue]", title="🤖 ИИ", border_style="bright_blue", padding=(1, 2))
+                    ai_message_panel = Panel(f"[bold bright_blue]{assistant_message}[/bold bright_blue]", title=f"🤖 ИИ{cache_mark}", border_style="bright_blue", padding=(1, 2))
                     console.print(ai_message_panel)
                 
-                success_panel = Panel("[bold green]✅ Ответ получен![/bold green]\n[dim]💭 Следующий вопрос или 'exit'[/dim]", title="✅ Готово", border_style="green", padding=(1, 2))
+                success_panel = Panel(f"[bold green]✅ Ответ получен![/bold green]\n[dim]🧠 Контекст: {memory.total_tokens}/{memory.budget} токенов[/dim]\n[dim]💭 Следующий вопрос или 'exit'[/dim]", title="✅ Готово", border_style="green", padding=(1, 2))
                 console.print("\n")
                 console.print(success_panel)
                 console.print("\n" + "─" * 80 + "\n")
@@ -0,0 +1,207 @@
+"""Пакетная обработка запросов GPT"""
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+console = Console()
+
+DEFAULT_CONCURRENCY = 4
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+
+class RateLimiter:
+    """Token bucket: не больше rate запросов в секунду на все потоки."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def load_prompts(path: Path) -> list:
+    prompts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"строка {line_no + 1}: {e}") from e
+            if isinstance(item, str):
+                item = {"prompt": item}
+            if not isinstance(item, dict) or not isinstance(item.get("prompt"), str):
+                raise ValueError(f"строка {line_no + 1}: ожидается строка или объект с полем prompt")
+            prompts.append({"index": len(prompts), "id": item.get("id", line_no), "prompt": item["prompt"]})
+    return prompts
+
+
+def load_completed(path: Path) -> dict:
+    """Успешные ответы прошлых запусков: номер запроса → строка JSONL."""
+    completed = {}
+    if not path.exists():
+        return completed
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Обрезанная последняя строка после прерывания
+                continue
+            if isinstance(record, dict) and record.get("answer") is not None:
+                completed[record["index"]] = line if line.endswith("\n") else line + "\n"
+    return completed
+
+
+def rewrite_output(path: Path, completed: dict):
+    """Перезаписывает результат только успешными ответами по порядку запросов."""
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.writelines(completed[index] for index in sorted(completed))
+    os.replace(temporary, path)
+
+
+def _ask_with_retries(get_client, item, cache, race, limiter):
+    from gram.gpt import request_completion
+
+    error = None
+    for attempt in range(MAX_ATTEMPTS):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            answer, model, from_cache = request_completion(get_client(), [{"role": "user", "content": item["prompt"]}], cache=cache, race=race, verbose=False)
+            if answer is not None:
+                return {**item, "answer": answer, "model": model, "cached": from_cache, "attempts": attempt + 1}
+            error = "Все модели ИИ недоступны"
+        except Exception as e:
+            error = str(e)
+        if attempt < MAX_ATTEMPTS - 1:
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+            time.sleep(delay * (0.5 + random.random() / 2))
+    return {**item, "answer": None, "error": error, "attempts": MAX_ATTEMPTS}
+
+
+def run_batch(input_path: str, output_path: str, concurrency: int = None, rate: float = None, ordered: bool = True, use_cache: bool = True, race: int = 0):
+    try:
+        from g4f.client import Client
+    except ImportError:
+        console.print("[red bold]❌ Ошибка: g4f не установлен![/red bold]")
+        console.print("[dim]Установите: pip install g4f[/dim]")
+        return
+
+    input_path = Path(input_path)
+    if not output_path:
+        output_path = input_path.with_name(f"{input_path.stem}.answers.jsonl")
+    output_path = Path(output_path)
+    # Ошибки отдельно: иначе после повторного запуска у запроса две строки в результате
+    errors_path = output_path.with_name(f"{output_path.stem}.errors.jsonl")
+
+    if not input_path.exists():
+        console.print(Panel(f"[red bold]❌ Файл с запросами не найден![/red bold]\n[dim]Путь: {input_path}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    try:
+        prompts = load_prompts(input_path)
+    except ValueError as e:
+        console.print(Panel(f"[red bold]❌ Некорректный JSONL: {str(e)}[/red bold]\n[dim]Каждая строка: {{\"id\": ..., \"prompt\": \"...\"}}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    completed = load_completed(output_path)
+    if output_path.exists():
+        rewrite_output(output_path, completed)
+    pending = [item for item in prompts if item["index"] not in completed]
+    concurrency = max(1, concurrency or DEFAULT_CONCURRENCY)
+
+    console.print(Panel(
+        f"[bold cyan]📦 Запросов:[/bold cyan] {len(prompts)} | [green]готово ранее: {len(completed)}[/green] | [yellow]осталось: {len(pending)}[/yellow]\n"
+        f"[dim]⚙️ Потоков: {concurrency} | Лимит: {f'{rate:g} запр/с' if rate else 'нет'} | Порядок: {'исходный' if ordered else 'по готовности'}[/dim]\n"
+        f"[dim]📄 Результат: {output_path} • ошибки: {errors_path.name}[/dim]",
+        title="🤖 Пакетный режим GPT", border_style="bright_blue"))
+
+    if not pending:
+        console.print("[bold green]✅ Все запросы уже обработаны[/bold green]\n")
+        return
+
+    cache = None
+    if use_cache:
+        from gram.gpt_cache import ResponseCache
+        cache = ResponseCache()
+
+    local = threading.local()
+
+    def get_client():
+        if not hasattr(local, "client"):
+            local.client = Client()
+        return local.client
+
+    limiter = RateLimiter(rate) if rate else None
+    failed = 0
+    buffer = {}
+    next_pos = 0
+    order = [item["index"] for item in pending]
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="gram-batch")
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, open(errors_path, "w", encoding="utf-8") as errors, Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TaskProgressColumn(), console=console) as progress:
+            task = progress.add_task("🤖 Обработка запросов...", total=len(pending))
+
+            def write(record):
+                target = out if record["answer"] is not None else errors
+                target.write(json.dumps(record, ensure_ascii=False) + "\n")
+                target.flush()
+
+            futures = [executor.submit(_ask_with_retries, get_client, item, cache, race, limiter) for item in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                if record["answer"] is None:
+                    failed += 1
+                progress.advance(task)
+
+                if not ordered:
+                    write(record)
+                    continue
+
+                buffer[record["index"]] = record
+                while next_pos < len(order) and order[next_pos] in buffer:
+                    write(buffer.pop(order[next_pos]))
+                    next_pos += 1
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        console.print(Panel("[bold yellow]⚠️ Прервано пользователем[/bold yellow]\n[dim]🔄 Запустите ту же команду снова — готовые ответы будут пропущены[/dim]", title="⏹️ Прерывание", border_style="yellow"))
+        return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if ordered and completed:
+        # Новые ответы дописаны после готовых ранее — восстанавливаем исходный порядок
+        rewrite_output(output_path, load_completed(output_path))
+    if not failed:
+        errors_path.unlink(missing_ok=True)
+
+    done = len(pending) - failed
+    border = "green" if not failed else "yellow"
+    console.print(Panel(
+        f"[bold green]✅ Получено ответов: {done}[/bold green]\n"
+        + (f"[bold red]❌ С ошибкой: {failed}[/bold red] [dim]({errors_path})[/dim]\n[dim]🔄 Повторный запуск отправит только неудачные запросы[/dim]\n" if failed else "")
+        + f"[dim]📄 {output_path}[/dim]",
+        title="📦 Пакет обработан", border_style=border))
+    console.print("")
@@ -0,0 +1,91 @@
+"""Кэш ответов GPT"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from gram.storage import get_data_dir
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split()).lower()
+
+
+def make_key(prompt: str, model: str) -> str:
+    raw = f"{model}\0{normalize_prompt(prompt)}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ResponseCache:
+    """LRU-кэш в SQLite: безопасен для нескольких процессов gram одновременно."""
+
+    def __init__(self, path: Path = None, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path) if path else get_data_dir() / "gpt_cache.sqlite3"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+
+    def get(self, prompt: str, model: str):
+        key = make_key(prompt, model)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return response
+
+    def set(self, prompt: str, model: str, response: str):
+        key = make_key(prompt, model)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now),
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, now: float):
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,108 @@
+"""Память диалога GPT"""
+from collections import deque
+from pathlib import Path
+
+from gram.storage import get_data_dir, read_json, write_json
+
+DEFAULT_BUDGET = 3000
+SUMMARY_SNIPPET = 200
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 символа на токен: дёшево и достаточно точно для бюджета контекста
+    return max(1, (len(text) + 3) // 4)
+
+
+def session_path(name: str) -> Path:
+    if name.endswith(".json") or "/" in name or "\\" in name:
+        return Path(name)
+    return get_data_dir("sessions") / f"{name}.json"
+
+
+class ConversationMemory:
+    """История диалога, которая укладывается в бюджет токенов.
+
+    Токены каждой реплики считаются один раз при добавлении, а старые реплики
+    по одной сворачиваются в краткое содержание, когда бюджет превышен.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self.summary_budget = max(1, budget // 4)
+        self.turns = deque()
+        self.summary = deque()
+        self.turn_tokens = 0
+        self.summary_tokens = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.turn_tokens + self.summary_tokens
+
+    def add(self, role: str, content: str):
+        tokens = estimate_tokens(content)
+        self.turns.append((role, content, tokens))
+        self.turn_tokens += tokens
+        self._compact()
+
+    def clear(self):
+        self.turns.clear()
+        self.summary.clear()
+        self.turn_tokens = 0
+        self.summary_tokens = 0
+
+    def messages(self, prompt: str = None) -> list:
+        result = []
+        if self.summary:
+            text = "Краткое содержание предыдущей беседы:\n" + "\n".join(line for line, _ in self.summary)
+            result.append({"role": "system", "content": text})
+        result.extend({"role": role, "content": content} for role, content, _ in self.turns)
+        if prompt is not None:
+            result.append({"role": "user", "content": prompt})
+        return result
+
+    def _compact(self):
+        while self.total_tokens > self.budget and len(self.turns) > 1:
+            role, content, tokens = self.turns.popleft()
+            self.turn_tokens -= tokens
+            self._summarize(role, content)
+
+    def _summarize(self, role: str, content: str):
+        snippet = " ".join(content.split())
+        if len(snippet) > SUMMARY_SNIPPET:
+            snippet = snippet[:SUMMARY_SNIPPET] + "…"
+        line = f"{'Пользователь' if role == 'user' else 'ИИ'}: {snippet}"
+        tokens = estimate_tokens(line)
+        self.summary.append((line, tokens))
+        self.summary_tokens += tokens
+
+        while self.summary_tokens > self.summary_budget and len(self.summary) > 1:
+            _, old_tokens = self.summary.popleft()
+            self.summary_tokens -= old_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "summary": [line for line, _ in self.summary],
+            "turns": [{"role": role, "content": content} for role, content, _ in self.turns],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, budget: int = None):
+        memory = cls(budget or data.get("budget", DEFAULT_BUDGET))
+        for line in data.get("summary", []):
+            tokens = estimate_tokens(line)
+            memory.summary.append((line, tokens))
+            memory.summary_tokens += tokens
+        for turn in data.get("turns", []):
+            memory.add(turn["role"], turn["content"])
+        return memory
+
+    def save(self, path: Path):
+        write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: Path, budget: int = None):
+        data = read_json(path)
+        if not data:
+            return cls(budget or DEFAULT_BUDGET)
+        return cls.from_dict(data, budget)
@@ -0,0 +1,123 @@
+"""Гонка моделей GPT"""
+import queue
+import threading
+import time
+from pathlib import Path
+
+from gram.storage import get_data_dir, read_json, write_json
+
+EWMA_ALPHA = 0.3
+FAILURE_PENALTY = 30.0
+
+
+class Scoreboard:
+    """Задержка и надёжность моделей, сохраняемые между запусками."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else get_data_dir() / "gpt_scoreboard.json"
+        self.stats = read_json(self.path, {}) or {}
+        self._lock = threading.Lock()
+
+    def score(self, model: str) -> float:
+        entry = self.stats.get(model)
+        if not entry:
+            return 0.0
+        attempts = entry["ok"] + entry["fail"]
+        failure_rate = entry["fail"] / attempts if attempts else 0.0
+        return entry["latency"] + failure_rate * FAILURE_PENALTY
+
+    def order(self, models: list) -> list:
+        position = {model: i for i, model in enumerate(models)}
+        return sorted(models, key=lambda m: (self.score(m), position[m]))
+
+    def record(self, model: str, latency: float, ok: bool):
+        with self._lock:
+            entry = self.stats.setdefault(model, {"latency": latency, "ok": 0, "fail": 0})
+            if ok:
+                entry["latency"] = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * entry["latency"]
+                entry["ok"] += 1
+            else:
+                entry["fail"] += 1
+            entry["updated"] = time.time()
+
+    def record_lower_bound(self, model: str, latency: float):
+        """Снятая с гонки модель отвечала минимум latency секунд."""
+        with self._lock:
+            entry = self.stats.setdefault(model, {"latency": latency, "ok": 0, "fail": 0})
+            if latency > entry["latency"]:
+                entry["latency"] = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * entry["latency"]
+            entry["updated"] = time.time()
+
+    def save(self):
+        with self._lock:
+            write_json(self.path, self.stats)
+
+
+def race_completion(client, messages: list, models: list, k: int = 2, timeout: float = 30, scoreboard: Scoreboard = None):
+    """Отправляет запрос K лучшим моделям сразу и возвращает первый успешный ответ.
+
+    Если все K моделей упали, в гонку идут следующие K. Возвращает (ответ, модель)
+    или (None, None).
+    """
+    ordered = scoreboard.order(models) if scoreboard is not None else list(models)
+    k = max(1, k)
+
+    try:
+        for start in range(0, len(ordered), k):
+            result = _race_round(client, messages, ordered[start:start + k], timeout, scoreboard)
+            if result[0] is not None:
+                return result
+        return None, None
+    finally:
+        if scoreboard is not None:
+            scoreboard.save()
+
+
+def _race_round(client, messages, models, timeout, scoreboard):
+    results = queue.Queue()
+    cancelled = threading.Event()
+
+    def run(model):
+        started = time.monotonic()
+        try:
+            response = client.chat.completions.create(model=model, messages=messages, web_search=False, timeout=timeout)
+            content = response.choices[0].message.content
+            if not content:
+                raise ValueError("пустой ответ")
+            outcome = (model, content, None)
+        except Exception as error:
+            outcome = (model, None, error)
+        latency = time.monotonic() - started
+        if scoreboard is not None and not cancelled.is_set():
+            scoreboard.record(model, latency, outcome[2] is None)
+        results.put(outcome)
+
+    for model in models:
+        threading.Thread(target=run, args=(model,), daemon=True, name=f"gram-race-{model}").start()
+
+    started = time.monotonic()
+    deadline = started + timeout
+    pending = set(models)
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                model, content, error = results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.discard(model)
+            if error is None:
+                if scoreboard is not None:
+                    for loser in pending:
+                        scoreboard.record_lower_bound(loser, time.monotonic() - started)
+                return content, model
+    finally:
+        # Проигравшие потоки — демоны: их ответы отбрасываются и не попадают в статистику
+        cancelled.set()
+
+    if scoreboard is not None:
+        for model in pending:
+            scoreboard.record(model, timeout, False)
+    return None, None
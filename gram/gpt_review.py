@@ -0,0 +1,225 @@
+"""Ревью кода через GPT"""
+import ast
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from rich.table import Table
+
+from gram.gpt_memory import estimate_tokens
+
+console = Console()
+
+DEFAULT_CHUNK_BUDGET = 1500
+DEFAULT_CONCURRENCY = 4
+PROMPT_VERSION = "review-v2"
+NO_ISSUES = "OK"
+
+# Позиция фрагмента в файл не передаётся: ответ из кэша остаётся верным, когда фрагмент сдвигается
+CHUNK_PROMPT = (
+    "Ты опытный Python-ревьюер. Проверь фрагмент `{name}`. "
+    "Перечисли конкретные проблемы: ошибки, уязвимости, производительность, читаемость. "
+    "Для каждой укажи строку в виде «строка N», считая строки от начала фрагмента с 1, и предложи исправление. Будь краток. "
+    f"Если проблем нет, ответь одним словом {NO_ISSUES}.\n\n```python\n{{source}}\n```"
+)
+LINE_REFERENCE = re.compile(r"(\b[Сс]трок[аиеу]?\s*)(\d+(?:\s*[-–,]\s*\d+)*)")
+REDUCE_PROMPT = (
+    "Ниже замечания ревью по фрагментам кода. Объедини их в один отчёт: убери дубликаты, "
+    "сгруппируй по файлам и отсортируй по важности. Сохрани номера строк.\n\n{findings}"
+)
+
+
+def _make_chunk(path, name, lines, start, end):
+    source = "\n".join(lines[start - 1:end])
+    digest = hashlib.sha256(f"{PROMPT_VERSION}\0{name}\0{source}".encode("utf-8")).hexdigest()
+    return {"path": str(path), "name": name, "start": start, "end": end, "source": source, "hash": digest, "tokens": estimate_tokens(source)}
+
+
+def shift_lines(answer: str, offset: int) -> str:
+    """Номера строк из ответа (от начала фрагмента) в номера строк файла."""
+    return LINE_REFERENCE.sub(lambda m: m.group(1) + "".join(str(int(part) + offset) if part.isdigit() else part for part in re.split(r"(\d+)", m.group(2))), answer)
+
+
+def _node_start(node):
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+
+def _split_lines(path, name, lines, start, end, budget):
+    chunks = []
+    line = start
+    while line <= end:
+        tokens = 0
+        stop = line
+        while stop <= end and (stop == line or tokens + estimate_tokens(lines[stop - 1]) <= budget):
+            tokens += estimate_tokens(lines[stop - 1])
+            stop += 1
+        chunks.append(_make_chunk(path, f"{name} [{line}-{stop - 1}]", lines, line, stop - 1))
+        line = stop
+    return chunks
+
+
+def _chunk_node(path, node, lines, budget, prefix=""):
+    name = f"{prefix}{node.name}"
+    start, end = _node_start(node), node.end_lineno
+    chunk = _make_chunk(path, name, lines, start, end)
+    if chunk["tokens"] <= budget:
+        return [chunk]
+
+    if isinstance(node, ast.ClassDef):
+        methods = [n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+        chunks = []
+        cursor = start
+        for method in methods:
+            method_start = _node_start(method)
+            if method_start > cursor:
+                chunks.extend(_split_lines(path, f"{name} (тело класса)", lines, cursor, method_start - 1, budget))
+            chunks.extend(_chunk_node(path, method, lines, budget, prefix=f"{name}."))
+            cursor = method.end_lineno + 1
+        if cursor <= end:
+            chunks.extend(_split_lines(path, f"{name} (тело класса)", lines, cursor, end, budget))
+        return chunks
+
+    return _split_lines(path, name, lines, start, end, budget)
+
+
+def chunk_source(path: Path, code: str, budget: int = DEFAULT_CHUNK_BUDGET) -> list:
+    """Делит модуль на фрагменты по функциям и классам, каждый не больше budget токенов.
+
+    Код вне определений (импорты, константы) собирается в фрагменты уровня модуля.
+    """
+    tree = ast.parse(code)
+    lines = code.splitlines()
+    chunks = []
+    loose = []
+
+    def flush_loose():
+        if loose:
+            chunks.extend(_split_lines(path, "<модуль>", lines, loose[0], loose[-1], budget))
+            loose.clear()
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            flush_loose()
+            chunks.extend(_chunk_node(path, node, lines, budget))
+        else:
+            loose.extend(range(node.lineno, node.end_lineno + 1))
+            if sum(estimate_tokens(lines[i - 1]) for i in loose) > budget:
+                flush_loose()
+    flush_loose()
+    return chunks
+
+
+def _collect_files(path: Path) -> list:
+    if path.is_file():
+        return [path]
+    return sorted(path.rglob("*.py"))
+
+
+def review_path(path_str: str, budget: int = None, concurrency: int = None, use_cache: bool = True, output_path: str = None):
+    try:
+        from g4f.client import Client
+    except ImportError:
+        console.print("[red bold]❌ Ошибка: g4f не установлен![/red bold]")
+        console.print("[dim]Установите: pip install g4f[/dim]")
+        return
+
+    from gram.gpt import request_completion
+    from gram.gpt_cache import ResponseCache
+    from gram.storage import get_data_dir
+
+    path = Path(path_str)
+    if not path.exists():
+        console.print(Panel(f"[red bold]❌ Файл или папка не найдена![/red bold]\n[dim]Путь: {path}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    budget = budget or DEFAULT_CHUNK_BUDGET
+    chunks = []
+    for py_file in _collect_files(path):
+        try:
+            chunks.extend(chunk_source(py_file, py_file.read_text(encoding="utf-8"), budget))
+        except SyntaxError as e:
+            console.print(f"[red]❌ {py_file}: синтаксическая ошибка в строке {e.lineno}, файл пропущен[/red]")
+
+    if not chunks:
+        console.print(Panel("[yellow bold]⚠️ Нечего проверять: Python-код не найден[/yellow bold]", title="⚠️ Предупреждение", border_style="yellow"))
+        return
+
+    review_cache = ResponseCache(path=get_data_dir() / "review_cache.sqlite3", ttl=None)
+    response_cache = ResponseCache() if use_cache else None
+
+    results = {}
+    todo = []
+    for chunk in chunks:
+        cached = review_cache.get(chunk["hash"], "review") if use_cache else None
+        if cached is not None:
+            results[chunk["hash"]] = (cached, True)
+        else:
+            todo.append(chunk)
+
+    console.print(f"\n[bold cyan]🔍 Фрагментов: {len(chunks)}[/bold cyan] [dim](из кэша: {len(chunks) - len(todo)}, к отправке: {len(todo)}, бюджет {budget} токенов)[/dim]\n")
+
+    local = threading.local()
+
+    def review_chunk(chunk):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        prompt = CHUNK_PROMPT.format(name=chunk["name"], source=chunk["source"])
+        answer, _, _ = request_completion(local.client, [{"role": "user", "content": prompt}], verbose=False)
+        return chunk, answer
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency or DEFAULT_CONCURRENCY), thread_name_prefix="gram-review") as executor, Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TaskProgressColumn(), console=console) as progress:
+            task = progress.add_task("🤖 Ревью фрагментов...", total=len(todo))
+            for future in as_completed([executor.submit(review_chunk, chunk) for chunk in todo]):
+                chunk, answer = future.result()
+                if answer is not None:
+                    review_cache.set(chunk["hash"], "review", answer)
+                    results[chunk["hash"]] = (answer, False)
+                progress.advance(task)
+
+    summary_table = Table(title="📋 Фрагменты ревью", show_header=True)
+    summary_table.add_column("📄 Фрагмент", style="bold white")
+    summary_table.add_column("📝 Строки", style="cyan")
+    summary_table.add_column("📊 Результат", style="white")
+    summary_table.add_column("💾 Источник", style="dim")
+
+    findings = []
+    for chunk in chunks:
+        answer, from_cache = results.get(chunk["hash"], (None, False))
+        location = f"{chunk['path']}:{chunk['start']}-{chunk['end']}"
+        if answer is None:
+            status = "[red]❌ Нет ответа[/red]"
+        elif answer.strip().rstrip(".").upper() == NO_ISSUES:
+            status = "[green]✅ Замечаний нет[/green]"
+        else:
+            status = "[yellow]⚠️ Есть замечания[/yellow]"
+            findings.append(f"### {chunk['name']} ({location})\n{shift_lines(answer.strip(), chunk['start'] - 1)}")
+        summary_table.add_row(chunk["name"], location, status, "кэш" if from_cache else "новый")
+
+    console.print(summary_table)
+    console.print("")
+
+    if not findings:
+        console.print(Panel("[bold green]✅ Замечаний не найдено![/bold green]", title="🎯 Итог ревью", border_style="green"))
+        console.print("")
+        return
+
+    merged = "\n\n".join(findings)
+    report = merged
+    if len(findings) > 1:
+        reduce_answer, _, _ = request_completion(Client(), [{"role": "user", "content": REDUCE_PROMPT.format(findings=merged)}], cache=response_cache, verbose=False)
+        if reduce_answer:
+            report = reduce_answer
+
+    if output_path:
+        Path(output_path).write_text(f"# Ревью {path}\n\n{report}\n\n## Замечания по фрагментам\n\n{merged}\n", encoding="utf-8")
+        console.print(f"[dim]📄 Полный отчёт сохранён: {output_path}[/dim]\n")
+
+    console.print(Panel(escape(report), title=f"🎯 Итог ревью ({len(findings)} фрагментов с замечаниями)", border_style="bright_blue", padding=(1, 2)))
+    console.print("")
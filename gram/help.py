@@ -13,7 +13,7 @@ def show_quick_help():
     help_table.add_column("📖 Описание", style="white")
     help_table.add_column("🎯 Использование", style="dim")
     
-    commands = [("--start fastapi", "Создать новый FastAPI проект", "gram --start fastapi"), ("--info <file>", "Анализ Python файла", "gram --info main.py"), ("--lint <file>", "Проверка качества кода", "gram --lint app.py"), ("--gpt", "Интерактивный чат с GPT", "gram --gpt"), ("--pc", "Информация о системе ПК", "gram --pc"), ("--fiat", "Курсы валют", "gram --fiat"), ("--version", "Показать версию пакета", "gram --version"), ("--update", "Обновить до последней версии", "gram --update"), ("--help-commands", "Подробная документация", "gram --help-commands")]
+    commands = [("--start fastapi", "Создать новый FastAPI проект", "gram --start fastapi"), ("--start fastapi-perf", "FastAPI под нагрузку из шаблона", "gram --start fastapi-perf --set db=sqlite"), ("--info <file>", "Анализ Python файла", "gram --info main.py"), ("--info <путь> --hotspots [N]", "Самые сложные функции", "gram --info src/ --hotspots 20 --sort length"), ("--lint <file>", "Проверка качества кода", "gram --lint app.py"), ("--perf <путь>", "Поиск медленных конструкций", "gram --perf app/"), ("--dupes <папка>", "Поиск дублированного кода", "gram --dupes src/ --top 30"), ("--deadcode <папка>", "Лишние импорты и мёртвый код", "gram --deadcode src/"), ("--profile <скрипт> [аргументы]", "Профилирование CPU и flamegraph", "gram --profile gram --info ."), ("--mem <скрипт> [аргументы]", "Профилирование памяти", "gram --interval 10s --mem app.py"), ("--gpt", "Интерактивный чат с GPT", "gram --gpt"), ("--gpt --no-cache", "GPT чат без кэша ответов", "gram --gpt --no-cache"), ("--gpt --session <имя>", "GPT чат с сохранением диалога", "gram --gpt --session work --budget 4000"), ("--gpt --race <K>", "Опросить K моделей сразу", "gram --gpt --race 2"), ("--gpt --batch <jsonl>", "Пакетная обработка запросов", "gram --gpt --batch prompts.jsonl --out answers.jsonl"), ("--gpt --review <путь>", "Ревью кода по функциям и классам", "gram --gpt --review app.py"), ("--pc", "Информация о системе ПК", "gram --pc"), ("--pc --watch [сек]", "Живой монитор системы", "gram --pc --watch 2"), ("--pc --top <N>", "Самые нагруженные процессы", "gram --pc --top 10 --sort rss"), ("--pc --record <файл>", "Записывать метрики в фоне", "gram --pc --record box.rec --interval 1s"), ("--pc --report <файл>", "Процентили и всплески по записи", "gram --pc --report box.rec"), ("--bench", "Бенчмарк машины", "gram --bench --out box.json"), ("--loadtest <url>", "Нагрузочный тест HTTP сервиса", "gram --loadtest http://127.0.0.1:8000/health --duration 10s"), ("--fiat", "Курсы валют", "gram --fiat"), ("--fiat --offline", "Курсы из последнего снимка", "gram --fiat --offline"), ("--fiat --watchlist <toml>", "Свои списки валют и монет", "gram --fiat --watchlist coins.toml"), ("--fiat --watch [сек]", "Живой тикер курсов", "gram --fiat --watch 10"), ("--fiat --history <список>", "История курсов без сети", "gram --fiat --history EUR,BTC --since 30d"), ("--version", "Показать версию пакета", "gram --version"), ("--update", "Обновить до последней версии", "gram --update"), ("--help-commands", "Подробная документация", "gram --help-commands")]
     
     for cmd, desc, usage in commands:
         help_table.add_row(f"[bold]{cmd}[/bold]", desc, f"[dim]{usage}[/dim]")
@@ -31,7 +31,7 @@ def show_detailed_help():
     console.print(title_panel)
     console.print("\n")
     
-    commands_info = [{"title": "🚀 Команды создания проектов", "color": "green", "commands": [("--start fastapi", "Создать FastAPI проект с современной структурой")]}, {"title": "🤖 Команды ИИ", "color": "blue", "commands": [("--gpt", "Интерактивный чат с GPT")]}, {"title": "💻 Команды системы", "color": "bright_blue", "commands": [("--pc", "Информация о системе ПК"), ("--fiat", "Курсы валют и криптовалют")]}, {"title": "🔧 Команды управления", "color": "magenta", "commands": [("--version", "Показать версию пакета"), ("--update", "Обновить до последней версии")]}, {"title": "🔍 Команды анализа", "color": "cyan", "commands": [("--info <файл>", "Статистика Python файла"), ("--lint <файл>", "Проверка качества кода")]}, {"title": "📚 Справка", "color": "magenta", "commands": [("--help-commands", "Подробная справка"), ("--help", "Базовая справка по CLI")]}]
+    commands_info = [{"title": "🚀 Команды создания проектов", "color": "green", "commands": [("--start fastapi", "Создать FastAPI проект с современной структурой"), ("--start fastapi-perf [--set db=sqlite|postgres|none] [--set cache=memory|redis] [--set workers=auto|N]", "Проект из шаблона: пул БД, orjson, кэш ответов, профилирование, gunicorn по числу ядер")]}, {"title": "🤖 Команды ИИ", "color": "blue", "commands": [("--gpt", "Интерактивный чат с GPT (ответы кэшируются локально)"), ("--gpt --no-cache", "GPT чат без кэша ответов"), ("--gpt --session <имя>", "Сохранить диалог и продолжить его позже"), ("--gpt --budget <токены>", "Бюджет токенов для памяти диалога"), ("--gpt --race <K>", "Отправить запрос K самым быстрым моделям и взять первый ответ"), ("--gpt --batch <jsonl> --out <jsonl>", "Пакетная обработка: --concurrency N, --rate R/с, --unordered; прерванный запуск продолжается"), ("--gpt --review <путь>", "Ревью кода по фрагментам (--budget токенов на фрагмент); повторно отправляются только изменённые функции")]}, {"title": "💻 Команды системы", "color": "bright_blue", "commands": [("--pc", "Информация о системе ПК"), ("--pc --watch [сек]", "Живой монитор: ядра CPU, память, диски и сеть (по умолчанию каждую секунду)"), ("--pc --top <N> [--sort cpu|rss|io]", "Топ-N процессов по CPU, памяти или вводу-выводу"), ("--pc --record <файл> [--interval 1s]", "Писать CPU, память, диски и сеть в кольцевой файл (сутки при 1 с)"), ("--pc --report <файл>", "p50/p90/p99 и всплески по записанной истории"), ("--bench [--out <json>] [--compare <json>]", "CPU, память, диск и интерпретатор: медиана и σ, сравнение с прошлым запуском"), ("--loadtest <url> [--scenario <toml>]", "Нагрузка keep-alive соединениями: --concurrency N (закрытый цикл) или --rate R/с (открытый), --duration, --out <json>"), ("--fiat", "Курсы валют и криптовалют (с локальным кэшем)"), ("--fiat --offline", "Курсы из последнего сохранённого снимка без сети"), ("--fiat --watchlist <toml>", "Списки base/fiat/crypto (по умолчанию ~/.config/gram/watchlist.toml)"), ("--fiat --watch [сек]", "Живой тикер с подсветкой изменений (по умолчанию каждые 5 с)"), ("--fiat --history <список> --since <период>", "Мин/макс/среднее по сохранённой истории"), ("--fiat --compact [--since <период>]", "Свернуть старую историю до средних за час")]}, {"title": "🔧 Команды управления", "color": "magenta", "commands": [("--version", "Показать версию пакета"), ("--update", "Обновить до последней версии (источник: GRAM_UPDATE_URL; новая версия проверяется в фоне раз в сутки, отключить: GRAM_NO_UPDATE_CHECK=1)")]}, {"title": "🔍 Команды анализа", "color": "cyan", "commands": [("--info <файл>", "Статистика Python файла"), ("--info <путь> --hotspots [N] [--sort complexity|length|depth|args] [--min <порог>]", "Топ-N функций по цикломатической сложности, длине, вложенности или числу аргументов; с --min — все функции не ниже порога"), ("--lint <файл>", "Проверка качества кода"), ("--perf <путь>", "Медленные конструкции: склейка строк, in по списку, атрибуты и re.compile в циклах, лишние list(), повторное чтение файлов"), ("--dupes <папка> [--top N]", "Повторяющиеся фрагменты кода по всему проекту: совпадение структуры без учёта имён и констант, отпечатки AST"), ("--deadcode <папка> [--top N] [--no-cache]", "Индекс символов проекта: неиспользуемые импорты, функции и классы без обращений, модули, которые никто не импортирует; индекс кэшируется, повторный запуск разбирает только изменённые файлы"), ("[--sample] [--interval 5ms] [--top N] [--out <файл>] --profile <скрипт.py | -m модуль | gram> [аргументы]", "Профилирование CPU: таблицы по собственному и накопленному времени, collapsed-стеки для flamegraph.pl/speedscope; --sample — выборка стеков вместо cProfile. Опции gram пишутся до --profile, всё после — команда цели"), ("[--interval 5s] [--top N] [--out <папка>] [--compare <снимок>] --mem <скрипт.py | -m модуль | gram> [аргументы]", "Память через tracemalloc: снимки по расписанию на диск, крупнейшие места выделения, рост между снимками, пиковый RSS"), ("[--compare <старый снимок>] --mem <снимок.tracemalloc>", "Разбор и сравнение сохранённых снимков без запуска")]}, {"title": "📚 Справка", "color": "magenta", "commands": [("--help-commands", "Подробная справка"), ("--help", "Базовая справка по CLI")]}]
     
     for section in commands_info:
         section_panel = Panel("\n".join([f"[bold {section['color']}]{cmd}[/bold {section['color']}] - {desc}" for cmd, desc in section['commands']]), title=section['title'], border_style=section['color'])
@@ -54,7 +54,6 @@ def _check_directory(path: Path):
         
         for py_file in python_files:
             try:
-                py_file.read_text(encoding="utf-8")
                 ast.parse(py_file.read_text(encoding="utf-8"))
                 syntax_results.append((py_file, "✅ OK", "green"))
             except SyntaxError as e:
@@ -0,0 +1,370 @@
+"""Нагрузочное тестирование HTTP"""
+import asyncio
+import json
+import random
+import ssl
+import time
+from array import array
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import toml
+from rich.console import Console
+from rich.panel import Panel
+from rich.progress import BarColumn, Progress, TextColumn, TimeRemainingColumn
+from rich.table import Table
+
+from gram.units import format_bytes, parse_duration
+
+console = Console()
+
+DEFAULT_DURATION = 10.0
+DEFAULT_CONCURRENCY = 10
+REQUEST_TIMEOUT = 10.0
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Лог-линейная гистограмма в духе HDR: фиксированная память и погрешность < 1%.
+
+    Значения в микросекундах. До SUB_BUCKETS значения хранятся точно, дальше каждая
+    степень двойки делится на SUB_BUCKETS // 2 равных корзин.
+    """
+
+    SUB_BUCKETS = 256
+    MAX_EXPONENT = 40
+
+    def __init__(self):
+        self.half = self.SUB_BUCKETS // 2
+        self.counts = array("Q", [0]) * (self.SUB_BUCKETS + self.MAX_EXPONENT * self.half)
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - self.SUB_BUCKETS.bit_length() + 1
+        return self.SUB_BUCKETS + (exponent - 1) * self.half + (value >> exponent) - self.half
+
+    def _value(self, index: int) -> int:
+        """Верхняя граница корзины: процентили не занижаются."""
+        if index < self.SUB_BUCKETS:
+            return index
+        exponent, offset = divmod(index - self.SUB_BUCKETS, self.half)
+        exponent += 1
+        return ((offset + self.half + 1) << exponent) - 1
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[min(self._index(value), len(self.counts) - 1)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Значение в секундах, не меньше которого q% замеров."""
+        if not self.total:
+            return 0.0
+        target = max(1, int(round(self.total * q / 100)))
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            "min": (self.min or 0) / 1_000_000,
+            "mean": self.sum / self.total / 1_000_000 if self.total else 0.0,
+            "max": self.max / 1_000_000,
+            **{f"p{q:g}": self.percentile(q) for q in PERCENTILES},
+        }
+
+
+class Endpoint:
+    def __init__(self, method: str, path: str, host: str, headers: dict = None, body: str = None, weight: float = 1.0):
+        self.name = f"{method} {path}"
+        self.head = method == "HEAD"
+        self.weight = weight
+        payload = body.encode("utf-8") if isinstance(body, str) else (body or b"")
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", "User-Agent: gram-loadtest", "Accept: */*"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        if payload or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(payload)}")
+        # Запрос собирается в байты один раз и дальше только пишется в сокет
+        self.raw = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+
+
+class Connection:
+    """Одно keep-alive соединение HTTP/1.1 поверх asyncio streams."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool):
+        self.host, self.port, self.use_ssl = host, port, use_ssl
+        self.reader = self.writer = None
+
+    async def _open(self):
+        context = ssl.create_default_context() if self.use_ssl else None
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, raw: bytes, head: bool = False) -> tuple:
+        if self.writer is None:
+            await self._open()
+        self.writer.write(raw)
+        await self.writer.drain()
+        status, size, keep_alive = await self._read_response(head)
+        if not keep_alive:
+            self.close()
+        return status, size
+
+    async def _read_head(self) -> tuple:
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("сервер закрыл соединение")
+        version, status = status_line.split(b" ", 2)[:2]
+        keep_alive = version == b"HTTP/1.1"
+        length, chunked = None, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.partition(b":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value
+            elif name == b"connection":
+                keep_alive = value == b"keep-alive" or (keep_alive and value != b"close")
+        return int(status), length, chunked, keep_alive
+
+    async def _read_response(self, head: bool = False) -> tuple:
+        status, length, chunked, keep_alive = await self._read_head()
+        # 1xx — промежуточные ответы без тела, за ними идёт настоящий
+        while 100 <= status < 200 and status != 101:
+            status, length, chunked, keep_alive = await self._read_head()
+
+        size = 0
+        # RFC 9112 §6.3: у ответа на HEAD, 1xx, 204 и 304 тела нет, что бы ни было в заголовках
+        if head or status < 200 or status in (204, 304):
+            return status, 0, keep_alive
+        if chunked:
+            while True:
+                chunk = int((await self.reader.readline()).split(b";")[0], 16)
+                if chunk == 0:
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                await self.reader.readexactly(chunk + 2)
+                size += chunk
+        elif length is not None:
+            await self.reader.readexactly(length)
+            size = length
+        else:
+            # Без длины тело идёт до закрытия соединения, даже если сервер обещал keep-alive
+            size = len(await self.reader.read())
+            keep_alive = False
+        return status, size, keep_alive
+
+
+class LoadTest:
+    def __init__(self, url: str, endpoints: list, concurrency: int, duration: float, rate: float = None, warmup: float = 0.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.use_ssl = parts.scheme == "https"
+        self.port = parts.port or (443 if self.use_ssl else 80)
+        self.endpoints = endpoints
+        self.weights = [endpoint.weight for endpoint in endpoints]
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rate = rate
+        self.warmup = warmup
+        self.histogram = LatencyHistogram()
+        self.errors = {}
+        self.completed = 0
+        self.bytes = 0
+
+    def _choose(self) -> Endpoint:
+        return self.endpoints[0] if len(self.endpoints) == 1 else random.choices(self.endpoints, self.weights)[0]
+
+    async def _execute(self, pool: asyncio.Queue, endpoint: Endpoint, scheduled: float):
+        connection = await pool.get()
+        error = None
+        try:
+            status, size = await asyncio.wait_for(connection.request(endpoint.raw, endpoint.head), REQUEST_TIMEOUT)
+            if status >= 400:
+                error = f"HTTP {status}"
+        except asyncio.TimeoutError:
+            connection.close()
+            error, size = "таймаут", 0
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            connection.close()
+            error, size = type(e).__name__, 0
+        finally:
+            pool.put_nowait(connection)
+
+        # Задержка считается от запланированного момента, а не от фактической отправки:
+        # так очередь на клиенте не прячет медленные ответы (coordinated omission)
+        finished = time.perf_counter()
+        if scheduled < self.measure_from:
+            return
+        self.completed += 1
+        self.bytes += size
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+            endpoint.errors += 1
+        else:
+            self.histogram.record(finished - scheduled)
+            endpoint.histogram.record(finished - scheduled)
+
+    async def _closed_loop(self, pool, end: float):
+        # Закрытый цикл: каждый «пользователь» шлёт следующий запрос только после ответа
+        async def user():
+            while time.perf_counter() < end:
+                await self._execute(pool, self._choose(), time.perf_counter())
+        await asyncio.gather(*(user() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, pool, start: float, end: float):
+        # Открытый цикл: запросы по расписанию с заданной частотой, независимо от ответов
+        interval = 1.0 / self.rate
+        pending = set()
+        scheduled = start
+        while scheduled < end:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(self._execute(pool, self._choose(), scheduled))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            scheduled += interval
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def run(self, on_tick=None) -> float:
+        pool = asyncio.Queue()
+        connections = [Connection(self.host, self.port, self.use_ssl) for _ in range(self.concurrency)]
+        for connection in connections:
+            pool.put_nowait(connection)
+
+        start = time.perf_counter()
+        self.measure_from = start + self.warmup
+        end = self.measure_from + self.duration
+        runner = asyncio.ensure_future(self._open_loop(pool, start, end) if self.rate else self._closed_loop(pool, end))
+        while not runner.done():
+            await asyncio.wait([runner], timeout=0.25)
+            if on_tick:
+                on_tick(min(time.perf_counter() - start, self.warmup + self.duration))
+        runner.result()
+        for connection in connections:
+            connection.close()
+        return max(time.perf_counter() - self.measure_from, 1e-9)
+
+
+def load_scenario(path: str) -> dict:
+    text = Path(path).read_text(encoding="utf-8")
+    scenario = json.loads(text) if path.endswith(".json") else toml.loads(text)
+    if not isinstance(scenario, dict):
+        raise ValueError("сценарий должен быть объектом")
+    return scenario
+
+
+def _format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:,.2f} мс"
+
+
+def run_loadtest(url: str, scenario_path: str = None, duration=None, concurrency: int = None, rate: float = None, output_path: str = None):
+    try:
+        scenario = load_scenario(scenario_path) if scenario_path else {}
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"нужен адрес вида http://127.0.0.1:8000/, получено {url!r}")
+        base_path = parts.path.rstrip("/")
+        host_header = parts.netloc
+        requests_spec = scenario.get("requests") or [{"method": "GET", "path": (parts.path or "/") + (f"?{parts.query}" if parts.query else "")}]
+        endpoints = [
+            Endpoint(spec.get("method", "GET").upper(), spec["path"] if not scenario.get("requests") else base_path + spec["path"], host_header, spec.get("headers"), spec.get("body"), float(spec.get("weight", 1)))
+            for spec in requests_spec
+        ]
+        duration = parse_duration(duration or scenario.get("duration", DEFAULT_DURATION))
+        warmup = parse_duration(scenario.get("warmup", 0))
+        concurrency = max(1, concurrency or int(scenario.get("concurrency", DEFAULT_CONCURRENCY)))
+        rate = rate or scenario.get("rate")
+        test = LoadTest(f"{parts.scheme}://{parts.netloc}", endpoints, concurrency, duration, float(rate) if rate else None, warmup)
+    except (OSError, ValueError, KeyError, TypeError, toml.TomlDecodeError) as e:
+        console.print(Panel(f"[bold red]❌ {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    mode = f"открытый цикл, {test.rate:g} запр/с" if test.rate else f"закрытый цикл, {concurrency} соединений"
+    console.print(f"\n[bold bright_cyan]🔥 Нагрузка на {parts.scheme}://{parts.netloc}: {mode}, {duration:g} с{f' + прогрев {warmup:g} с' if warmup else ''}[/bold bright_cyan]\n")
+
+    with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(), TimeRemainingColumn(), console=console, transient=True) as progress:
+        task = progress.add_task("🚀 Нагрузка...", total=warmup + duration)
+
+        def on_tick(elapsed):
+            progress.update(task, completed=elapsed, description=f"🚀 {test.completed:,} запросов")
+
+        try:
+            elapsed = asyncio.run(test.run(on_tick))
+        except KeyboardInterrupt:
+            console.print("[yellow]⏹️ Остановлено, показываю собранное[/yellow]")
+            elapsed = max(time.perf_counter() - test.measure_from, 1e-9) if hasattr(test, "measure_from") else 1e-9
+
+    summary = test.histogram.summary()
+    errors = sum(test.errors.values())
+    report = {
+        "url": url,
+        "mode": "open" if test.rate else "closed",
+        "rate": test.rate,
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "requests": test.completed,
+        "throughput": test.completed / elapsed,
+        "bytes": test.bytes,
+        "errors": dict(test.errors),
+        "latency": summary,
+        "endpoints": {endpoint.name: {"latency": endpoint.histogram.summary(), "errors": endpoint.errors} for endpoint in endpoints},
+    }
+
+    table = Table(title="📊 Итог", show_header=True)
+    table.add_column("🔧 Показатель", style="bold cyan", no_wrap=True)
+    table.add_column("📊 Значение", justify="right", no_wrap=True)
+    table.add_row("📨 Запросов", f"{test.completed:,}")
+    table.add_row("⚡ Пропускная способность", f"{report['throughput']:,.1f} запр/с")
+    table.add_row("📦 Получено", f"{format_bytes(test.bytes)} ({format_bytes(test.bytes / elapsed, '/s')})")
+    error_color = "green" if not errors else "red"
+    table.add_row("❌ Ошибки", f"[{error_color}]{errors:,} ({errors / test.completed * 100 if test.completed else 0:.2f}%)[/{error_color}]")
+    for name in ("min", "mean", *(f"p{q:g}" for q in PERCENTILES), "max"):
+        table.add_row(f"⏱ {name}", _format_ms(summary[name]))
+    console.print(table)
+    console.print("")
+
+    if len(endpoints) > 1:
+        endpoint_table = Table(title="🎯 По запросам", show_header=True)
+        endpoint_table.add_column("🔗 Запрос", style="bold yellow")
+        for title in ("Кол-во", "p50", "p90", "p99", "Ошибки"):
+            endpoint_table.add_column(title, justify="right", no_wrap=True)
+        for endpoint in endpoints:
+            stats = endpoint.histogram.summary()
+            endpoint_table.add_row(endpoint.name, f"{stats['count'] + endpoint.errors:,}", _format_ms(stats["p50"]), _format_ms(stats["p90"]), _format_ms(stats["p99"]), f"{endpoint.errors:,}")
+        console.print(endpoint_table)
+        console.print("")
+
+    if test.errors:
+        console.print("[red]" + " • ".join(f"{kind}: {count:,}" for kind, count in sorted(test.errors.items(), key=lambda item: -item[1])) + "[/red]\n")
+
+    if output_path:
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        console.print(f"[green]💾 Отчёт сохранён в {output_path}[/green]\n")
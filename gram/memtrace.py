@@ -0,0 +1,237 @@
+"""Профилирование памяти: tracemalloc и снимки на диске"""
+import fnmatch
+import linecache
+import pickle
+import runpy
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from gram import runner
+from gram.profiler import short_path
+from gram.runner import Target, TargetError
+from gram.units import format_bytes, parse_duration
+
+console = Console()
+
+DEFAULT_TOP = 15
+DEFAULT_INTERVAL = 5.0
+MIN_INTERVAL = 0.5
+# RSS меряется чаще снимков: пик между снимками иначе не увидеть
+RSS_INTERVAL = 0.1
+SNAPSHOT_SUFFIX = ".tracemalloc"
+IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<frozen runpy>"),
+    tracemalloc.Filter(False, runpy.__file__),
+    tracemalloc.Filter(False, runner.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+def load_snapshot(path) -> tracemalloc.Snapshot:
+    try:
+        snapshot = tracemalloc.Snapshot.load(str(path))
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError) as e:
+        raise ValueError(f"{path}: не снимок tracemalloc ({e})")
+    if not isinstance(snapshot, tracemalloc.Snapshot):
+        raise ValueError(f"{path}: не снимок tracemalloc")
+    return snapshot
+
+
+class MemoryTracer:
+    """Снимки tracemalloc каждые interval секунд и пиковый RSS; снимки сразу пишутся на диск,
+    в памяти держится только первый и предыдущий."""
+
+    def __init__(self, interval: float, directory: Path, psutil=None):
+        self.interval = interval
+        self.directory = directory
+        self.process = psutil.Process() if psutil else None
+        self.filters = IGNORED + ([tracemalloc.Filter(False, str(Path(psutil.__file__).parent / "*"))] if psutil else [])
+        self.timeline = []
+        self.paths = []
+        self.first = self.previous = self.final = None
+        self.peak_traced = 0
+        self.peak_rss = 0
+        self.started = 0.0
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _sample_rss(self) -> int:
+        if self.process is None:
+            return 0
+        rss = self.process.memory_info().rss
+        self.peak_rss = max(self.peak_rss, rss)
+        return rss
+
+    def _take(self, name: str, snapshot: tracemalloc.Snapshot = None, traced: int = None) -> tracemalloc.Snapshot:
+        # Объём замеряется до снимка: сам снимок тоже лежит в отслеживаемой памяти
+        elapsed = time.perf_counter() - self.started
+        if snapshot is None:
+            traced = tracemalloc.get_traced_memory()[0]
+            snapshot = tracemalloc.take_snapshot()
+        snapshot = snapshot.filter_traces(self.filters)
+        # Строка собирается в кадре этого файла, а он отфильтрован: путь не попадает в следующие снимки, как Path из pathlib
+        path = f"{self.directory}/{name}{SNAPSHOT_SUFFIX}"
+        snapshot.dump(path)
+        self.paths.append(path)
+
+        growth = None
+        if self.previous is not None:
+            changes = [stat for stat in snapshot.compare_to(self.previous, "lineno") if stat.size_diff > 0]
+            growth = max(changes, key=lambda stat: stat.size_diff, default=None)
+        self.timeline.append((elapsed, traced, self._sample_rss(), growth))
+        self.previous = snapshot
+        return snapshot
+
+    def _loop(self):
+        next_snapshot = time.monotonic() + self.interval
+        while not self._stopped.wait(RSS_INTERVAL):
+            self._sample_rss()
+            if time.monotonic() >= next_snapshot:
+                with self._lock:
+                    if self._stopped.is_set():
+                        break
+                    snapshot = self._take(f"snapshot-{len(self.paths) + 1:03d}")
+                self.first = self.first or snapshot
+                next_snapshot += self.interval
+
+    def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Шаблоны фильтров компилируются и кэшируются fnmatch до начала трассировки, иначе этот кэш
+        # выглядит как память цели
+        for trace_filter in self.filters:
+            fnmatch.fnmatch("", trace_filter.filename_pattern)
+        self.started = time.perf_counter()
+        tracemalloc.start()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        # Последний снимок — первым делом, пока gram сам ничего не выделил; блокировка дожидается
+        # снимка, который фоновый поток уже начал
+        with self._lock:
+            traced, self.peak_traced = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        self._thread.join()
+        self.final = self._take("final", snapshot, traced)
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    source = linecache.getline(frame.filename, frame.lineno).strip()
+    return f"{short_path(frame.filename)}:{frame.lineno}" + (f"\n[dim]{source[:80]}[/dim]" if source else "")
+
+
+def _show_top(snapshot: tracemalloc.Snapshot, title: str, top: int):
+    stats = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in stats)
+    table = Table(title=f"{title} • всего {format_bytes(total)}", show_header=True)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("📍 Место", style="bold white")
+    table.add_column("💾 Размер", justify="right", style="bold yellow", no_wrap=True)
+    table.add_column("%", justify="right", style="yellow", no_wrap=True)
+    table.add_column("🧱 Блоков", justify="right", style="cyan", no_wrap=True)
+    for i, stat in enumerate(stats[:top], 1):
+        table.add_row(str(i), _site(stat), format_bytes(stat.size), f"{stat.size / max(total, 1) * 100:.1f}", f"{stat.count:,}")
+    console.print(table)
+    console.print("")
+
+
+def _show_growth(new: tracemalloc.Snapshot, old: tracemalloc.Snapshot, title: str, top: int):
+    changes = [stat for stat in new.compare_to(old, "lineno") if stat.size_diff]
+    if not changes:
+        console.print(Panel("[bold green]✅ Размер не изменился ни в одном месте[/bold green]", title=title, border_style="green"))
+        console.print("")
+        return
+    total = sum(stat.size_diff for stat in changes)
+    table = Table(title=f"{title} • итого {'+' if total >= 0 else '−'}{format_bytes(abs(total))}", show_header=True)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("📍 Место", style="bold white")
+    table.add_column("📈 Рост", justify="right", style="bold red", no_wrap=True)
+    table.add_column("💾 Сейчас", justify="right", style="yellow", no_wrap=True)
+    table.add_column("🧱 Блоков Δ", justify="right", style="cyan", no_wrap=True)
+    for i, stat in enumerate(changes[:top], 1):
+        growth = f"+{format_bytes(stat.size_diff)}" if stat.size_diff > 0 else f"[green]−{format_bytes(-stat.size_diff)}[/green]"
+        table.add_row(str(i), _site(stat), growth, format_bytes(stat.size), f"{stat.count_diff:+,}")
+    console.print(table)
+    console.print("")
+
+
+def _show_timeline(tracer: MemoryTracer):
+    table = Table(title="🕒 Снимки", show_header=True)
+    table.add_column("📸 Снимок", style="bold cyan", no_wrap=True)
+    table.add_column("⏱ Время", justify="right", no_wrap=True)
+    table.add_column("🧠 Python", justify="right", style="bold yellow", no_wrap=True)
+    table.add_column("Δ", justify="right", no_wrap=True)
+    table.add_column("💻 RSS", justify="right", style="dim", no_wrap=True)
+    table.add_column("📈 Больше всего выросло", style="white")
+    previous = None
+    for path, (elapsed, traced, rss, growth) in zip(tracer.paths, tracer.timeline):
+        change = "—" if previous is None else (f"[red]+{format_bytes(traced - previous)}[/red]" if traced >= previous else f"[green]−{format_bytes(previous - traced)}[/green]")
+        grew = f"{_site(growth).splitlines()[0]} [red]+{format_bytes(growth.size_diff)}[/red]" if growth else "—"
+        table.add_row(Path(path).stem, f"{elapsed:.1f} с", format_bytes(traced), change, format_bytes(rss) if rss else "—", grew)
+        previous = traced
+    console.print(table)
+    console.print("")
+
+
+def run_memory(argv: list, interval=None, top: int = None, output_dir: str = None, compare_path: str = None):
+    top = top or DEFAULT_TOP
+    try:
+        baseline = load_snapshot(compare_path) if compare_path else None
+        # Разбор сохранённого снимка без запуска: gram [--compare старый] --mem снимок.tracemalloc
+        if len(argv) == 1 and argv[0].endswith(SNAPSHOT_SUFFIX):
+            snapshot = load_snapshot(argv[0])
+            _show_top(snapshot, f"🧠 Крупнейшие места выделения: {argv[0]}", top)
+            if baseline:
+                _show_growth(snapshot, baseline, f"📈 Изменения относительно {compare_path}", top)
+            return
+        target = Target(argv, "--mem")
+        interval = max(MIN_INTERVAL, parse_duration(interval) if interval else DEFAULT_INTERVAL)
+    except (TargetError, ValueError) as e:
+        console.print(Panel(f"[bold red]❌ {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    directory = Path(output_dir or f"{target.stem}-mem")
+    tracer = MemoryTracer(interval, directory, psutil)
+
+    console.print(Panel(
+        f"[bold cyan]🧠 {target.title}[/bold cyan]\n"
+        f"[dim]Снимок tracemalloc каждые {interval:g} с → {directory}/ • Ctrl+C — остановить цель и показать результат[/dim]",
+        title="💾 Профилирование памяти", border_style="bright_blue"))
+    console.print("")
+    status = target.run(tracer.start, tracer.stop)
+    console.print("")
+
+    _show_timeline(tracer)
+    _show_top(tracer.final, "🧠 Крупнейшие места выделения в конце", top)
+    if tracer.first is not None:
+        _show_growth(tracer.final, tracer.first, "📈 Рост с первого снимка", top)
+    if baseline:
+        _show_growth(tracer.final, baseline, f"📈 Изменения относительно {compare_path}", top)
+
+    rss = f"{format_bytes(tracer.peak_rss)} [dim](с накладными расходами tracemalloc)[/dim]" if psutil else "[dim]нужен psutil[/dim]"
+    color = "green" if status == "завершено" else "yellow"
+    console.print(Panel(
+        f"[bold {color}]🏁 Цель: {status}[/bold {color}]\n"
+        f"[cyan]🧠 Пик памяти Python:[/cyan] [yellow]{format_bytes(tracer.peak_traced)}[/yellow]\n"
+        f"[cyan]💻 Пиковый RSS:[/cyan] [yellow]{rss}[/yellow]\n"
+        f"[green]💾 Снимков сохранено: {len(tracer.paths)} в {directory}/[/green]\n"
+        f"[dim]Сравнить с другим запуском: gram --compare {tracer.paths[-1]} --mem <снимок{SNAPSHOT_SUFFIX} | скрипт.py>[/dim]",
+        title="🎯 Итог", border_style=color))
+    console.print("")
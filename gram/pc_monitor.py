@@ -0,0 +1,113 @@
+"""Живой монитор системы"""
+import time
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from gram.units import format_bytes
+
+console = Console()
+
+DEFAULT_INTERVAL = 1.0
+MIN_INTERVAL = 0.25
+BAR_WIDTH = 20
+
+
+def usage_bar(percent: float, width: int = BAR_WIDTH) -> Text:
+    filled = int(round(percent / 100 * width))
+    color = "green" if percent < 60 else "yellow" if percent < 85 else "red"
+    bar = Text("█" * filled, style=color)
+    bar.append("░" * (width - filled), style="dim")
+    bar.append(f" {percent:5.1f}%")
+    return bar
+
+
+class CounterRates:
+    """Скорости по разнице накопительных счётчиков psutil между двумя замерами."""
+
+    def __init__(self, read):
+        self.read = read
+        self.previous = read()
+        self.previous_time = time.monotonic()
+
+    def sample(self) -> dict:
+        current, now = self.read(), time.monotonic()
+        elapsed = max(now - self.previous_time, 1e-6)
+        rates = {}
+        if current is not None and self.previous is not None:
+            for field in current._fields:
+                rates[field] = max(0, getattr(current, field) - getattr(self.previous, field)) / elapsed
+        self.previous, self.previous_time = current, now
+        return rates
+
+
+class PcMonitor:
+    def __init__(self, psutil):
+        self.psutil = psutil
+        self.process = psutil.Process()
+        self.disk = CounterRates(lambda: psutil.disk_io_counters(nowrap=True))
+        self.net = CounterRates(lambda: psutil.net_io_counters(nowrap=True))
+        # Первые вызовы cpu_percent только запоминают счётчики, дальше — неблокирующие разности
+        psutil.cpu_percent(interval=None, percpu=True)
+        self.process.cpu_percent(interval=None)
+
+    def render(self, interval: float):
+        psutil = self.psutil
+        cores = psutil.cpu_percent(interval=None, percpu=True)
+
+        cpu_table = Table(title="⚡ Процессор", show_header=True)
+        cpu_table.add_column("🔢 Ядро", style="bold cyan", no_wrap=True)
+        cpu_table.add_column("📊 Загрузка", no_wrap=True)
+        cpu_table.add_row("[bold]Всего[/bold]", usage_bar(sum(cores) / len(cores) if cores else 0.0))
+        for index, percent in enumerate(cores):
+            cpu_table.add_row(f"#{index}", usage_bar(percent))
+
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        memory_table = Table(title="🧠 Память", show_header=True)
+        memory_table.add_column("🔧 Тип", style="bold yellow", no_wrap=True)
+        memory_table.add_column("📊 Занято", no_wrap=True)
+        memory_table.add_column("💾 Объём", justify="right", no_wrap=True)
+        memory_table.add_row("RAM", usage_bar(memory.percent), f"{format_bytes(memory.used)} / {format_bytes(memory.total)}")
+        if swap.total:
+            memory_table.add_row("Swap", usage_bar(swap.percent), f"{format_bytes(swap.used)} / {format_bytes(swap.total)}")
+
+        disk, net = self.disk.sample(), self.net.sample()
+        io_table = Table(title="🔄 Ввод-вывод", show_header=True)
+        io_table.add_column("🔧 Устройство", style="bold magenta", no_wrap=True)
+        io_table.add_column("⬇️ Чтение / приём", justify="right", no_wrap=True)
+        io_table.add_column("⬆️ Запись / отправка", justify="right", no_wrap=True)
+        if disk:
+            io_table.add_row("💾 Диски", format_bytes(disk["read_bytes"], "/s"), format_bytes(disk["write_bytes"], "/s"))
+        if net:
+            io_table.add_row("🌐 Сеть", format_bytes(net["bytes_recv"], "/s"), format_bytes(net["bytes_sent"], "/s"))
+
+        status = Text.from_markup(f"[dim]⏱ {time.strftime('%H:%M:%S')} • каждые {interval:g} с • gram: {self.process.cpu_percent(interval=None):.1f}% CPU • Ctrl+C — выход[/dim]")
+        return Group(cpu_table, memory_table, io_table, status)
+
+
+def watch_pc(interval: float = None):
+    try:
+        import psutil
+    except ImportError:
+        console.print(Panel("[bold red]❌ Для монитора нужен модуль psutil[/bold red]\n\n[dim]pip install psutil[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    interval = max(MIN_INTERVAL, interval or DEFAULT_INTERVAL)
+    monitor = PcMonitor(psutil)
+    time.sleep(MIN_INTERVAL)
+
+    try:
+        # Перерисовка только по таймеру: без auto_refresh Live не крутит собственный поток
+        with Live(monitor.render(interval), console=console, auto_refresh=False) as live:
+            next_tick = time.monotonic()
+            while True:
+                next_tick += interval
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+                live.update(monitor.render(interval), refresh=True)
+    except KeyboardInterrupt:
+        console.print(Panel("[bold green]👋 Монитор остановлен[/bold green]", title="⏹️ Выход", border_style="green"))
+        console.print("")
@@ -0,0 +1,252 @@
+"""Запись метрик системы в кольцевой файл"""
+import mmap
+import struct
+import time
+from array import array
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from gram.units import format_bytes, parse_duration
+
+console = Console()
+
+MAGIC = b"GRAMREC1"
+# Заголовок: магия, размер записи, ёмкость, интервал записи, сколько записей сделано всего
+HEADER = struct.Struct("<8sIIdQ")
+# Запись: время, CPU %, память %, swap %, накопительные счётчики дисков и сети
+RECORD = struct.Struct("<dfffQQQQ")
+DEFAULT_INTERVAL = 1.0
+MIN_INTERVAL = 0.1
+DEFAULT_CAPACITY = 86400
+SPIKE_LIMIT = 10
+# Порог всплеска: медиана + SPIKE_MADS медианных отклонений, но не меньше минимального шага
+SPIKE_MADS = 4
+SPIKE_FLOOR = {"percent": 10.0, "rate": 1024 * 1024}
+
+METRICS = [
+    ("cpu", "⚡ CPU", "percent"),
+    ("memory", "🧠 Память", "percent"),
+    ("swap", "💤 Swap", "percent"),
+    ("disk_read", "💾 Чтение диска", "rate"),
+    ("disk_write", "💾 Запись диска", "rate"),
+    ("net_recv", "🌐 Приём", "rate"),
+    ("net_sent", "🌐 Отправка", "rate"),
+]
+
+
+class RingFile:
+    """Файл фиксированного размера: заголовок и capacity записей, самые старые перезаписываются."""
+
+    def __init__(self, path, capacity: int = DEFAULT_CAPACITY, interval: float = None, writable: bool = False):
+        self.path = Path(path)
+        self.writable = writable
+        if writable and not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, RECORD.size, capacity, interval or DEFAULT_INTERVAL, 0))
+                f.truncate(HEADER.size + RECORD.size * capacity)
+
+        self.file = open(self.path, "r+b" if writable else "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{self.path}: пустой файл")
+        magic, record_size, self.capacity, self.interval, self.written = HEADER.unpack_from(self.buffer, 0) if len(self.buffer) >= HEADER.size else (b"", 0, 0, 0.0, 0)
+        if magic != MAGIC or record_size != RECORD.size or len(self.buffer) < HEADER.size + record_size * self.capacity:
+            self.close()
+            raise ValueError(f"{self.path}: не файл записи gram или другая версия формата")
+        # Продолжение записи с другим интервалом: заголовок должен описывать текущий шаг
+        if writable and interval and interval != self.interval:
+            self.interval = interval
+            HEADER.pack_into(self.buffer, 0, MAGIC, RECORD.size, self.capacity, self.interval, self.written)
+
+    def append(self, values: tuple):
+        offset = HEADER.size + (self.written % self.capacity) * RECORD.size
+        RECORD.pack_into(self.buffer, offset, *values)
+        # Счётчик обновляется после самой записи: читатель не увидит недописанную запись
+        self.written += 1
+        HEADER.pack_into(self.buffer, 0, MAGIC, RECORD.size, self.capacity, self.interval, self.written)
+
+    def records(self) -> list:
+        """Записи в хронологическом порядке."""
+        count = min(self.written, self.capacity)
+        start = self.written % self.capacity if self.written > self.capacity else 0
+        raw = self.buffer[HEADER.size:HEADER.size + count * RECORD.size]
+        return list(RECORD.iter_unpack(raw[start * RECORD.size:] + raw[:start * RECORD.size]))
+
+    def close(self):
+        if self.writable:
+            self.buffer.flush()
+        self.buffer.close()
+        self.file.close()
+
+
+def _sample(psutil) -> tuple:
+    disk = psutil.disk_io_counters(nowrap=True)
+    net = psutil.net_io_counters(nowrap=True)
+    return (
+        time.time(),
+        psutil.cpu_percent(interval=None),
+        psutil.virtual_memory().percent,
+        psutil.swap_memory().percent,
+        disk.read_bytes if disk else 0,
+        disk.write_bytes if disk else 0,
+        net.bytes_recv if net else 0,
+        net.bytes_sent if net else 0,
+    )
+
+
+def record_pc(path: str, interval=None):
+    try:
+        import psutil
+    except ImportError:
+        console.print(Panel("[bold red]❌ Для записи метрик нужен модуль psutil[/bold red]\n\n[dim]pip install psutil[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    try:
+        interval = max(MIN_INTERVAL, parse_duration(interval)) if interval else None
+        ring = RingFile(path, interval=interval, writable=True)
+        # Без --interval существующий файл продолжается со своим шагом
+        interval = ring.interval
+    except (ValueError, OSError) as e:
+        console.print(Panel(f"[bold red]❌ {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    console.print(Panel(
+        f"[bold green]⏺️ Запись метрик в {path}[/bold green]\n\n"
+        f"[dim]Каждые {interval:g} с • кольцо на {ring.capacity:,} записей (~{format_bytes(ring.capacity * RECORD.size)}, "
+        f"≈ {ring.capacity * interval / 3600:.1f} ч истории)[/dim]\n"
+        f"[dim]Отчёт: gram --pc --report {path} • Ctrl+C — остановить[/dim]",
+        title="📼 Запись", border_style="bright_blue"))
+
+    psutil.cpu_percent(interval=None)
+    started_with = ring.written
+    next_tick = time.monotonic() + interval
+    try:
+        while True:
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            # Расписание от monotonic: паузы процесса не накапливают сдвиг
+            next_tick = max(next_tick + interval, time.monotonic())
+            ring.append(_sample(psutil))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorded = ring.written - started_with
+        ring.close()
+    console.print(Panel(f"[bold green]✅ Записано {recorded:,} точек[/bold green]", title="⏹️ Остановлено", border_style="green"))
+    console.print("")
+
+
+def _columns(records: list) -> dict:
+    """Столбцы array('d') по каждой метрике; для счётчиков — скорость между соседними записями."""
+    columns = {"time": array("d"), **{key: array("d") for key, _, _ in METRICS}}
+    previous = None
+    for timestamp, cpu, memory, swap, disk_read, disk_write, net_recv, net_sent in records:
+        if previous is not None:
+            elapsed = timestamp - previous[0]
+            if elapsed > 0:
+                columns["time"].append(timestamp)
+                columns["cpu"].append(cpu)
+                columns["memory"].append(memory)
+                columns["swap"].append(swap)
+                for key, current, old in zip(("disk_read", "disk_write", "net_recv", "net_sent"), (disk_read, disk_write, net_recv, net_sent), previous[4:]):
+                    columns[key].append(max(0, current - old) / elapsed)
+        previous = (timestamp, cpu, memory, swap, disk_read, disk_write, net_recv, net_sent)
+    return columns
+
+
+def percentile(ordered, q: float) -> float:
+    """Процентиль по уже отсортированным значениям с линейной интерполяцией."""
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize_column(values) -> dict:
+    ordered = sorted(values)
+    median = percentile(ordered, 50)
+    deviations = sorted(abs(value - median) for value in values)
+    return {
+        "min": ordered[0], "max": ordered[-1], "avg": sum(ordered) / len(ordered),
+        "p50": median, "p90": percentile(ordered, 90), "p99": percentile(ordered, 99),
+        "mad": percentile(deviations, 50),
+    }
+
+
+def find_spikes(times, values, threshold: float) -> list:
+    """Эпизоды подряд идущих точек выше порога: (начало, длительность, пик)."""
+    spikes = []
+    start = peak = None
+    for i, value in enumerate(values):
+        if value > threshold:
+            if start is None:
+                start, peak = i, value
+            peak = max(peak, value)
+        elif start is not None:
+            spikes.append((times[start], times[i - 1] - times[start], peak))
+            start = None
+    if start is not None:
+        spikes.append((times[start], times[-1] - times[start], peak))
+    return spikes
+
+
+def show_pc_report(path: str):
+    try:
+        ring = RingFile(path)
+    except (ValueError, OSError) as e:
+        console.print(Panel(f"[bold red]❌ {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+        return
+    try:
+        interval = ring.interval
+        columns = _columns(ring.records())
+    finally:
+        ring.close()
+
+    times = columns["time"]
+    if not times:
+        console.print(Panel("[bold yellow]📭 В записи меньше двух точек[/bold yellow]", title="ℹ️ Отчёт", border_style="yellow"))
+        return
+
+    console.print(Panel(
+        f"[bold bright_green]📼 {path}[/bold bright_green]\n"
+        f"[dim]{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(times[0]))} — {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(times[-1]))} • "
+        f"точек: {len(times):,} • интервал {interval:g} с[/dim]",
+        title="🎯 Запись", border_style="bright_blue"))
+
+    table = Table(title="📊 Распределение", show_header=True)
+    table.add_column("🔧 Метрика", style="bold cyan", no_wrap=True)
+    for title in ("Мин", "p50", "p90", "p99", "Макс", "Среднее"):
+        table.add_column(title, justify="right", no_wrap=True)
+
+    spikes = []
+    for key, title, kind in METRICS:
+        stats = summarize_column(columns[key])
+        fmt = (lambda value: f"{value:.1f}%") if kind == "percent" else (lambda value: format_bytes(value, "/s"))
+        table.add_row(title, *(fmt(stats[name]) for name in ("min", "p50", "p90", "p99", "max", "avg")))
+        threshold = stats["p50"] + max(SPIKE_MADS * stats["mad"], SPIKE_FLOOR[kind])
+        spikes.extend((start, duration, peak, title, fmt, threshold) for start, duration, peak in find_spikes(times, columns[key], threshold))
+
+    console.print(table)
+    console.print("")
+
+    if not spikes:
+        console.print(Panel("[bold green]✅ Всплесков не найдено[/bold green]", title="📈 Всплески", border_style="green"))
+        console.print("")
+        return
+
+    spikes.sort(key=lambda spike: spike[2] / spike[5], reverse=True)
+    spike_table = Table(title=f"📈 Всплески (показано {min(len(spikes), SPIKE_LIMIT)} из {len(spikes)})", show_header=True)
+    spike_table.add_column("🕒 Начало", style="dim", no_wrap=True)
+    spike_table.add_column("🔧 Метрика", style="bold yellow", no_wrap=True)
+    spike_table.add_column("⏱ Длилось", justify="right", no_wrap=True)
+    spike_table.add_column("🔺 Пик", justify="right", style="bold red", no_wrap=True)
+    spike_table.add_column("📏 Порог", justify="right", style="dim", no_wrap=True)
+    for start, duration, peak, title, fmt, threshold in sorted(spikes[:SPIKE_LIMIT], key=lambda spike: spike[0]):
+        spike_table.add_row(time.strftime("%m-%d %H:%M:%S", time.localtime(start)), title, f"{duration + interval:.0f} с", fmt(peak), fmt(threshold))
+    console.print(spike_table)
+    console.print("")
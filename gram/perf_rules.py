@@ -0,0 +1,256 @@
+"""Правила поиска медленных конструкций (gram --perf)"""
+import ast
+from typing import NamedTuple
+
+# Литерал короче этого в `x in [...]` не стоит замечания
+MIN_LITERAL_ITEMS = 3
+# Сколько раз одна цепочка атрибутов должна встретиться на одном пути через тело цикла
+REPEATED_LOOKUPS = 3
+# Цепочке из двух и более поисков (os.path.join) хватает двух вхождений; self.a.b — обычная запись в методах
+DEEP_REPEATED_LOOKUPS = 2
+SELF_NAMES = {"self", "cls"}
+MATERIALIZED = {"list", "tuple"}
+CONSUMER_FIXES = {
+    "len": "Если объект поддерживает len() — len(x) напрямую, иначе sum(1 for _ in x)",
+    "any": "Передайте генератор без списка: any(... for ...) остановится на первом совпадении",
+    "all": "Передайте генератор без списка: all(... for ...) остановится на первом несовпадении",
+    "sum": "Передайте генератор без квадратных скобок: sum(... for ...)",
+    "min": "Передайте генератор без квадратных скобок: min(... for ...)",
+    "max": "Передайте генератор без квадратных скобок: max(... for ...)",
+}
+REGEX_MODULES = {"re", "regex"}
+REGEX_FUNCTIONS = {"compile", "match", "search", "fullmatch", "findall", "finditer", "sub", "subn", "split"}
+READ_METHODS = {"read_text", "read_bytes"}
+
+
+class Finding(NamedTuple):
+    line: int
+    code: str
+    title: str
+    message: str
+    fix: str
+
+
+def dotted(node):
+    """Цепочка атрибутов от имени в виде "a.b.c", иначе None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _is_string(node) -> bool:
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str)
+    if isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.Call):
+        return isinstance(node.func, ast.Name) and node.func.id == "str"
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_string(node.left) or _is_string(node.right)
+    return False
+
+
+RULES = []
+
+
+def register_rule(cls):
+    """Декоратор: правило подключается ко всем проходам SourceVisitor."""
+    RULES.append(cls)
+    return cls
+
+
+class Rule:
+    """Правило получает узлы типов node_types во время общего прохода по дереву.
+    Экземпляр создаётся на каждый файл, так что правило может хранить состояние."""
+    code = ""
+    title = ""
+    fix = ""
+    node_types = ()
+
+    def check(self, node, visitor):
+        pass
+
+    def leave_loop(self, frame, visitor):
+        pass
+
+
+@register_rule
+class StringConcatInLoop(Rule):
+    code = "PERF101"
+    title = "Склейка строк в цикле"
+    fix = "Собирайте части в список и склейте один раз после цикла: ''.join(parts)"
+    node_types = (ast.Assign, ast.AnnAssign, ast.AugAssign)
+
+    def __init__(self):
+        self.strings = set()
+
+    def check(self, node, visitor):
+        if isinstance(node, ast.AugAssign):
+            name = dotted(node.target)
+            if visitor.loops and isinstance(node.op, ast.Add) and (name in self.strings or _is_string(node.value)):
+                visitor.report(self, node, f"{name or 'строка'} += … копирует всю строку на каждой итерации")
+            return
+
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        for target in targets:
+            name = dotted(target)
+            if name is None:
+                continue
+            value = node.value
+            if visitor.loops and name in self.strings and isinstance(value, ast.BinOp) and isinstance(value.op, ast.Add) and dotted(value.left) == name:
+                visitor.report(self, node, f"{name} = {name} + … копирует всю строку на каждой итерации")
+            elif value is not None and _is_string(value):
+                self.strings.add(name)
+            else:
+                self.strings.discard(name)
+
+
+@register_rule
+class MembershipInLiteral(Rule):
+    code = "PERF102"
+    title = "in по списку в цикле"
+    fix = "Проверяйте по множеству: x in {...} (или frozenset в константе модуля)"
+    node_types = (ast.Compare,)
+
+    def check(self, node, visitor):
+        if not visitor.loops:
+            return
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)) or not isinstance(comparator, (ast.List, ast.Tuple)):
+                continue
+            if len(comparator.elts) < MIN_LITERAL_ITEMS:
+                continue
+            # Кортеж из констант CPython сворачивает в константу, остаётся только линейный поиск по короткому литералу
+            if isinstance(comparator, ast.List):
+                visitor.report(self, node, f"Линейный поиск по списку из {len(comparator.elts)} элементов на каждой итерации")
+            elif not all(isinstance(item, ast.Constant) for item in comparator.elts):
+                visitor.report(self, node, f"Кортеж из {len(comparator.elts)} элементов собирается заново на каждой итерации")
+
+
+@register_rule
+class RepeatedAttributeLookup(Rule):
+    code = "PERF103"
+    title = "Повторный поиск атрибутов в цикле"
+    fix = "Сохраните атрибут в локальную переменную перед циклом, например append = items.append"
+    node_types = (ast.Attribute,)
+
+    def __init__(self):
+        self.nested = set()
+
+    def check(self, node, visitor):
+        if id(node) in self.nested:
+            self.nested.discard(id(node))
+            return
+        inner = node.value
+        while isinstance(inner, ast.Attribute):
+            self.nested.add(id(inner))
+            inner = inner.value
+        chain = dotted(node)
+        if visitor.loops and chain is not None and isinstance(node.ctx, ast.Load):
+            # Счётчик по путям: взаимоисключающие ветки и выход через continue не суммируются
+            visitor.loops[-1].count(chain, node)
+
+    def leave_loop(self, frame, visitor):
+        for chain, (count, node) in frame.path_counts().items():
+            parts = chain.split(".")
+            # Если в цикле присваивается сама цепочка или её начало, вынести поиск нельзя
+            if any(".".join(parts[:i]) in frame.stored for i in range(1, len(parts) + 1)):
+                continue
+            if count >= REPEATED_LOOKUPS or (count >= DEEP_REPEATED_LOOKUPS and len(parts) > 2 and parts[0] not in SELF_NAMES):
+                visitor.report(self, node, f"{chain} встречается {count} раз(а) на одном проходе тела цикла")
+
+
+@register_rule
+class MaterializedArgument(Rule):
+    code = "PERF104"
+    title = "Лишний список для len/any/all"
+    fix = "Не создавайте промежуточный список"
+    node_types = (ast.Call,)
+
+    def check(self, node, visitor):
+        if not isinstance(node.func, ast.Name) or node.func.id not in CONSUMER_FIXES or len(node.args) != 1 or node.keywords:
+            return
+        consumer, argument = node.func.id, node.args[0]
+        if isinstance(argument, ast.ListComp) and consumer != "len":
+            visitor.report(self, node, f"{consumer}([...]) строит весь список до вычисления", fix=CONSUMER_FIXES[consumer])
+        elif isinstance(argument, ast.ListComp):
+            visitor.report(self, node, "len([...]) строит список только ради длины", fix="Посчитайте без списка: sum(1 for ... if ...)")
+        elif isinstance(argument, ast.Call) and isinstance(argument.func, ast.Name) and argument.func.id in MATERIALIZED and len(argument.args) == 1:
+            visitor.report(self, node, f"{consumer}({argument.func.id}(...)) копирует все элементы", fix=CONSUMER_FIXES[consumer])
+
+
+@register_rule
+class RegexInLoop(Rule):
+    code = "PERF105"
+    title = "Регулярное выражение в цикле"
+    fix = "Скомпилируйте шаблон один раз на уровне модуля: PATTERN = re.compile(...)"
+    node_types = (ast.Import, ast.ImportFrom, ast.Call)
+
+    def __init__(self):
+        self.modules = set()
+        self.functions = {}
+
+    def check(self, node, visitor):
+        if isinstance(node, ast.Import):
+            self.modules.update(alias.asname or alias.name for alias in node.names if alias.name in REGEX_MODULES)
+            return
+        if isinstance(node, ast.ImportFrom):
+            if node.module in REGEX_MODULES:
+                self.functions.update((alias.asname or alias.name, alias.name) for alias in node.names if alias.name in REGEX_FUNCTIONS)
+            return
+        if not visitor.loops or not node.args:
+            return
+
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in self.modules and func.attr in REGEX_FUNCTIONS:
+            name = func.attr
+        elif isinstance(func, ast.Name) and func.id in self.functions:
+            name = self.functions[func.id]
+        else:
+            return
+        pattern = node.args[0]
+        if name == "compile" and visitor.is_loop_invariant(pattern):
+            visitor.report(self, node, "re.compile() с неизменным шаблоном на каждой итерации")
+        elif isinstance(pattern, ast.Constant):
+            visitor.report(self, node, f"re.{name}() с литеральным шаблоном: поиск в кэше re на каждой итерации")
+
+
+def _read_target(node):
+    """Выражение файла для open(x) в режиме чтения и x.read_text()/x.read_bytes()."""
+    func = node.func
+    if isinstance(func, ast.Attribute) and func.attr in READ_METHODS:
+        return func.value
+    if isinstance(func, ast.Name) and func.id == "open" and node.args:
+        mode = node.args[1] if len(node.args) > 1 else next((kw.value for kw in node.keywords if kw.arg == "mode"), None)
+        if isinstance(mode, ast.Constant) and isinstance(mode.value, str) and set(mode.value) & set("wax+"):
+            return None
+        return node.args[0]
+    return None
+
+
+@register_rule
+class FileReadInLoop(Rule):
+    code = "PERF106"
+    title = "Повторное чтение файла в цикле"
+    fix = "Прочитайте файл один раз и используйте результат"
+    node_types = (ast.Call,)
+
+    def check(self, node, visitor):
+        target = _read_target(node) if visitor.loops else None
+        if target is not None:
+            reads = visitor.loops[-1].data.setdefault(self.code, {})
+            reads.setdefault(ast.dump(target), []).append((node, target))
+
+    def leave_loop(self, frame, visitor):
+        for calls in frame.data.get(self.code, {}).values():
+            node, target = calls[0]
+            source = ast.unparse(target)
+            if len(calls) > 1:
+                visitor.report(self, calls[1][0], f"{source} читается {len(calls)} раз(а) за итерацию")
+            elif visitor.is_loop_invariant(target, frame):
+                visitor.report(self, node, f"{source} перечитывается на каждой итерации", fix="Прочитайте файл до цикла")
@@ -0,0 +1,119 @@
+"""Самые нагруженные процессы"""
+import heapq
+import time
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from gram.units import format_bytes
+
+console = Console()
+
+SORT_KEYS = ("cpu", "rss", "io")
+DEFAULT_TOP = 10
+SAMPLE_WINDOW = 0.5
+
+
+def _snapshot(psutil, attrs: list) -> dict:
+    """Один проход по процессам: process_iter сам оборачивает чтение attrs в oneshot()."""
+    snapshot = {}
+    for process in psutil.process_iter(attrs=attrs, ad_value=None):
+        info = process.info
+        # Ключ (pid, время запуска), чтобы переиспользованный pid не дал ложную разницу
+        snapshot[(info["pid"], info.get("create_time"))] = info
+    return snapshot
+
+
+def _cpu_total(info) -> float:
+    times = info.get("cpu_times")
+    return times.user + times.system if times else 0.0
+
+
+def _io_total(info) -> int:
+    counters = info.get("io_counters")
+    return counters.read_bytes + counters.write_bytes if counters else 0
+
+
+def _fill_details(psutil, records: list):
+    for record in records:
+        record["name"], record["user"] = "?", "?"
+        try:
+            process = psutil.Process(record["pid"])
+            with process.oneshot():
+                record["name"] = process.name()
+                record["user"] = process.username()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+
+
+def top_processes(psutil, limit: int = DEFAULT_TOP, sort: str = "cpu", window: float = SAMPLE_WINDOW) -> tuple:
+    """Топ процессов по CPU, RSS или IO: (записи, всего процессов).
+
+    CPU и IO считаются по разнице двух снимков всех процессов за window секунд вместо
+    блокирующего cpu_percent(interval) на каждый процесс; топ выбирается heapq.nlargest
+    без полной сортировки, а имя и пользователь читаются только для попавших в него.
+    """
+    attrs = ["pid", "create_time", "cpu_times", "memory_info"]
+    if sort == "io":
+        attrs.append("io_counters")
+
+    first = {}
+    if sort != "rss":
+        first = _snapshot(psutil, attrs)
+        started = time.monotonic()
+        time.sleep(window)
+    second = _snapshot(psutil, attrs)
+    elapsed = max(time.monotonic() - started, 1e-6) if first else 1.0
+
+    records = []
+    for key, info in second.items():
+        previous = first.get(key)
+        memory = info.get("memory_info")
+        records.append({
+            "pid": info["pid"],
+            "cpu": (_cpu_total(info) - _cpu_total(previous)) / elapsed * 100 if previous else 0.0,
+            "rss": memory.rss if memory else 0,
+            "io": (_io_total(info) - _io_total(previous)) / elapsed if previous else 0.0,
+        })
+
+    top = heapq.nlargest(limit, records, key=lambda record: record[sort])
+    _fill_details(psutil, top)
+    return top, len(records)
+
+
+def show_top_processes(limit: int = None, sort: str = None):
+    try:
+        import psutil
+    except ImportError:
+        console.print(Panel("[bold red]❌ Для списка процессов нужен модуль psutil[/bold red]\n\n[dim]pip install psutil[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    limit = limit if limit and limit > 0 else DEFAULT_TOP
+    sort = (sort or "cpu").lower()
+    if sort not in SORT_KEYS:
+        console.print(Panel(f"[bold red]❌ Неизвестная сортировка: {sort}[/bold red]\n\n[dim]Доступно: {', '.join(SORT_KEYS)}[/dim]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    console.print(f"\n[bold bright_cyan]💻 Собираю процессы (сортировка: {sort})...[/bold bright_cyan]\n")
+    started = time.perf_counter()
+    top, total = top_processes(psutil, limit, sort)
+    elapsed = time.perf_counter() - started
+
+    table = Table(title=f"🔥 Топ-{limit} процессов из {total}", show_header=True)
+    table.add_column("🆔 PID", style="dim", justify="right", no_wrap=True)
+    table.add_column("📝 Процесс", style="bold cyan", no_wrap=True)
+    table.add_column("👤 Пользователь", style="white", no_wrap=True)
+    # Для RSS хватает одного снимка, поэтому CPU в этом режиме не считается
+    columns = [("cpu", "⚡ CPU", lambda value: f"{value:.1f}%"), ("rss", "🧠 RSS", format_bytes), ("io", "🔄 IO", lambda value: format_bytes(value, "/s"))]
+    columns = [column for column in columns if column[0] == "rss" or column[0] == sort or (column[0] == "cpu" and sort == "io")]
+    for key, title, _ in columns:
+        table.add_column(title, justify="right", style="bold yellow" if key == sort else "white", no_wrap=True)
+
+    for record in top:
+        values = [fmt(record[key]) for key, _, fmt in columns]
+        table.add_row(str(record["pid"]), record["name"], record["user"], *values)
+
+    console.print(table)
+    console.print(f"[dim]⏱ Собрано за {elapsed:.2f} с[/dim]")
+    console.print("")
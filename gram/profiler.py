@@ -0,0 +1,246 @@
+"""Профилирование CPU: cProfile или выборка стеков"""
+import cProfile
+import os
+import pstats
+import runpy
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from gram import runner
+from gram.runner import Target, TargetError
+from gram.units import parse_duration
+
+console = Console()
+
+DEFAULT_TOP = 20
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MIN_SAMPLE_INTERVAL = 0.001
+# Пути из графа вызовов дешевле этой доли собственного времени функции не разворачиваются
+MIN_STACK_SHARE = 0.001
+MAX_STACK_DEPTH = 64
+EXEC_KEY = ("~", 0, "<built-in method builtins.exec>")
+# Под 3.11+ runpy заморожен, и у его кадров вместо пути "<frozen runpy>"
+SKIP_FILES = {runpy.__file__, "<frozen runpy>", runner.__file__, __file__}
+
+
+def frame_key(code) -> tuple:
+    """Тот же ключ, что у pstats: (файл, строка определения, имя)."""
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def short_path(filename: str) -> str:
+    relative = os.path.relpath(filename) if os.path.isabs(filename) else filename
+    if not relative.startswith(".."):
+        return relative
+    parts = Path(filename).parts
+    return "/".join(parts[-2:])
+
+
+def location(key) -> str:
+    filename, line, _ = key
+    return f"{short_path(filename)}:{line}"
+
+
+def frame_label(key) -> str:
+    """Имя кадра для collapsed-стеков: без ';' — это разделитель кадров."""
+    filename, _, name = key
+    label = name if filename == "~" else f"{name} ({location(key)})"
+    return label.replace(";", ",")
+
+
+def write_collapsed(path: Path, stacks: Counter) -> int:
+    """Формат flamegraph.pl / speedscope / inferno: "кадр;кадр;кадр вес" на строку."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [f"{';'.join(frame_label(key) for key in stack)} {weight}" for stack, weight in stacks.most_common() if stack and weight > 0]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return len(lines)
+
+
+class StackSampler:
+    """Выборка стека главного потока: по SIGPROF (процессорное время) там, где есть setitimer,
+    иначе из фонового потока через sys._current_frames() (реальное время)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        self.stop_code = Target.execute.__code__
+        self._previous = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self._main = threading.main_thread().ident
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None and frame.f_code is not self.stop_code:
+            if frame.f_code.co_filename not in SKIP_FILES:
+                stack.append(frame_key(frame.f_code))
+            frame = frame.f_back
+        # Кадр вне цели (gram до запуска или после) — выборку не считаем
+        if frame is not None and stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _poll(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._main)
+            self._record(frame)
+
+    def start(self):
+        if self.use_signal:
+            self._previous = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self.use_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous)
+        else:
+            self._stopped.set()
+            self._thread.join()
+
+
+def _skipped_keys(stats: dict) -> set:
+    """Кадры gram и runpy вокруг цели и всё, что вызывается только из них (поиск и компиляция скрипта)."""
+    skipped = {key for key in stats if key[0] in SKIP_FILES or key[2] == "<method 'disable' of '_lsprof.Profiler' objects>"}
+    entries = {EXEC_KEY, frame_key(Target.execute.__code__)}
+    changed = True
+    while changed:
+        changed = False
+        for key, (*_, callers) in stats.items():
+            if key not in skipped and callers and not entries & callers.keys() and all(caller in skipped for caller in callers):
+                skipped.add(key)
+                changed = True
+    return skipped
+
+
+def collapse_profile(stats: dict, skipped: set) -> Counter:
+    """Стеки из графа вызовов cProfile (вес — микросекунды). Собственное время функции делится между
+    вызывающими пропорционально накопленному времени по каждому ребру: это приближение,
+    точные стеки даёт режим --sample."""
+    stacks = Counter()
+
+    def expand(key, weight, seen, threshold):
+        callers = [(caller, edge[3]) for caller, edge in stats[key][4].items() if caller in stats and caller not in skipped and caller not in seen]
+        edges_total = sum(time_spent for _, time_spent in callers)
+        if edges_total <= 0 or len(seen) >= MAX_STACK_DEPTH:
+            yield (key,), weight
+            return
+        for caller, time_spent in callers:
+            part = weight * time_spent / edges_total
+            if part >= threshold:
+                for stack, stack_weight in expand(caller, part, seen | {caller}, threshold):
+                    yield stack + (key,), stack_weight
+
+    for key, (_, _, own, _, _) in stats.items():
+        if own > 0 and key not in skipped:
+            for stack, weight in expand(key, own, {key}, own * MIN_STACK_SHARE):
+                stacks[stack] += round(weight * 1_000_000)
+    return stacks
+
+
+def _function_table(title: str, rows: list, columns: list) -> Table:
+    table = Table(title=title, show_header=True)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("⚙️ Функция", style="bold white")
+    for name, style in columns:
+        table.add_column(name, justify="right", style=style, no_wrap=True)
+    for i, (key, *values) in enumerate(rows, 1):
+        where = "" if key[0] == "~" else f"\n[dim]{location(key)}[/dim]"
+        table.add_row(str(i), f"{key[2]}{where}", *values)
+    return table
+
+
+def _show_profile_tables(stats: dict, skipped: set, elapsed: float, top: int):
+    rows = [(key, calls, own, cumulative) for key, (_, calls, own, cumulative, _) in stats.items() if key not in skipped]
+    columns = [("📞 Вызовов", "cyan"), ("⏱ Собственное", "bold yellow"), ("📚 Накопленное", "bold green")]
+
+    def format_row(key, calls, own, cumulative):
+        return (key, f"{calls:,}", f"{own:.3f} с [dim]{own / elapsed * 100:4.1f}%[/dim]", f"{cumulative:.3f} с [dim]{cumulative / elapsed * 100:5.1f}%[/dim]")
+
+    for title, column in (("🔥 По собственному времени", 2), ("📚 По накопленному времени", 3)):
+        ranked = sorted(rows, key=lambda row: row[column], reverse=True)[:top]
+        console.print(_function_table(title, [format_row(*row) for row in ranked], columns))
+        console.print("")
+
+
+def _show_sample_tables(sampler: StackSampler, top: int):
+    own, cumulative = Counter(), Counter()
+    for stack, count in sampler.stacks.items():
+        own[stack[-1]] += count
+        # Рекурсивная функция считается в выборке один раз
+        for key in set(stack):
+            cumulative[key] += count
+    columns = [("🎯 Выборок", "cyan"), ("%", "bold yellow"), ("≈ Время", "dim")]
+
+    for title, counter in (("🔥 По собственному времени", own), ("📚 По накопленному времени", cumulative)):
+        rows = [(key, f"{count:,}", f"{count / sampler.samples * 100:.1f}", f"{count * sampler.interval:.3f} с") for key, count in counter.most_common(top)]
+        console.print(_function_table(title, rows, columns))
+        console.print("")
+
+
+def run_profile(argv: list, sample: bool = False, interval=None, top: int = None, output_path: str = None):
+    try:
+        target = Target(argv, "--profile")
+        interval = max(MIN_SAMPLE_INTERVAL, parse_duration(interval) if interval else DEFAULT_SAMPLE_INTERVAL)
+    except (TargetError, ValueError) as e:
+        console.print(Panel(f"[bold red]❌ {e}[/bold red]", title="🚫 Ошибка", border_style="red"))
+        return
+    top = top or DEFAULT_TOP
+    output = Path(output_path or f"{target.stem}.folded")
+
+    if sample:
+        profiler = StackSampler(interval)
+        clock = "процессорное время, SIGPROF" if profiler.use_signal else "реальное время, фоновый поток"
+        mode = f"выборка стеков каждые {interval * 1000:g} мс ({clock})"
+    else:
+        profiler = cProfile.Profile()
+        mode = "cProfile (все вызовы)"
+    console.print(Panel(f"[bold cyan]🔬 {target.title}[/bold cyan]\n[dim]Режим: {mode} • Ctrl+C — остановить цель и показать результат[/dim]", title="⏱️ Профилирование", border_style="bright_blue"))
+    console.print("")
+
+    started = time.perf_counter()
+    if sample:
+        status = target.run(profiler.start, profiler.stop)
+    else:
+        status = target.run(profiler.enable, profiler.disable)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    console.print("")
+    if sample:
+        if not profiler.samples:
+            console.print(Panel(f"[bold yellow]📭 Ни одной выборки за {elapsed:.3f} с[/bold yellow]\n[dim]Цель отработала быстрее интервала или ждала ввода-вывода — уменьшите --interval или используйте cProfile[/dim]", title="⏱️ Профилирование", border_style="yellow"))
+            return
+        _show_sample_tables(profiler, top)
+        stacks = profiler.stacks
+        weight = "выборки"
+    else:
+        stats = pstats.Stats(profiler).stats
+        skipped = _skipped_keys(stats)
+        _show_profile_tables(stats, skipped, elapsed, top)
+        stacks = collapse_profile(stats, skipped)
+        weight = "микросекунды"
+
+    try:
+        written = write_collapsed(output, stacks)
+        saved = f"[green]💾 Стеки ({written:,} строк, вес — {weight}): {output}[/green]\n[dim]flamegraph.pl {output} > flame.svg • или откройте файл в speedscope.app[/dim]"
+    except OSError as e:
+        saved = f"[red]❌ Не удалось записать {output}: {e}[/red]"
+    color = "green" if status == "завершено" else "yellow"
+    console.print(Panel(f"[bold {color}]🏁 Цель: {status} за {elapsed:.3f} с[/bold {color}]\n{saved}", title="🎯 Итог", border_style=color))
+    console.print("")
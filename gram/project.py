@@ -4,18 +4,24 @@ from rich.panel import Panel
 
 console = Console()
 
-def create_project(project_name: str):
+def create_project(project_name: str, overrides=None):
     project_name = project_name.lower()
     
     if project_name != "fastapi":
+        from gram.scaffold import available_templates, create_from_template, show_templates
+        
+        if project_name in available_templates():
+            create_from_template(project_name, overrides)
+            return
+        
         error_panel = Panel(
-            "[red bold]❌ Ошибка: поддерживается только 'fastapi'![/red bold]\n\n"
-            "[yellow]Доступные проекты:[/yellow]\n"
-            "[bold]fastapi[/bold] - Современный веб-фреймворк 🚀",
+            f"[red bold]❌ Ошибка: шаблон '{project_name}' не найден![/red bold]\n\n"
+            "[yellow]Доступные проекты перечислены ниже[/yellow]",
             title="🚫 Неподдерживаемый проект",
             border_style="red"
         )
         console.print(error_panel)
+        show_templates()
         return
 
     cwd = Path.cwd()
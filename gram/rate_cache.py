@@ -0,0 +1,107 @@
+"""Кэш курсов валют"""
+import threading
+import time
+
+from gram.rates import fetch_all
+from gram.rate_history import record_snapshot
+from gram.storage import get_data_dir, read_json, write_json
+
+DEFAULT_TTL = {"fiat": 3600, "crypto": 120}
+
+_refreshes = []
+
+
+def load_snapshot(name: str):
+    return read_json(get_data_dir("rates") / f"{name}.json")
+
+
+def store_snapshot(name: str, data, fetched_at: float = None):
+    """Сохраняет снимок; прошлые данные остаются в "previous" для расчёта изменений."""
+    snapshot = {"fetched_at": fetched_at or time.time(), "data": data}
+    old = load_snapshot(name)
+    if old is not None:
+        snapshot["previous"] = old["data"] if old["data"] != data else old.get("previous")
+    write_json(get_data_dir("rates") / f"{name}.json", snapshot)
+    try:
+        record_snapshot(name, data, snapshot["fetched_at"])
+    except OSError:
+        pass
+    return snapshot
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "только что"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} мин назад"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} ч назад"
+    return f"{int(seconds // 86400)} дн назад"
+
+
+def _refresh(providers):
+    for name, data in fetch_all(providers).items():
+        if data is not None:
+            store_snapshot(name, data)
+
+
+def get_rates(providers: list, ttl: dict = None) -> dict:
+    """Курсы по каждому источнику: {"data", "fetched_at", "source"}.
+
+    source: "live" — только что загружены, "cache" — свежий снимок, "stale" — устаревший
+    снимок (обновление идёт в фоне), "offline" — сеть недоступна, показан последний снимок.
+    Источник без данных даёт None.
+    """
+    ttl = {**DEFAULT_TTL, **(ttl or {})}
+    now = time.time()
+    result = {}
+    missing = []
+    stale = []
+    previous = {}
+
+    for provider in providers:
+        snapshot = load_snapshot(provider.name)
+        if snapshot is None or not provider.covers(snapshot["data"]):
+            missing.append(provider)
+            previous[provider.name] = snapshot
+            continue
+        age = now - snapshot["fetched_at"]
+        if age <= ttl.get(provider.name, 0):
+            result[provider.name] = {**snapshot, "source": "cache"}
+        else:
+            result[provider.name] = {**snapshot, "source": "stale"}
+            stale.append(provider)
+
+    if stale:
+        thread = threading.Thread(target=_refresh, args=(stale,), daemon=True, name="gram-rates-refresh")
+        thread.start()
+        _refreshes.append(thread)
+
+    if missing:
+        for name, data in fetch_all(missing).items():
+            if data is not None:
+                result[name] = {**store_snapshot(name, data), "source": "live"}
+            elif previous[name] is not None:
+                result[name] = {**previous[name], "source": "offline"}
+            else:
+                result[name] = None
+
+    return result
+
+
+def get_rates_offline(providers: list) -> dict:
+    result = {}
+    for provider in providers:
+        snapshot = load_snapshot(provider.name)
+        result[provider.name] = {**snapshot, "source": "offline"} if snapshot else None
+    return result
+
+
+def wait_for_refresh(timeout: float = 3.0) -> bool:
+    """Даёт фоновому обновлению шанс сохранить снимок до выхода. True, если всё завершено."""
+    deadline = time.monotonic() + timeout
+    for thread in list(_refreshes):
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if not thread.is_alive():
+            _refreshes.remove(thread)
+    return not _refreshes
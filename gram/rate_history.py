@@ -0,0 +1,193 @@
+"""История курсов"""
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from gram.storage import get_data_dir, read_json, write_json
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Запись: время (float64), id символа (uint32), цена в USD (float64) — 20 байт
+RECORD = struct.Struct("<dId")
+COMPACT_AFTER = 7 * 86400
+COMPACT_BUCKET = 3600
+ALIASES = {"BTC": "bitcoin", "ETH": "ethereum", "SOL": "solana", "TON": "the-open-network", "USDT": "tether", "BNB": "binancecoin", "XRP": "ripple", "DOGE": "dogecoin"}
+
+
+def history_dir() -> Path:
+    return get_data_dir("history")
+
+
+def resolve_symbol(name: str) -> str:
+    upper = name.strip().upper()
+    if upper in ALIASES:
+        return ALIASES[upper]
+    return upper if len(upper) == 3 and upper.isalpha() else name.strip().lower()
+
+
+class _Lock:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self):
+        self.handle = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+        self.handle.close()
+
+
+class _Timestamps:
+    """Последовательность времён записей прямо поверх mmap — для bisect без загрузки файла."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def __len__(self):
+        return len(self.buffer) // RECORD.size
+
+    def __getitem__(self, index):
+        return RECORD.unpack_from(self.buffer, index * RECORD.size)[0]
+
+
+class RateHistory:
+    """Append-only временной ряд курсов в файле записей фиксированной ширины.
+
+    Записи идут по возрастанию времени, поэтому сам файл служит индексом по
+    времени: границы диапазона находятся бинарным поиском по mmap.
+    """
+
+    def __init__(self, directory: Path = None):
+        self.directory = Path(directory) if directory else history_dir()
+        self.data_path = self.directory / "rates.bin"
+        self.symbols_path = self.directory / "symbols.json"
+        self.lock_path = self.directory / ".lock"
+        self.symbols = read_json(self.symbols_path, []) or []
+        self.ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self.ids:
+            self.ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self.ids[symbol]
+
+    def append(self, prices: dict, timestamp: float = None):
+        """prices: символ → цена в USD."""
+        timestamp = timestamp or time.time()
+        with _Lock(self.lock_path):
+            # Другой процесс мог добавить символы, перечитываем под блокировкой
+            self.symbols = read_json(self.symbols_path, []) or []
+            self.ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+            known = len(self.symbols)
+
+            last = self._last_timestamp()
+            timestamp = max(timestamp, last)
+            payload = b"".join(RECORD.pack(timestamp, self._symbol_id(symbol), float(price)) for symbol, price in prices.items() if price)
+            if len(self.symbols) != known:
+                write_json(self.symbols_path, self.symbols)
+            # Хвост недописанной при сбое записи отрезается, иначе все следующие записи сдвинутся
+            with open(self.data_path, "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % RECORD.size:
+                    f.truncate(size - size % RECORD.size)
+                f.write(payload)
+
+    def _last_timestamp(self) -> float:
+        try:
+            with open(self.data_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell() - f.tell() % RECORD.size
+                if size == 0:
+                    return 0.0
+                f.seek(size - RECORD.size)
+                return RECORD.unpack(f.read(RECORD.size))[0]
+        except OSError:
+            return 0.0
+
+    def query(self, symbols: list, since: float = None, until: float = None) -> dict:
+        """Точки (время, цена) по каждому символу в диапазоне [since, until]."""
+        wanted = {self.ids[symbol]: symbol for symbol in symbols if symbol in self.ids}
+        result = {symbol: [] for symbol in symbols}
+        if not wanted or not self.data_path.exists() or self.data_path.stat().st_size < RECORD.size:
+            return result
+
+        with open(self.data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            timestamps = _Timestamps(buffer)
+            start = bisect_left(timestamps, since) if since is not None else 0
+            stop = bisect_left(timestamps, until + 1e-9) if until is not None else len(timestamps)
+            for timestamp, symbol_id, price in RECORD.iter_unpack(buffer[start * RECORD.size:stop * RECORD.size]):
+                symbol = wanted.get(symbol_id)
+                if symbol is not None:
+                    result[symbol].append((timestamp, price))
+        return result
+
+    def compact(self, older_than: float = COMPACT_AFTER, bucket: float = COMPACT_BUCKET) -> tuple:
+        """Сворачивает записи старше older_than в среднее за bucket секунд. Возвращает (было, стало)."""
+        with _Lock(self.lock_path):
+            if not self.data_path.exists():
+                return 0, 0
+            raw = self.data_path.read_bytes()
+            raw = raw[:len(raw) - len(raw) % RECORD.size]
+            cutoff = time.time() - older_than
+            timestamps = _Timestamps(raw)
+            split = bisect_left(timestamps, cutoff)
+
+            buckets = {}
+            for timestamp, symbol_id, price in RECORD.iter_unpack(raw[:split * RECORD.size]):
+                key = (int(timestamp // bucket), symbol_id)
+                total, count = buckets.get(key, (0.0, 0))
+                buckets[key] = (total + price, count + 1)
+
+            compacted = b"".join(RECORD.pack(slot * bucket, symbol_id, total / count) for (slot, symbol_id), (total, count) in sorted(buckets.items()))
+            tmp_path = self.data_path.with_suffix(".tmp")
+            tmp_path.write_bytes(compacted + raw[split * RECORD.size:])
+            os.replace(tmp_path, self.data_path)
+            return len(timestamps), len(buckets) + len(timestamps) - split
+
+
+def record_snapshot(name: str, data, timestamp: float = None):
+    """Сохраняет снимок источника курсов в историю (цены в USD)."""
+    if not data:
+        return
+    if name == "fiat":
+        prices = {code: 1.0 / rate for code, rate in data.items() if rate}
+    elif name == "crypto":
+        prices = {coin_id: values.get("usd") for coin_id, values in data.items() if values}
+    else:
+        return
+    RateHistory().append(prices, timestamp)
+
+
+def summarize(points: list) -> dict:
+    prices = [price for _, price in points]
+    return {
+        "count": len(prices),
+        "first": prices[0],
+        "last": prices[-1],
+        "min": min(prices),
+        "max": max(prices),
+        "avg": sum(prices) / len(prices),
+        "change": (prices[-1] / prices[0] - 1) * 100 if prices[0] else 0.0,
+    }
+
+
+def sparkline(points: list, width: int = 24) -> str:
+    blocks = "▁▂▃▄▅▆▇█"
+    prices = [price for _, price in points]
+    if len(prices) > width:
+        step = len(prices) / width
+        prices = [prices[int(i * step)] for i in range(width)]
+    low, high = min(prices), max(prices)
+    if high == low:
+        return blocks[3] * len(prices)
+    return "".join(blocks[int((price - low) / (high - low) * (len(blocks) - 1))] for price in prices)
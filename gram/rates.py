@@ -0,0 +1,177 @@
+"""Источники курсов валют"""
+import os
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+FIAT_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+CRYPTO_URL = "https://api.coingecko.com/api/v3/simple/price"
+DEFAULT_TIMEOUT = 10
+# Соединение устанавливается быстро или не устанавливается вовсе: ждать его столько же, сколько ответа, незачем
+CONNECT_TIMEOUT = 3
+MAX_URL_LENGTH = 2000
+MAX_PARALLEL_BATCHES = 3
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Общая сессия с пулом соединений и повторами для всех источников.
+
+    Повторяется только неудавшееся соединение, один раз: медленный ответ и 429/5xx повтор не ускорит,
+    а при сбое источника показываются курсы из кэша. Худший случай на источник —
+    2 × CONNECT_TIMEOUT + DEFAULT_TIMEOUT = 16 с, источники опрашиваются параллельно.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=1, connect=1, read=0, status=0, other=0, backoff_factor=0.5, allowed_methods=frozenset(["GET"]))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "gram-cli"
+            _session = session
+        return _session
+
+
+class RateProvider:
+    name = "base"
+
+    def __init__(self, url: str):
+        self.url = url
+        self._validators = {}
+
+    def params(self):
+        return None
+
+    def parse(self, data):
+        return data
+
+    def covers(self, data) -> bool:
+        """Есть ли в сохранённых данных всё, что нужно этому источнику."""
+        return True
+
+    def get_json(self, session: requests.Session, params, timeout: float):
+        """GET с ETag/If-Modified-Since: на 304 возвращается тело предыдущего ответа."""
+        key = tuple(sorted(params.items())) if params else ()
+        cached = self._validators.get(key)
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = session.get(self.url, params=params, headers=headers, timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        response.raise_for_status()
+        body = response.json()
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validators[key] = {"etag": etag, "last_modified": last_modified, "body": body}
+        return body
+
+    def fetch(self, session: requests.Session = None, timeout: float = DEFAULT_TIMEOUT):
+        session = session or get_session()
+        return self.parse(self.get_json(session, self.params(), timeout))
+
+
+class FiatProvider(RateProvider):
+    name = "fiat"
+
+    def __init__(self, url: str = None):
+        super().__init__(url or os.environ.get("GRAM_FIAT_URL", FIAT_URL))
+
+    def parse(self, data):
+        return data["rates"]
+
+
+class CryptoProvider(RateProvider):
+    name = "crypto"
+
+    def __init__(self, ids=("bitcoin", "ethereum"), url: str = None):
+        super().__init__(url or os.environ.get("GRAM_CRYPTO_URL", CRYPTO_URL))
+        self.ids = list(dict.fromkeys(ids))
+
+    def params(self, ids=None):
+        return {"ids": ",".join(self.ids if ids is None else ids), "vs_currencies": "usd", "include_24hr_change": "true"}
+
+    def covers(self, data) -> bool:
+        return all(coin_id in data for coin_id in self.ids)
+
+    def batches(self) -> list:
+        """Делит ids на минимум запросов, чтобы URL не превышал MAX_URL_LENGTH."""
+        fixed = len(self.url) + 1 + len(urlencode(self.params([])))
+        batches, current, length = [], [], fixed
+        for coin_id in self.ids:
+            # "%2C" — закодированная запятая между id
+            extra = len(coin_id) + (3 if current else 0)
+            if current and length + extra > MAX_URL_LENGTH:
+                batches.append(current)
+                current, length = [], fixed
+                extra = len(coin_id)
+            current.append(coin_id)
+            length += extra
+        if current:
+            batches.append(current)
+        return batches
+
+    def fetch(self, session: requests.Session = None, timeout: float = DEFAULT_TIMEOUT):
+        session = session or get_session()
+        batches = self.batches()
+
+        def fetch_batch(ids):
+            return self.get_json(session, self.params(ids), timeout)
+
+        merged = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_BATCHES, len(batches)), thread_name_prefix="gram-crypto") as executor:
+            futures = [executor.submit(fetch_batch, ids) for ids in batches]
+            for future in futures:
+                try:
+                    merged.update(future.result())
+                except (requests.RequestException, ValueError) as e:
+                    errors.append(e)
+        if not merged and errors:
+            raise errors[0]
+        if not errors:
+            # Неизвестные CoinGecko id запоминаются пустыми, чтобы не перезапрашивать их каждый раз
+            for coin_id in self.ids:
+                merged.setdefault(coin_id, {})
+        return merged
+
+
+def fetch_all(providers: list, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """Опрашивает источники параллельно; упавший источник даёт None, а не исключение."""
+    session = get_session()
+
+    def fetch(provider):
+        try:
+            return provider.fetch(session, timeout)
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, len(providers)), thread_name_prefix="gram-rates") as executor:
+        results = list(executor.map(fetch, providers))
+    return {provider.name: result for provider, result in zip(providers, results)}
+
+
+def conversion_matrix(usd_prices, base_rates):
+    """Стоимость каждого актива в каждой базовой валюте: matrix[i][j] = usd_prices[i] * base_rates[j].
+
+    Все ячейки считаются одним генератором по product() в плоский array('d');
+    строки — срезы memoryview по этому массиву, без копирования.
+    """
+    width = len(base_rates)
+    flat = memoryview(array("d", (price * rate for price, rate in product(usd_prices, base_rates))))
+    return [flat[i * width:(i + 1) * width] for i in range(len(usd_prices))]
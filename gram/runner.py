@@ -0,0 +1,76 @@
+"""Запуск скрипта внутри процесса gram (--profile, --mem)"""
+import runpy
+import sys
+import traceback
+from pathlib import Path
+
+
+class TargetError(Exception):
+    pass
+
+
+class Target:
+    """Что запускать: script.py [аргументы], -m модуль [аргументы] или сам gram [команда]."""
+
+    def __init__(self, argv: list, command: str = "--profile"):
+        if not argv:
+            raise TargetError(f"Укажите, что запускать: gram {command} script.py [аргументы] | -m модуль | gram --info .")
+        self.kind = "script"
+        if argv[0] == "-m":
+            if len(argv) < 2:
+                raise TargetError("После -m нужно имя модуля")
+            self.kind, self.name, self.argv = "module", argv[1], [argv[1], *argv[2:]]
+        elif argv[0] == "gram":
+            # Путь с таким именем можно передать как ./gram
+            self.kind, self.name, self.argv = "gram", "gram", ["gram", *argv[1:]]
+        else:
+            path = Path(argv[0])
+            if not path.exists():
+                raise TargetError(f"Файл не найден: {path}")
+            self.name, self.argv = str(path), [str(path), *argv[1:]]
+        self.title = " ".join([("-m " if self.kind == "module" else "") + self.name, *self.argv[1:]])
+        self.stem = Path(self.name).stem if self.kind == "script" else self.name.replace(".", "_")
+
+    def execute(self):
+        """Точка входа цели. Профилировщики отрезают стек ниже этого кадра.
+        Возвращает глобальные переменные цели: иначе они освобождаются до того, как замер остановлен."""
+        if self.kind == "module":
+            return runpy.run_module(self.name, run_name="__main__", alter_sys=True)
+        if self.kind == "gram":
+            from gram.cli import main
+            main()
+            return None
+        return runpy.run_path(self.name, run_name="__main__")
+
+    def run(self, start=None, stop=None) -> str:
+        """Выполняет цель как `python script.py`: свои sys.argv и sys.path, SystemExit не завершает gram.
+        start/stop вызываются вплотную к запуску, чтобы замер не включал подготовку. Возвращает итог."""
+        old_argv, old_path = sys.argv[:], sys.path[:]
+        sys.argv = self.argv[:]
+        if self.kind == "script":
+            sys.path.insert(0, str(Path(self.name).resolve().parent))
+        status = "завершено"
+        namespace = None
+        try:
+            if start:
+                start()
+            try:
+                namespace = self.execute()
+            finally:
+                # Объекты уровня модуля цели живы, пока stop() делает последний замер
+                if stop:
+                    stop()
+                namespace = None
+        except SystemExit as e:
+            if isinstance(e.code, int) and e.code:
+                status = f"код выхода {e.code}"
+            elif e.code not in (None, 0):
+                status = f"выход с ошибкой: {e.code}"
+        except KeyboardInterrupt:
+            status = "прервано (Ctrl+C)"
+        except Exception as e:
+            traceback.print_exc()
+            status = f"исключение {type(e).__name__}: {e}"
+        finally:
+            sys.argv, sys.path[:] = old_argv, old_path
+        return status
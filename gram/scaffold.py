@@ -0,0 +1,172 @@
+"""Шаблоны проектов"""
+from importlib.resources import files
+from pathlib import Path
+from string import Template
+
+import toml
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+console = Console()
+
+TEMPLATE_SUFFIX = ".tmpl"
+MANIFEST = "template.toml"
+
+
+class TemplateError(Exception):
+    pass
+
+
+def templates_root():
+    return files("gram") / "templates"
+
+
+def available_templates() -> dict:
+    """Имя шаблона → манифест. Шаблоны лежат в пакете как обычные файлы (package data)."""
+    root = templates_root()
+    if not root.is_dir():
+        return {}
+    result = {}
+    for entry in root.iterdir():
+        manifest = entry / MANIFEST
+        if entry.is_dir() and manifest.is_file():
+            result[entry.name] = toml.loads(manifest.read_text(encoding="utf-8"))
+    return dict(sorted(result.items()))
+
+
+def parse_overrides(pairs) -> dict:
+    """["db=sqlite", "cache=redis"] → {"db": "sqlite", "cache": "redis"}."""
+    overrides = {}
+    for pair in pairs or []:
+        for item in pair.split(","):
+            if not item.strip():
+                continue
+            key, sep, value = item.partition("=")
+            if not sep or not key.strip():
+                raise TemplateError(f"Ожидается параметр=значение, получено: {item!r}")
+            overrides[key.strip().lower()] = value.strip()
+    return overrides
+
+
+def resolve_params(manifest: dict, overrides: dict) -> dict:
+    """Значения параметров с учётом умолчаний и допустимых вариантов + производные ключи контекста."""
+    params = manifest.get("params", {})
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise TemplateError(f"Неизвестные параметры: {', '.join(sorted(unknown))}. Доступны: {', '.join(params)}")
+
+    context = {}
+    for name, spec in params.items():
+        value = overrides.get(name, spec.get("default", ""))
+        choices = spec.get("choices")
+        if choices and value not in choices:
+            raise TemplateError(f"{name}={value}: допустимо {', '.join(choices)}")
+        context[name] = value
+        # Значения, зависящие от выбранного варианта: [params.db.values.postgres] requirements = ...
+        for key, derived in spec.get("values", {}).get(value, {}).items():
+            context[f"{name}_{key}"] = derived
+    return context
+
+
+def _walk(node, prefix=()):
+    for entry in node.iterdir():
+        if entry.is_dir():
+            yield from _walk(entry, prefix + (entry.name,))
+        else:
+            yield prefix + (entry.name,), entry
+
+
+def plan_files(name: str, manifest: dict, context: dict) -> dict:
+    """Относительный путь → исходный файл: base/ и поверх него слои <параметр>/<значение>/."""
+    template = templates_root() / name
+    layers = [template / "base"]
+    for param in manifest.get("params", {}):
+        layers.append(template / param / context[param])
+
+    plan = {}
+    for layer in layers:
+        if layer.is_dir():
+            for parts, source in _walk(layer):
+                plan["/".join(parts)] = source
+    return plan
+
+
+def render_file(source, context: dict) -> str:
+    text = source.read_text(encoding="utf-8")
+    if not source.name.endswith(TEMPLATE_SUFFIX):
+        return text
+    try:
+        return Template(text).substitute(context)
+    except (KeyError, ValueError) as e:
+        raise TemplateError(f"{source.name}: неизвестная подстановка {e}")
+
+
+def render_template(name: str, target: Path, overrides: dict) -> list:
+    templates = available_templates()
+    if name not in templates:
+        raise TemplateError(f"Шаблон {name!r} не найден")
+    manifest = templates[name]
+    context = {"project_name": target.name, **resolve_params(manifest, overrides)}
+
+    # Сначала рендерим всё в память: ошибка шаблона не оставит полупустой проект
+    rendered = []
+    for relative, source in sorted(plan_files(name, manifest, context).items()):
+        if relative.endswith(TEMPLATE_SUFFIX):
+            relative = relative[:-len(TEMPLATE_SUFFIX)]
+        rendered.append((relative, render_file(source, context)))
+
+    written = []
+    for relative, content in rendered:
+        path = target / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        written.append(relative)
+    return written
+
+
+def show_templates():
+    table = Table(title="📦 Шаблоны проектов", show_header=True)
+    table.add_column("🚀 Шаблон", style="bold cyan", no_wrap=True)
+    table.add_column("📖 Описание", style="white")
+    table.add_column("⚙️ Параметры (--set имя=значение)", style="dim")
+    table.add_row("fastapi", "Минимальная структура FastAPI проекта", "—")
+    for name, manifest in available_templates().items():
+        params = [f"{param}={'|'.join(spec['choices']) if spec.get('choices') else spec.get('default', '')}" for param, spec in manifest.get("params", {}).items()]
+        table.add_row(name, manifest.get("description", ""), "\n".join(params) or "—")
+    console.print(table)
+    console.print("")
+
+
+def create_from_template(name: str, overrides=None):
+    templates = available_templates()
+    manifest = templates.get(name, {})
+    target = Path.cwd() / manifest.get("directory", name.replace("-", "_") + "_project")
+
+    if target.exists() and any(target.iterdir()):
+        console.print(Panel(f"[red bold]❌ Папка {target.name} уже существует и не пуста[/red bold]", title="🚫 Ошибка", border_style="red"))
+        return
+
+    try:
+        overrides = parse_overrides(overrides)
+        console.print(f"\n[bold cyan]🔨 🚀 Создаю проект {name} в папке '{target.name}'...[/bold cyan]\n")
+        written = render_template(name, target, overrides)
+    except TemplateError as e:
+        console.print(Panel(f"[red bold]❌ {e}[/red bold]", title="🚫 Ошибка шаблона", border_style="red"))
+        return
+
+    for i, relative in enumerate(written, 1):
+        console.print(f"[dim]  {i:2d}/{len(written)}[/dim] 📄 [bold blue]Создан файл:[/bold blue] {relative}")
+
+    context = resolve_params(manifest, overrides)
+    params = ", ".join(f"{param}={context[param]}" for param in manifest.get("params", {}))
+    console.print("\n")
+    console.print(Panel(
+        f"[bold bright_green]🎉 Проект {name} успешно создан![/bold bright_green]\n"
+        f"[cyan]📍 Расположение:[/cyan] [yellow]{target}[/yellow]\n"
+        f"[cyan]⚙️  Параметры:[/cyan] [green]{params}[/green]\n"
+        f"[cyan]🏗️  Создано:[/cyan] [blue]{len(written)} файлов[/blue]",
+        title="🚀 Проект готов!",
+        border_style="bright_green"))
+    if manifest.get("next_steps"):
+        console.print(f"\n[dim]💡 {manifest['next_steps']}[/dim]\n")
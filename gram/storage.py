@@ -0,0 +1,41 @@
+"""Локальное хранилище gram"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def get_data_dir(*parts) -> Path:
+    base = os.environ.get("GRAM_HOME")
+    root = Path(base) if base else Path.home() / ".cache" / "gram"
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_json(path: Path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def get_config_dir() -> Path:
+    base = os.environ.get("GRAM_CONFIG")
+    return Path(base) if base else Path.home() / ".config" / "gram"
@@ -1,5 +1,8 @@
 
 import platform
+import queue
+import threading
+import time
 import socket
 import os
 import sys
@@ -11,10 +14,17 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 console = Console()
 
-def get_system_info():
-    info_data = {}
-    
-    info_data["os"] = {
+# Минимальное окно между двумя замерами CPU: короче — показания слишком шумные
+CPU_SAMPLE_WINDOW = 0.1
+# Сколько ждать каждый раздел с начала сбора; не успевший раздел заменяется заглушкой
+DEFAULT_SECTION_TIMEOUT = 1.5
+SECTION_TIMEOUTS = {"network": 2.0, "partitions": 2.0, "sensors": 2.0}
+
+def _format_gb(size):
+    return f"{size // (1024**3)} GB"
+
+def _collect_os():
+    return {
         "name": platform.system(),
         "version": platform.version(),
         "architecture": platform.architecture()[0],
@@ -22,66 +32,176 @@ def get_system_info():
         "processor": platform.processor(),
         "platform": platform.platform()
     }
-    
-    info_data["python"] = {
+
+def _collect_python():
+    return {
         "version": sys.version,
         "version_info": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
         "executable": sys.executable,
         "path": sys.path[0] if sys.path else "Unknown"
     }
-    
-    try:
-        hostname = socket.gethostname()
-        local_ip = socket.gethostbyname(hostname)
-        info_data["network"] = {
-            "hostname": hostname,
-            "local_ip": local_ip,
-            "fqdn": socket.getfqdn()
-        }
-    except:
-        info_data["network"] = {"error": "Не удалось получить информацию о сети"}
-    
-    try:
-        import shutil
-        total, used, free = shutil.disk_usage("/")
-        info_data["disks"] = {
-            "total": f"{total // (1024**3)} GB",
-            "used": f"{used // (1024**3)} GB", 
-            "free": f"{free // (1024**3)} GB",
-            "usage_percent": f"{(used / total * 100):.1f}%"
-        }
-    except:
-        info_data["disks"] = {"error": "Не удалось получить информацию о дисках"}
-    
+
+def _collect_network():
+    # gethostbyname и getfqdn ходят в DNS и на сломанном резолвере висят секундами
+    hostname = socket.gethostname()
+    return {
+        "hostname": hostname,
+        "local_ip": socket.gethostbyname(hostname),
+        "fqdn": socket.getfqdn()
+    }
+
+def _collect_disks():
+    import shutil
+    total, used, free = shutil.disk_usage("/")
+    return {
+        "total": _format_gb(total),
+        "used": _format_gb(used),
+        "free": _format_gb(free),
+        "usage_percent": f"{(used / total * 100):.1f}%"
+    }
+
+def _collect_partitions():
+    import psutil
+    partitions = []
+    for partition in psutil.disk_partitions(all=False):
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except OSError:
+            continue
+        partitions.append({
+            "device": partition.device,
+            "mountpoint": partition.mountpoint,
+            "fstype": partition.fstype,
+            "total": _format_gb(usage.total),
+            "free": _format_gb(usage.free),
+            "usage_percent": f"{usage.percent:.1f}%"
+        })
+    return {"partitions": partitions}
+
+def _collect_interfaces():
+    import psutil
+    stats = psutil.net_if_stats()
+    interfaces = []
+    for name, addresses in psutil.net_if_addrs().items():
+        ipv4 = [address.address for address in addresses if address.family == socket.AF_INET]
+        ipv6 = [address.address for address in addresses if address.family == getattr(socket, "AF_INET6", None)]
+        stat = stats.get(name)
+        interfaces.append({
+            "name": name,
+            "is_up": bool(stat and stat.isup),
+            "speed": f"{stat.speed} Mbit/s" if stat and stat.speed else "—",
+            "address": (ipv4 or ipv6 or ["—"])[0]
+        })
+    return {"interfaces": interfaces}
+
+def _collect_memory():
+    import psutil
+    memory = psutil.virtual_memory()
+    return {
+        "total": _format_gb(memory.total),
+        "available": _format_gb(memory.available),
+        "used": _format_gb(memory.used),
+        "percent": f"{memory.percent:.1f}%"
+    }
+
+def _collect_cpu(cpu_sample_start):
+    import psutil
+    cpu_count = psutil.cpu_count()
+    cpu_freq = psutil.cpu_freq()
+    remaining = CPU_SAMPLE_WINDOW - (time.monotonic() - cpu_sample_start)
+    if remaining > 0:
+        time.sleep(remaining)
+    return {
+        "cores": cpu_count,
+        "frequency": f"{cpu_freq.current:.0f} MHz" if cpu_freq else "Unknown",
+        "usage": f"{psutil.cpu_percent(interval=None):.1f}%"
+    }
+
+def _collect_sensors():
+    import psutil
+    temperatures = []
+    read_temperatures = getattr(psutil, "sensors_temperatures", None)
+    for chip, entries in (read_temperatures() if read_temperatures else {}).items():
+        for entry in entries:
+            temperatures.append({
+                "label": f"{chip} {entry.label}".strip(),
+                "current": entry.current,
+                "high": entry.high
+            })
+    read_battery = getattr(psutil, "sensors_battery", None)
+    battery = read_battery() if read_battery else None
+    return {
+        "temperatures": temperatures,
+        "battery": {
+            "percent": f"{battery.percent:.0f}%",
+            "plugged": battery.power_plugged,
+            "left": None if battery.secsleft in (psutil.POWER_TIME_UNLIMITED, psutil.POWER_TIME_UNKNOWN) else f"{battery.secsleft // 3600} ч {battery.secsleft % 3600 // 60} мин"
+        } if battery else None
+    }
+
+SECTION_ERRORS = {
+    "os": "Не удалось получить информацию об ОС",
+    "python": "Не удалось получить информацию о Python",
+    "network": "Не удалось получить информацию о сети",
+    "disks": "Не удалось получить информацию о дисках",
+    "partitions": "Не удалось получить список разделов",
+    "interfaces": "Не удалось получить сетевые интерфейсы",
+    "memory": "Не удалось получить информацию о памяти",
+    "cpu": "Не удалось получить информацию о процессоре",
+    "sensors": "Не удалось прочитать датчики"
+}
+
+def _run_section(name, collect, results):
     try:
-        import psutil
-        memory = psutil.virtual_memory()
-        info_data["memory"] = {
-            "total": f"{memory.total // (1024**3)} GB",
-            "available": f"{memory.available // (1024**3)} GB",
-            "used": f"{memory.used // (1024**3)} GB",
-            "percent": f"{memory.percent:.1f}%"
-        }
+        results.put((name, collect()))
     except ImportError:
-        info_data["memory"] = {"info": "Требуется модуль psutil для детальной информации"}
-    except:
-        info_data["memory"] = {"error": "Не удалось получить информацию о памяти"}
-    
+        results.put((name, {"info": "Требуется модуль psutil для детальной информации"}))
+    except Exception:
+        results.put((name, {"error": SECTION_ERRORS[name]}))
+
+def get_system_info():
+    # Первый замер CPU неблокирующий: загрузка считается по разнице счётчиков,
+    # пока собираются остальные разделы, вместо секундного cpu_percent(interval=1)
     try:
         import psutil
-        cpu_count = psutil.cpu_count()
-        cpu_freq = psutil.cpu_freq()
-        info_data["cpu"] = {
-            "cores": cpu_count,
-            "frequency": f"{cpu_freq.current:.0f} MHz" if cpu_freq else "Unknown",
-            "usage": f"{psutil.cpu_percent(interval=1):.1f}%"
-        }
+        psutil.cpu_percent(interval=None)
     except ImportError:
-        info_data["cpu"] = {"info": "Требуется модуль psutil для детальной информации"}
-    except:
-        info_data["cpu"] = {"error": "Не удалось получить информацию о процессоре"}
+        pass
+    started = time.monotonic()
+    
+    collectors = {
+        "os": _collect_os,
+        "python": _collect_python,
+        "network": _collect_network,
+        "disks": _collect_disks,
+        "partitions": _collect_partitions,
+        "interfaces": _collect_interfaces,
+        "memory": _collect_memory,
+        "cpu": lambda: _collect_cpu(started),
+        "sensors": _collect_sensors
+    }
     
-    return info_data
+    # Разделы собираются параллельно в daemon-потоках: зависший DNS или сетевой диск
+    # не держат ни команду, ни выход интерпретатора
+    results = queue.Queue()
+    for name, collect in collectors.items():
+        threading.Thread(target=_run_section, args=(name, collect, results), daemon=True, name=f"gram-info-{name}").start()
+    
+    deadlines = {name: started + SECTION_TIMEOUTS.get(name, DEFAULT_SECTION_TIMEOUT) for name in collectors}
+    info_data = {}
+    while len(info_data) < len(collectors):
+        pending = [name for name in collectors if name not in info_data]
+        wait = min(deadlines[name] for name in pending) - time.monotonic()
+        try:
+            name, section = results.get(timeout=max(0.0, wait))
+            info_data[name] = section
+        except queue.Empty:
+            now = time.monotonic()
+            for name in pending:
+                if deadlines[name] <= now:
+                    info_data[name] = {"timeout": f"Нет ответа за {SECTION_TIMEOUTS.get(name, DEFAULT_SECTION_TIMEOUT):g} с"}
+    
+    return {name: info_data[name] for name in collectors}
 
 def show_pc_info():
     console.print("\n[bold bright_cyan]💻 Собираю информацию о вашем ПК...[/bold bright_cyan]")
@@ -115,7 +235,9 @@ def show_pc_info():
     main_info_table.add_row("🐍 Python версия", python_info.get('version_info', 'Unknown'), "✅")
     main_info_table.add_row("🏗️ Архитектура", os_info.get('architecture', 'Unknown'), "✅")
     
-    if "error" not in network_info:
+    if "timeout" in network_info:
+        main_info_table.add_row("🌐 Сеть", network_info["timeout"], "⏳")
+    elif "error" not in network_info:
         main_info_table.add_row("🌐 Хостнейм", network_info.get('hostname', 'Unknown'), "✅")
         main_info_table.add_row("📡 IP адрес", network_info.get('local_ip', 'Unknown'), "✅")
     
@@ -131,15 +253,21 @@ def show_pc_info():
     memory_info = info_data.get("memory", {})
     disk_info = info_data.get("disks", {})
     
-    if "error" not in cpu_info:
+    if "timeout" in cpu_info:
+        perf_table.add_row("⚡ Процессор", cpu_info["timeout"], "⏳")
+    elif "error" not in cpu_info:
         perf_table.add_row("⚡ Процессор", f"{cpu_info.get('cores', 'Unknown')} ядер | {cpu_info.get('frequency', 'Unknown')}", f"[green]{cpu_info.get('usage', 'Unknown')}[/green]")
     
-    if "error" not in memory_info:
+    if "timeout" in memory_info:
+        perf_table.add_row("🧠 Оперативная память", memory_info["timeout"], "⏳")
+    elif "error" not in memory_info:
         memory_percent = float(memory_info.get('percent', '0').replace('%', ''))
         color = "green" if memory_percent < 80 else "yellow"
         perf_table.add_row("🧠 Оперативная память", f"{memory_info.get('total', 'Unknown')} | Используется {memory_info.get('used', 'Unknown')} ({memory_info.get('percent', 'Unknown')})", f"[{color}]{memory_info.get('percent', 'Unknown')}[/{color}]")
     
-    if "error" not in disk_info:
+    if "timeout" in disk_info:
+        perf_table.add_row("💾 Дисковое пространство", disk_info["timeout"], "⏳")
+    elif "error" not in disk_info:
         disk_percent = float(disk_info.get('usage_percent', '0').replace('%', ''))
         color = "green" if disk_percent < 80 else "yellow"
         perf_table.add_row("💾 Дисковое пространство", f"Общее: {disk_info.get('total', 'Unknown')} | Свободно: {disk_info.get('free', 'Unknown')}", f"[{color}]{disk_info.get('usage_percent', 'Unknown')}[/{color}]")
@@ -147,6 +275,53 @@ def show_pc_info():
     console.print(perf_table)
     console.print("")
     
+    partitions_info = info_data.get("partitions", {})
+    if partitions_info.get("partitions") or "timeout" in partitions_info:
+        partitions_table = Table(title="💽 Разделы", show_header=True)
+        partitions_table.add_column("📁 Раздел", style="bold cyan")
+        partitions_table.add_column("💾 Свободно", style="white", justify="right", no_wrap=True)
+        partitions_table.add_column("💡 Занято", style="dim", justify="right", no_wrap=True)
+        if "timeout" in partitions_info:
+            partitions_table.add_row("⏳", partitions_info["timeout"], "")
+        for partition in partitions_info.get("partitions", []):
+            percent = float(partition["usage_percent"].replace('%', ''))
+            color = "green" if percent < 80 else "yellow"
+            partitions_table.add_row(f"{partition['mountpoint']}\n[dim]{partition['device']} ({partition['fstype']})[/dim]", f"{partition['free']} / {partition['total']}", f"[{color}]{partition['usage_percent']}[/{color}]")
+        console.print(partitions_table)
+        console.print("")
+    
+    interfaces_info = info_data.get("interfaces", {})
+    if interfaces_info.get("interfaces") or "timeout" in interfaces_info:
+        interfaces_table = Table(title="🌐 Сетевые интерфейсы", show_header=True)
+        interfaces_table.add_column("🔌 Интерфейс", style="bold cyan", no_wrap=True)
+        interfaces_table.add_column("📡 Адрес", style="white")
+        interfaces_table.add_column("⚡ Скорость", style="white", justify="right")
+        interfaces_table.add_column("💡 Статус", style="dim")
+        if "timeout" in interfaces_info:
+            interfaces_table.add_row("⏳", interfaces_info["timeout"], "", "")
+        for interface in interfaces_info.get("interfaces", []):
+            interfaces_table.add_row(interface["name"], interface["address"], interface["speed"], "[green]up[/green]" if interface["is_up"] else "[dim]down[/dim]")
+        console.print(interfaces_table)
+        console.print("")
+    
+    sensors_info = info_data.get("sensors", {})
+    if sensors_info.get("temperatures") or sensors_info.get("battery") or "timeout" in sensors_info:
+        sensors_table = Table(title="🌡️ Датчики", show_header=True)
+        sensors_table.add_column("🔧 Датчик", style="bold yellow", no_wrap=True)
+        sensors_table.add_column("📊 Показание", style="white", justify="right")
+        sensors_table.add_column("💡 Статус", style="dim")
+        if "timeout" in sensors_info:
+            sensors_table.add_row("⏳", sensors_info["timeout"], "")
+        for sensor in sensors_info.get("temperatures", []):
+            hot = sensor["high"] and sensor["current"] >= sensor["high"]
+            sensors_table.add_row(f"🌡️ {sensor['label']}", f"{sensor['current']:.0f}°C", "[red]🔥 перегрев[/red]" if hot else "[green]✅[/green]")
+        battery = sensors_info.get("battery")
+        if battery:
+            state = "🔌 заряжается" if battery["plugged"] else f"🔋 осталось {battery['left']}" if battery["left"] else "🔋 от батареи"
+            sensors_table.add_row("🔋 Батарея", battery["percent"], state)
+        console.print(sensors_table)
+        console.print("")
+    
     details_panel = Panel(
         f"[bold cyan]📋 Детали системы:[/bold cyan]\n\n"
         f"[dim]🖥️ Платформа:[/dim] {os_info.get('platform', 'Unknown')}\n"
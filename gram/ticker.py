@@ -0,0 +1,198 @@
+"""Живой тикер курсов"""
+import time
+from array import array
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.markup import escape
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from gram.rates import FiatProvider, CryptoProvider, fetch_all
+from gram.rate_cache import get_rates, store_snapshot
+from gram.watchlist import load_watchlist, fiat_name, crypto_name
+
+console = Console()
+
+DEFAULT_INTERVAL = 5.0
+FIAT_MIN_INTERVAL = 60.0
+RING_CAPACITY = 720
+CHANGE_WINDOW = 300
+HIGHLIGHT_SECONDS = 2.0
+
+
+class TickBuffer:
+    """Кольцевой буфер последних цен: фиксированная память на каждый актив."""
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self._times = {}
+        self._prices = {}
+        self._head = {}
+        self._size = {}
+
+    def push(self, key: str, timestamp: float, price: float):
+        if key not in self._prices:
+            self._times[key] = array("d", [0.0]) * self.capacity
+            self._prices[key] = array("d", [0.0]) * self.capacity
+            self._head[key] = 0
+            self._size[key] = 0
+        head = self._head[key]
+        self._times[key][head] = timestamp
+        self._prices[key][head] = price
+        self._head[key] = (head + 1) % self.capacity
+        self._size[key] = min(self._size[key] + 1, self.capacity)
+
+    def latest(self, key: str):
+        if not self._size.get(key):
+            return None
+        return self._prices[key][(self._head[key] - 1) % self.capacity]
+
+    def change(self, key: str, window: float):
+        """Изменение в процентах между самой старой ценой в окне и последней."""
+        size = self._size.get(key, 0)
+        if size < 2:
+            return None
+        times, prices, head = self._times[key], self._prices[key], self._head[key]
+        newest = (head - 1) % self.capacity
+        cutoff = times[newest] - window
+        oldest = newest
+        for step in range(1, size):
+            i = (newest - step) % self.capacity
+            if times[i] < cutoff:
+                break
+            oldest = i
+        if oldest == newest or not prices[oldest]:
+            return None
+        return (prices[newest] / prices[oldest] - 1) * 100
+
+
+class TickerView:
+    """Таблица тикера: ячейка пересобирается только когда меняется её значение."""
+
+    def __init__(self, watchlist: dict):
+        self.watchlist = watchlist
+        self.ticks = TickBuffer()
+        self.cells = {}
+        self.rows = {"fiat": [], "crypto": []}
+        self.bases = ["USD"]
+        self.highlighted = {}
+
+    def update(self, currency_rates, crypto_rates, now: float) -> bool:
+        from gram.crypto import build_price_rows
+
+        bases, fiat_codes, fiat_rows, crypto_ids, crypto_rows = build_price_rows(self.watchlist, currency_rates, crypto_rates)
+        changed = bases != self.bases
+        self.bases = bases
+
+        for kind, keys, rows, fmt in (("fiat", fiat_codes, fiat_rows, "{:,.4f}"), ("crypto", crypto_ids, crypto_rows, "{:,.2f}")):
+            if keys != self.rows[kind]:
+                self.rows[kind] = keys
+                changed = True
+            for key, row in zip(keys, rows):
+                usd_price = row[bases.index("USD")] if "USD" in bases else row[0]
+                if self.ticks.latest(key) != usd_price:
+                    self.ticks.push(key, now, usd_price)
+                for base, value in zip(bases, row):
+                    previous = self.cells.get((key, base))
+                    if previous is not None and previous[0] == value:
+                        continue
+                    style = "white"
+                    if previous is not None:
+                        style = "bold black on green" if value > previous[0] else "bold white on red"
+                        self.highlighted[(key, base)] = now + HIGHLIGHT_SECONDS
+                    self.cells[(key, base)] = (value, Text(fmt.format(value), style=style))
+                    changed = True
+        return changed
+
+    def fade(self, now: float) -> bool:
+        expired = [cell for cell, until in self.highlighted.items() if until <= now]
+        for cell in expired:
+            del self.highlighted[cell]
+            value, text = self.cells[cell]
+            self.cells[cell] = (value, Text(text.plain, style="white"))
+        return bool(expired)
+
+    def _change_text(self, key: str) -> str:
+        change = self.ticks.change(key, CHANGE_WINDOW)
+        if change is None:
+            return "[dim]—[/dim]"
+        if abs(change) < 0.005:
+            return "[dim]➖ 0.00%[/dim]"
+        return f"[green]📈 +{change:.2f}%[/green]" if change > 0 else f"[red]📉 {change:.2f}%[/red]"
+
+    def render(self, status: str):
+        tables = []
+        for kind, title, name_column, namer in (("fiat", "🏦 Валюты (стоимость 1 единицы)", "💱 Валюта", fiat_name), ("crypto", "₿ Криптовалюты", "🪙 Криптовалюта", crypto_name)):
+            if not self.rows[kind]:
+                continue
+            table = Table(title=title, show_header=True)
+            table.add_column(name_column, style="bold cyan" if kind == "fiat" else "bold yellow", no_wrap=True)
+            for base in self.bases:
+                table.add_column(f"💵 {base}", justify="right")
+            table.add_column(f"📊 {CHANGE_WINDOW // 60} мин", style="dim")
+            for key in self.rows[kind]:
+                table.add_row(f"[bold]{namer(key)}[/bold]", *[self.cells[(key, base)][1] for base in self.bases], self._change_text(key))
+            tables.append(table)
+        return Group(*tables, Text.from_markup(status))
+
+
+def watch_fiat(interval: float = None, watchlist_path: str = None):
+    interval = max(1.0, interval or DEFAULT_INTERVAL)
+    try:
+        watchlist = load_watchlist(watchlist_path)
+    except ValueError as e:
+        console.print(Panel(f"[red bold]❌ {escape(str(e))}[/red bold]", title="🚫 Ошибка", border_style="red"))
+        return
+    providers = {"fiat": FiatProvider(), "crypto": CryptoProvider(watchlist["crypto"])}
+    schedule = {"fiat": max(interval, FIAT_MIN_INTERVAL), "crypto": interval}
+
+    console.print("\n[bold bright_cyan]💰 Загружаю курсы для тикера...[/bold bright_cyan]\n")
+
+    data = {}
+    last_fetch = {}
+    errors = {}
+    for name, snapshot in get_rates(list(providers.values())).items():
+        data[name] = snapshot["data"] if snapshot else None
+        last_fetch[name] = time.time() if snapshot and snapshot["source"] == "live" else 0.0
+
+    view = TickerView(watchlist)
+    view.update(data["fiat"], data["crypto"], time.time())
+
+    def status():
+        parts = [f"[dim]⏱ Обновлено {time.strftime('%H:%M:%S')}[/dim]", f"[dim]₿ каждые {schedule['crypto']:g} с, 🏦 каждые {schedule['fiat']:g} с[/dim]"]
+        parts.extend(f"[red]❌ {name}: {error}[/red]" for name, error in errors.items())
+        parts.append("[dim]Ctrl+C — выход[/dim]")
+        return " • ".join(parts)
+
+    try:
+        with Live(view.render(status()), console=console, auto_refresh=False) as live:
+            while True:
+                now = time.time()
+                due = [providers[name] for name in providers if now - last_fetch[name] >= schedule[name]]
+                changed = False
+
+                if due:
+                    for name, result in fetch_all(due).items():
+                        last_fetch[name] = now
+                        if result is None:
+                            errors[name] = "нет ответа, показаны прошлые данные"
+                            continue
+                        errors.pop(name, None)
+                        if result != data[name]:
+                            data[name] = result
+                            store_snapshot(name, result)
+                    view.update(data["fiat"], data["crypto"], time.time())
+                    # Статус со временем опроса перерисовываем даже без новых цен
+                    changed = True
+
+                if view.fade(time.time()) or changed:
+                    live.update(view.render(status()), refresh=True)
+
+                next_due = min(last_fetch[name] + schedule[name] for name in providers)
+                next_fade = min(view.highlighted.values(), default=next_due)
+                time.sleep(max(0.1, min(next_due, next_fade, time.time() + 1.0) - time.time()))
+    except KeyboardInterrupt:
+        console.print(Panel("[bold green]👋 Тикер остановлен[/bold green]", title="⏹️ Выход", border_style="green"))
+        console.print("")
@@ -0,0 +1,27 @@
+"""Разбор единиц измерения"""
+import re
+
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)?\s*$", re.IGNORECASE)
+
+
+def parse_duration(text, default_unit: str = "s") -> float:
+    """'30d', '12h', '500ms', '1.5' → секунды. ValueError при неверном формате."""
+    if isinstance(text, (int, float)):
+        return float(text) * DURATION_UNITS[default_unit]
+    match = _DURATION_RE.match(str(text))
+    if not match:
+        raise ValueError(f"Неверная длительность: {text!r} (примеры: 30d, 12h, 15m, 1s, 500ms)")
+    value, unit = match.groups()
+    return float(value) * DURATION_UNITS[(unit or default_unit).lower()]
+
+
+BYTE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
+
+
+def format_bytes(size: float, suffix: str = "") -> str:
+    """1536 → '1.5 KB'; suffix добавляется к единице ('/s' для скоростей)."""
+    for unit in BYTE_UNITS:
+        if abs(size) < 1024 or unit == BYTE_UNITS[-1]:
+            return f"{size:.0f} {unit}{suffix}" if unit == "B" else f"{size:.1f} {unit}{suffix}"
+        size /= 1024
@@ -1,49 +1,53 @@
 
+import os
+import re
 import subprocess
 import sys
-import tempfile
-import shutil
-from pathlib import Path
+import time
 import requests
 import toml
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.table import Table
 
+from gram.storage import get_data_dir, read_json, write_json
+from gram.version_check import compare_versions, version_cache_path
+
 console = Console()
 
+UPDATE_URL = "https://github.com/NEFORDEV/gram-cli.git"
+GITHUB_PYPROJECT_URL = "https://raw.githubusercontent.com/NEFORDEV/gram-cli/main/pyproject.toml"
+
 def get_github_version():
+    """Последняя версия с GitHub. Повторный запрос условный (ETag): на 304 берётся сохранённая."""
+    cache = read_json(version_cache_path(), {}) or {}
+    headers = {}
+    if cache.get("latest"):
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    
     try:
-        url = "https://raw.githubusercontent.com/NEFORDEV/gram-cli/main/pyproject.toml"
-        response = requests.get(url, timeout=10)
+        response = requests.get(GITHUB_PYPROJECT_URL, headers=headers, timeout=10)
         
-        if response.status_code == 200:
+        if response.status_code == 304:
+            latest = cache["latest"]
+        elif response.status_code == 200:
             data = toml.loads(response.text)
-            return data.get('project', {}).get('version', '0.1.0')
+            latest = data.get('project', {}).get('version', '0.1.0')
         else:
             return None
     except:
         return None
-
-def compare_versions(current, latest):
-    try:
-        current_parts = [int(x) for x in current.split('.')]
-        latest_parts = [int(x) for x in latest.split('.')]
-        
-        max_len = max(len(current_parts), len(latest_parts))
-        current_parts.extend([0] * (max_len - len(current_parts)))
-        latest_parts.extend([0] * (max_len - len(latest_parts)))
-        
-        for i in range(max_len):
-            if latest_parts[i] > current_parts[i]:
-                return True
-            elif latest_parts[i] < current_parts[i]:
-                return False
-        
-        return False
-    except:
-        return False
+    
+    # В ответе 304 валидаторов может не быть — тогда остаются прежние
+    etag = response.headers.get("ETag") or (cache.get("etag") if response.status_code == 304 else None)
+    last_modified = response.headers.get("Last-Modified") or (cache.get("last_modified") if response.status_code == 304 else None)
+    write_json(version_cache_path(), {"latest": latest, "checked_at": time.time(), "etag": etag, "last_modified": last_modified})
+    return latest
 
 def show_update_info(current_version, latest_version):
     console.print("\n")
@@ -59,43 +63,134 @@ def show_update_info(current_version, latest_version):
     console.print(comparison_table)
     console.print("")
 
-def perform_update():
+def get_update_url(url=None):
+    return url or os.environ.get("GRAM_UPDATE_URL") or UPDATE_URL
+
+def update_cache_path():
+    return get_data_dir("update") / "gram-cli"
+
+def _git(args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+
+def fetch_latest(url=None):
+    """Неглубокий fetch последнего коммита в постоянный кэш. {"commit", "version"} или {"error"}."""
+    url = get_update_url(url)
+    repo_path = update_cache_path()
+    
+    if not (repo_path / ".git").exists():
+        repo_path.mkdir(parents=True, exist_ok=True)
+        result = _git(["init", "-q"], repo_path)
+        if result.returncode != 0:
+            return {"error": result.stderr}
+    if _git(["remote", "set-url", "origin", url], repo_path).returncode != 0:
+        _git(["remote", "add", "origin", url], repo_path)
+    
+    # Только последний коммит: история не нужна, а повторный fetch докачивает лишь разницу
+    result = _git(["fetch", "-q", "--depth", "1", "--no-tags", "origin", "HEAD"], repo_path)
+    if result.returncode != 0:
+        return {"error": result.stderr}
+    
+    commit = _git(["rev-parse", "FETCH_HEAD"], repo_path).stdout.strip()
+    pyproject = _git(["show", "FETCH_HEAD:pyproject.toml"], repo_path)
+    try:
+        project = toml.loads(pyproject.stdout).get('project', {})
+    except toml.TomlDecodeError:
+        project = {}
+    return {"commit": commit, "version": project.get('version'), "dependencies": project.get('dependencies', [])}
+
+def _missing_dependencies(requirements):
+    """Зависимости, которые не установлены или не подходят по версии."""
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        from packaging.requirements import Requirement, InvalidRequirement
+    except ImportError:
+        Requirement = None
+    missing = []
+    for requirement in requirements:
+        if Requirement is None:
+            # без packaging версию не сравнить: любое ограничение считаем неудовлетворённым
+            name = re.split(r"[\s\[<>=!~;@]", requirement, maxsplit=1)[0]
+            try:
+                version(name)
+            except PackageNotFoundError:
+                missing.append(requirement)
+                continue
+            if re.search(r"[<>=!~@]", requirement.split(";", 1)[0]):
+                missing.append(requirement)
+            continue
+        try:
+            parsed = Requirement(requirement)
+        except InvalidRequirement:
+            missing.append(requirement)
+            continue
+        if parsed.marker is not None and not parsed.marker.evaluate():
+            continue
+        try:
+            installed = version(parsed.name)
+        except PackageNotFoundError:
+            missing.append(requirement)
+            continue
+        if parsed.specifier and not parsed.specifier.contains(installed, prereleases=True):
+            missing.append(requirement)
+    return missing
+
+def _can_build_locally():
+    """Хватит ли установленного setuptools для сборки колеса без отдельного окружения."""
+    from importlib.util import find_spec
+    if find_spec("setuptools") is None:
+        return False
+    # bdist_wheel встроен в setuptools начиная с 70.1, раньше нужен пакет wheel
+    return find_spec("wheel") is not None or find_spec("setuptools.command.bdist_wheel") is not None
+
+def perform_update(url=None, fetched=None):
+    from gram.version import get_current_version
+    
     console.print("\n[bold bright_green]🚀 Начинаю обновление пакета...[/bold bright_green]")
+    repo_path = update_cache_path()
+    state_path = repo_path.parent / "state.json"
     
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TaskProgressColumn(), console=console) as progress:
         task1 = progress.add_task("📥 Скачиваю последнюю версию...", total=None)
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            repo_path = temp_path / "gram-cli"
-            
-            result = subprocess.run(["git", "clone", "https://github.com/NEFORDEV/gram-cli.git", str(repo_path)], capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                console.print(Panel("[red bold]❌ Ошибка при скачивании репозитория![/red bold]\n[dim]{result.stderr}[/dim]", title="🚫 Ошибка", border_style="red"))
-                return False
-            
-            progress.update(task1, description="✅ Скачивание завершено")
-            
-            task2 = progress.add_task("🔧 Устанавливаю пакет...", total=None)
-            
-            old_cwd = Path.cwd()
-            try:
-                import os
-                os.chdir(repo_path)
-                
-                result = subprocess.run([sys.executable, "-m", "pip", "install", "--force-reinstall", "."], capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    progress.update(task2, description="✅ Установка завершена")
-                    return True
-                else:
-                    console.print(Panel("[red bold]❌ Ошибка при установке![/red bold]\n[dim]{result.stderr}[/dim]", title="🚫 Ошибка установки", border_style="red"))
-                    return False
-            finally:
-                os.chdir(old_cwd)
-    
-    return False
+        fetched = fetched or fetch_latest(url)
+        if "error" in fetched:
+            progress.stop()
+            console.print(Panel(f"[red bold]❌ Ошибка при скачивании репозитория![/red bold]\n[dim]{escape(fetched['error'])}[/dim]", title="🚫 Ошибка", border_style="red"))
+            return False
+        
+        state = read_json(state_path, {}) or {}
+        if state.get("commit") == fetched["commit"] and fetched["version"] == get_current_version():
+            progress.update(task1, description="✅ Этот коммит уже установлен — пропускаю")
+            return True
+        
+        result = _git(["checkout", "-q", "--force", "--detach", "FETCH_HEAD"], repo_path)
+        if result.returncode != 0:
+            progress.stop()
+            console.print(Panel(f"[red bold]❌ Ошибка при скачивании репозитория![/red bold]\n[dim]{escape(result.stderr)}[/dim]", title="🚫 Ошибка", border_style="red"))
+            return False
+        
+        progress.update(task1, description="✅ Скачивание завершено")
+        
+        task2 = progress.add_task("🔧 Устанавливаю пакет...", total=None)
+        
+        # Переустанавливается только сам gram; недостающие зависимости ставятся отдельно, без переустановки остальных
+        command = [sys.executable, "-m", "pip", "install", "--no-deps", "--force-reinstall", str(repo_path)]
+        if _can_build_locally():
+            command[4:4] = ["--no-build-isolation"]
+        result = subprocess.run(command, capture_output=True, text=True)
+        missing = _missing_dependencies(fetched["dependencies"]) if result.returncode == 0 else []
+        if missing:
+            progress.update(task2, description=f"📦 Доустанавливаю зависимости: {len(missing)}")
+            result = subprocess.run([sys.executable, "-m", "pip", "install", *missing], capture_output=True, text=True)
+        
+        if result.returncode == 0:
+            write_json(state_path, {"commit": fetched["commit"], "version": fetched["version"], "url": get_update_url(url)})
+            progress.update(task2, description="✅ Установка завершена")
+            return True
+        else:
+            progress.stop()
+            console.print(Panel(f"[red bold]❌ Ошибка при установке![/red bold]\n[dim]{escape(result.stderr)}[/dim]", title="🚫 Ошибка установки", border_style="red"))
+            return False
 
 def show_update_result(success):
     if success:
@@ -111,7 +206,15 @@ def show_update():
     current_version = get_current_version()
     console.print(f"\n[bold bright_cyan]🔍 Проверяю последнюю версию на GitHub...[/bold bright_cyan]")
     
-    latest_version = get_github_version()
+    # Свой источник (например, локальный bare-репозиторий) проверяется тем же неглубоким fetch
+    fetched = None
+    if get_update_url() != UPDATE_URL:
+        fetched = fetch_latest()
+        latest_version = fetched.get("version")
+        if latest_version:
+            write_json(version_cache_path(), {"latest": latest_version, "checked_at": time.time()})
+    else:
+        latest_version = get_github_version()
     
     if not latest_version:
         console.print(Panel("[red bold]❌ Не удалось получить информацию о последней версии![/red bold]\n[dim]Проверьте подключение к интернету[/dim]", title="🚫 Ошибка", border_style="red"))
@@ -126,10 +229,10 @@ def show_update():
         choice = input().strip().lower()
         
         if choice in ['y', 'yes', 'да', 'д']:
-            success = perform_update()
+            success = perform_update(fetched=fetched)
             show_update_result(success)
         else:
             console.print("\n[dim]Обновление отменено пользователем[/dim]\n")
     else:
-        console.print(Panel("[bold green]✅ У вас установлена последняя версия![/bold green]\n\n[dim]Версия {current_version} - актуальна[/dim]", title="🎉 Актуальная версия", border_style="green"))
+        console.print(Panel(f"[bold green]✅ У вас установлена последняя версия![/bold green]\n\n[dim]Версия {current_version} - актуальна[/dim]", title="🎉 Актуальная версия", border_style="green"))
         console.print("")
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Фоновая проверка новой версии"""
+import os
+import subprocess
+import sys
+import time
+
+from rich.console import Console
+
+from gram.storage import get_data_dir, read_json, write_json
+
+console = Console()
+
+CHECK_TTL = 86400
+# Не чаще одного фонового запуска за это время, даже если проверка не удалась (нет сети)
+RETRY_AFTER = 3600
+
+
+def version_cache_path():
+    return get_data_dir() / "version_check.json"
+
+
+def compare_versions(current, latest):
+    try:
+        current_parts = [int(x) for x in current.split('.')]
+        latest_parts = [int(x) for x in latest.split('.')]
+        
+        max_len = max(len(current_parts), len(latest_parts))
+        current_parts.extend([0] * (max_len - len(current_parts)))
+        latest_parts.extend([0] * (max_len - len(latest_parts)))
+        
+        for i in range(max_len):
+            if latest_parts[i] > current_parts[i]:
+                return True
+            elif latest_parts[i] < current_parts[i]:
+                return False
+        
+        return False
+    except:
+        return False
+
+
+def refresh_version_cache():
+    """Выполняется в отдельном процессе: узнаёт последнюю версию и сохраняет её в кэш."""
+    # updater тянет requests и toml — в обычном запуске команды они не нужны
+    from gram.updater import UPDATE_URL, fetch_latest, get_github_version, get_update_url
+
+    if get_update_url() == UPDATE_URL:
+        get_github_version()
+        return
+    latest = fetch_latest().get("version")
+    if latest:
+        cache = read_json(version_cache_path(), {}) or {}
+        write_json(version_cache_path(), {**cache, "latest": latest, "checked_at": time.time()})
+
+
+def _spawn_refresh():
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "close_fds": True}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    # -m с рабочей папкой в каталоге данных: папка gram/ в текущем каталоге не подменит пакет
+    subprocess.Popen([sys.executable, "-m", "gram.version_check"], cwd=get_data_dir(), **kwargs)
+
+
+def check_for_updates(current_version: str = None):
+    """Печатает однострочное уведомление по данным прошлой проверки и при необходимости
+    запускает новую в отсоединённом процессе — текущая команда сеть не ждёт."""
+    if os.environ.get("GRAM_NO_UPDATE_CHECK"):
+        return
+    from gram.version import get_current_version
+
+    try:
+        cache = read_json(version_cache_path(), {}) or {}
+        now = time.time()
+        if now - cache.get("checked_at", 0) > CHECK_TTL and now - cache.get("spawned_at", 0) > RETRY_AFTER:
+            write_json(version_cache_path(), {**cache, "spawned_at": now})
+            _spawn_refresh()
+    except OSError:
+        return
+
+    current_version = current_version or get_current_version()
+    latest = cache.get("latest")
+    if latest and current_version and compare_versions(current_version, latest):
+        console.print(f"[bold yellow]🔄 Доступна версия {latest} (у вас {current_version}) — обновите: gram --update[/bold yellow]")
+
+
+if __name__ == "__main__":
+    refresh_version_cache()
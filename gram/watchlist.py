@@ -0,0 +1,57 @@
+"""Списки отслеживаемых валют"""
+from pathlib import Path
+
+import toml
+
+from gram.storage import get_config_dir
+
+DEFAULT_WATCHLIST = {
+    "base": ["USD", "RUB"],
+    "fiat": ["EUR", "GBP", "JPY", "CNY", "CAD", "AUD", "CHF"],
+    "crypto": ["bitcoin", "ethereum"],
+}
+
+FIAT_NAMES = {
+    'EUR': 'Евро', 'GBP': 'Фунт стерлингов', 'JPY': 'Японская йена',
+    'CNY': 'Китайский юань', 'CAD': 'Канадский доллар', 'AUD': 'Австралийский доллар', 'CHF': 'Швейцарский франк',
+    'USD': 'Доллар США', 'RUB': 'Российский рубль'
+}
+
+
+def watchlist_path() -> Path:
+    return get_config_dir() / "watchlist.toml"
+
+
+def load_watchlist(path: str = None) -> dict:
+    """Читает watchlist.toml: ключи base, fiat и crypto (id монет CoinGecko).
+
+    Отсутствующие ключи берутся из DEFAULT_WATCHLIST. Явно указанный, но
+    несуществующий файл и ошибки разбора TOML — ValueError.
+    """
+    config_path = Path(path) if path else watchlist_path()
+    watchlist = {key: list(value) for key, value in DEFAULT_WATCHLIST.items()}
+    if path and not config_path.is_file():
+        raise ValueError(f"Файл списка не найден: {config_path}")
+    if config_path.exists():
+        try:
+            data = toml.load(config_path)
+        except (toml.TomlDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Не удалось разобрать {config_path}: {e}") from e
+        for key in watchlist:
+            if key not in data:
+                continue
+            if not isinstance(data[key], list):
+                raise ValueError(f"{config_path}: ключ {key} должен быть списком")
+            watchlist[key] = [str(item) for item in data[key]]
+    watchlist["base"] = [code.upper() for code in watchlist["base"]]
+    watchlist["fiat"] = [code.upper() for code in watchlist["fiat"]]
+    watchlist["crypto"] = [coin_id.lower() for coin_id in watchlist["crypto"]]
+    return watchlist
+
+
+def fiat_name(code: str) -> str:
+    return FIAT_NAMES.get(code, code)
+
+
+def crypto_name(coin_id: str) -> str:
+    return coin_id.replace("-", " ").title()